@@ -24,6 +24,10 @@ class Settings:
     MAX_POSTS_PER_KEYWORD = 10
     MAX_SCROLL_ATTEMPTS = 3
     SCROLL_PAUSE_TIME = 3
+    # Jittered gap (seconds) between linkedin.com page loads, shared by all searches
+    REQUEST_INTERVAL = (float(os.getenv("REQUEST_INTERVAL_MIN", 3)), float(os.getenv("REQUEST_INTERVAL_MAX", 7)))
+    # Minimum jittered time spent on each scroll, even when the next batch loads sooner
+    SCROLL_PAUSE_MIN = (1.5, 3.0)
 
     # Selenium Settings
     SELENIUM_TIMEOUT = 10
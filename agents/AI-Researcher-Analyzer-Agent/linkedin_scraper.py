@@ -19,6 +19,7 @@ from datetime import datetime, timedelta
 import asyncio
 from pydantic import BaseModel
 import random
+import threading
 import requests
 from urllib.parse import quote_plus
 
@@ -42,6 +43,60 @@ redis_client = Redis(host=os.getenv("REDIS_HOST"),
 
 CACHE_EXPIRY = 3600  # 1 hour
 
+# Selenium waits return as soon as the condition holds; these are upper bounds
+LOGIN_TIMEOUT = 15
+CONTENT_TIMEOUT = 5
+POST_SELECTOR = "div.feed-shared-update-v2, div.occludable-update, div[data-urn]"
+
+# linkedin.com pacing: a random gap between page loads, longer after 429/503
+REQUEST_INTERVAL = (3.0, 7.0)
+MAX_BACKOFF = 120.0
+# Minimum time spent after a scroll / between "Show more" clicks
+SCROLL_PAUSE = (1.5, 3.0)
+CLICK_PAUSE = (0.5, 1.5)
+
+
+class RequestPacer:
+    """
+    Jittered minimum gap between requests to one host, shared by every
+    caller in the process (Selenium navigations and plain HTTP alike).
+    A 429/503 adds an exponentially growing backoff to the next gap.
+    """
+
+    def __init__(self, interval=REQUEST_INTERVAL, max_backoff=MAX_BACKOFF):
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self._next_at = 0.0
+        self._backoff = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until the next request may go out, then reserve the gap after it."""
+        with self._lock:
+            delay = self._next_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_at = time.monotonic() + random.uniform(*self.interval) + self._backoff
+
+    def report(self, status: Optional[int]):
+        with self._lock:
+            if status in (429, 503):
+                self._backoff = min(self.max_backoff, self._backoff * 2 or self.interval[1] * 2)
+                self._next_at = max(self._next_at, time.monotonic() + self._backoff)
+            else:
+                self._backoff = 0.0
+
+
+linkedin_pacer = RequestPacer()
+
+
+def pause_since(started: float, bounds):
+    """Sleep whatever is left of a random `bounds` pause that began at `started`."""
+    remaining = started + random.uniform(*bounds) - time.monotonic()
+    if remaining > 0:
+        time.sleep(remaining)
+
+
 # Singleton WebDriver
 class LinkedInDriver:
     _instance = None
@@ -88,6 +143,7 @@ class LinkedInDriver:
     
     def _login(self):
         try:
+            linkedin_pacer.wait()
             self._driver.get("https://www.linkedin.com/login")
             WebDriverWait(self._driver, 10).until(
                 EC.presence_of_element_located((By.ID, "username"))
@@ -98,9 +154,9 @@ class LinkedInDriver:
             ).send_keys(os.getenv("LINKEDIN_PASSWORD"))
             
             self._driver.find_element(By.CSS_SELECTOR, "button[type='submit']").click()
-            time.sleep(5)
-            
-            if "feed" not in self._driver.current_url:
+            try:
+                WebDriverWait(self._driver, LOGIN_TIMEOUT).until(EC.url_contains("feed"))
+            except TimeoutException:
                 raise Exception("Login failed")
                 
             logger.info("Successfully logged in to LinkedIn")
@@ -186,6 +242,7 @@ def login_to_linkedin(driver: webdriver.Chrome) -> bool:
     """
     try:
         logger.info("Attempting to log in to LinkedIn")
+        linkedin_pacer.wait()
         driver.get("https://www.linkedin.com/login")
         
         # Wait for elements to be present
@@ -200,8 +257,11 @@ def login_to_linkedin(driver: webdriver.Chrome) -> bool:
         password_field.send_keys(LINKEDIN_PASSWORD)
         password_field.send_keys(Keys.RETURN)
         
-        # Wait for login to complete
-        time.sleep(5)
+        # Wait for the redirect to the feed (or give up and report failure)
+        try:
+            WebDriverWait(driver, LOGIN_TIMEOUT).until(EC.url_contains("feed"))
+        except TimeoutException:
+            pass
         
         # Verify login success
         if "feed" in driver.current_url:
@@ -374,8 +434,14 @@ def search_posts(
             f"&start={offset}"
         )
         
+        linkedin_pacer.wait()
         driver.get(search_url)
-        time.sleep(3)
+        try:
+            WebDriverWait(driver, CONTENT_TIMEOUT).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, POST_SELECTOR))
+            )
+        except TimeoutException:
+            logger.info(f"No posts rendered for '{keyword}' within {CONTENT_TIMEOUT}s")
         
         posts = []
         scroll_attempts = 0
@@ -409,15 +475,23 @@ def search_posts(
             if len(posts) < limit:
                 # Scroll and wait for new content
                 last_height = driver.execute_script("return document.body.scrollHeight")
+                scrolled_at = time.monotonic()
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(3)  # Increased wait time
+                # Wait for the next batch to extend the page, but never scroll faster than SCROLL_PAUSE
+                try:
+                    WebDriverWait(driver, CONTENT_TIMEOUT).until(
+                        lambda d: d.execute_script("return document.body.scrollHeight") > last_height
+                    )
+                except TimeoutException:
+                    pass
+                pause_since(scrolled_at, SCROLL_PAUSE)
                 
                 # Click "Show more" buttons if present
                 try:
                     show_more_buttons = driver.find_elements(By.CSS_SELECTOR, "button.feed-shared-inline-show-more-text__button")
                     for button in show_more_buttons:
                         driver.execute_script("arguments[0].click();", button)
-                        time.sleep(1)
+                        time.sleep(random.uniform(*CLICK_PAUSE))
                 except Exception as e:
                     logger.debug(f"No 'Show more' buttons found: {str(e)}")
                 
@@ -540,11 +614,12 @@ class LinkedInPublicScraper:
             encoded_keyword = quote_plus(keyword)
             url = f"{self.base_url}?keywords={encoded_keyword}"
             
-            # Add random delay between requests
-            time.sleep(random.uniform(3, 7))
+            # Shares linkedin.com pacing with the Selenium scraper, across requests
+            linkedin_pacer.wait()
             
             # Make the request
             response = requests.get(url, headers=self.headers)
+            linkedin_pacer.report(response.status_code)
             response.raise_for_status()
             
             # Parse the content
@@ -6,6 +6,7 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from datetime import datetime, timedelta
 import time
 import random
+import threading
 
 from config.settings import settings
 from utils.logger import setup_logger
@@ -16,6 +17,9 @@ class LinkedInDriver:
     _instance = None
     _driver = None
     _last_login = None
+    # Earliest monotonic time the next linkedin.com navigation may go out
+    _next_request_at = 0.0
+    _pace_lock = threading.Lock()
     
     @classmethod
     def get_instance(cls):
@@ -30,6 +34,14 @@ class LinkedInDriver:
             self._setup_driver()
         return self._driver
     
+    def pace(self):
+        """Wait out the jittered gap since the previous navigation, then reserve the next one."""
+        with self._pace_lock:
+            wait = LinkedInDriver._next_request_at - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            LinkedInDriver._next_request_at = time.monotonic() + random.uniform(*settings.REQUEST_INTERVAL)
+    
     def _needs_login(self):
         needs_login = (self._last_login is None or 
                       datetime.now() - self._last_login > timedelta(hours=23))
@@ -67,13 +79,16 @@ class LinkedInDriver:
             logger.info("Starting LinkedIn login process")
             
             # First visit LinkedIn homepage
+            self.pace()
             self._driver.get("https://www.linkedin.com")
-            time.sleep(random.uniform(2, 4))
+            WebDriverWait(self._driver, settings.SELENIUM_TIMEOUT).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
             
-            # Then go to login page if not already there
+            # Then go to login page if not already there; the username wait below covers the load
             if "login" not in self._driver.current_url:
+                self.pace()
                 self._driver.get("https://www.linkedin.com/login")
-                time.sleep(random.uniform(2, 4))
 
             # Wait for and enter email
             logger.debug("Looking for email input field")
@@ -1,8 +1,14 @@
 from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
 import hashlib
+import random
 import time
 
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
 from services.driver_service import LinkedInDriver
 from services.cache_service import CacheService
 from config.settings import settings
@@ -86,15 +92,31 @@ class ScraperService:
 
                 # Search for posts
                 search_url = f"https://www.linkedin.com/search/results/content/?keywords={keyword}&origin=GLOBAL_SEARCH_HEADER"
+                self.driver_service.pace()
                 driver.get(search_url)
                 
-                # Wait for posts to load and scroll
-                time.sleep(settings.SCROLL_PAUSE_TIME)
-                
-                # Scroll to load more posts
+                # Wait for the first posts, then scroll while new ones keep loading
+                try:
+                    WebDriverWait(driver, settings.SELENIUM_TIMEOUT).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, "div.feed-shared-update-v2"))
+                    )
+                except TimeoutException:
+                    logger.info(f"No posts rendered for keyword: {keyword}")
+
                 for _ in range(settings.MAX_SCROLL_ATTEMPTS):
+                    height = driver.execute_script("return document.body.scrollHeight")
+                    scrolled_at = time.monotonic()
                     driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(settings.SCROLL_PAUSE_TIME)
+                    try:
+                        # SCROLL_PAUSE_TIME is an upper bound; SCROLL_PAUSE_MIN keeps a jittered floor
+                        WebDriverWait(driver, settings.SCROLL_PAUSE_TIME).until(
+                            lambda d: d.execute_script("return document.body.scrollHeight") > height
+                        )
+                    except TimeoutException:
+                        break
+                    remaining = scrolled_at + random.uniform(*settings.SCROLL_PAUSE_MIN) - time.monotonic()
+                    if remaining > 0:
+                        time.sleep(remaining)
 
                 # Parse the page
                 soup = BeautifulSoup(driver.page_source, 'html.parser')
@@ -0,0 +1,161 @@
+"""
+Rate limiting primitives shared by services that call quota-bound APIs.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTokenBucket:
+    """
+    Token bucket for asyncio code: `rate` tokens are added per second up to
+    `capacity`. acquire() waits until enough tokens are available; waiters
+    are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+    def drain(self):
+        """Empty the bucket, e.g. after the remote side reported a rate limit."""
+        self._refill()
+        self._tokens = 0.0
+
+
+@dataclass
+class _HostState:
+    bucket: AsyncTokenBucket
+    slots: asyncio.Semaphore
+    base_rate: float
+    penalty: float = 0.0
+    resume_at: float = 0.0
+    throttled: int = 0
+
+
+class DomainScheduler:
+    """
+    Per-host politeness shared by every caller that fetches from the web.
+
+    Each host gets a token bucket (`rate` requests/second, `burst` capacity)
+    and at most `concurrency` requests in flight; `limits` overrides the
+    defaults per host. Requests go out immediately while tokens are left.
+
+    report() adapts the host's pace: a 429/503 or a blocked page (captcha,
+    bot wall) halves its rate and pauses it for an exponentially growing
+    penalty (Retry-After wins when given); each clean response recovers a
+    quarter of the configured rate.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 3,
+        concurrency: int = 2,
+        limits: Optional[Dict[str, Tuple[float, int, int]]] = None,
+        min_rate: float = 0.05,
+        base_penalty: float = 5.0,
+        max_penalty: float = 300.0,
+    ):
+        self.defaults = (rate, burst, concurrency)
+        self.limits = limits or {}
+        self.min_rate = min_rate
+        self.base_penalty = base_penalty
+        self.max_penalty = max_penalty
+        self._hosts: Dict[str, _HostState] = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        host = (urlparse(url).hostname or url).lower()
+        return host[4:] if host.startswith("www.") else host
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            rate, burst, concurrency = self.limits.get(host, self.defaults)
+            state = _HostState(AsyncTokenBucket(rate, burst), asyncio.Semaphore(concurrency), rate)
+            self._hosts[host] = state
+        return state
+
+    def concurrency(self, url: str) -> int:
+        """Requests the host allows in flight at once."""
+        return self.limits.get(self.host_of(url), self.defaults)[2]
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Hold one of the host's request slots, paced by its bucket and penalty."""
+        state = self._state(self.host_of(url))
+        async with state.slots:
+            pause = state.resume_at - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            await state.bucket.acquire()
+            yield
+
+    def report(
+        self,
+        url: str,
+        status: Optional[int] = None,
+        blocked: bool = False,
+        retry_after: Optional[float] = None,
+    ):
+        """Feed back the outcome of a request made inside slot()."""
+        host = self.host_of(url)
+        state = self._state(host)
+        if blocked or status in (429, 503):
+            state.throttled += 1
+            state.penalty = min(self.max_penalty, state.penalty * 2 or self.base_penalty)
+            pause = retry_after if retry_after is not None else state.penalty
+            state.resume_at = max(state.resume_at, time.monotonic() + pause)
+            state.bucket.rate = max(self.min_rate, state.bucket.rate / 2)
+            state.bucket.drain()
+            logger.warning(
+                f"[DomainScheduler] {host} pushed back ({'blocked' if blocked else status}); "
+                f"pausing {pause:.1f}s, rate now {state.bucket.rate:.2f}/s"
+            )
+        elif status is None or status < 400:
+            state.penalty = state.penalty / 2 if state.penalty > self.base_penalty else 0.0
+            state.bucket.rate = min(state.base_rate, state.bucket.rate + state.base_rate / 4)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        now = time.monotonic()
+        return {
+            host: {
+                "rate": round(s.bucket.rate, 3),
+                "base_rate": s.base_rate,
+                "throttled": s.throttled,
+                "paused_s": round(max(0.0, s.resume_at - now), 1),
+            }
+            for host, s in self._hosts.items()
+        }
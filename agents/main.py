@@ -1,3 +1,4 @@
+import asyncio
 import base64
 import json
 from fastapi import FastAPI, HTTPException, Query
@@ -16,7 +17,8 @@ from urllib.parse import urlencode
 import requests
 
 
-from services.reply_tracker import analyze_sentiment, generate_followup_email
+from services.reply_tracker import analyze_sentiments_batch, attach_followups
+from services.reply_classifier import pre_classifier
 from services.google_service import GoogleService
 from services.linkedin_service import LinkedInService
 from services.prospect_discovery_service import ProspectDiscoveryService
@@ -32,10 +34,19 @@ import logging
 # from services.track_replies import GmailService
 from datetime import datetime
 from services.vector_service import VectorService
-from services.meeting_analyzer import MeetingAnalyzer
 from services.llm_service import LLMService
 from services.email_discovery_service import EmailDiscoveryService
 from services.scraper_router_service import ScraperRouterService
+from services.browser_pool import browser_pool
+from services.playwright_scraper_service import domain_scheduler, load_metrics, outcome_metrics
+from services.scrape_result_cache import scrape_result_cache
+from services.routing_cache import routing_cache
+from services.http_fetcher import http_fetcher
+from services.gmail_sync_service import GmailSyncService
+from services.campaign_service import CampaignService
+from services.calendar_cache_service import CalendarCacheService
+from services.meeting_job_service import MeetingJobQueue
+from services.webhook_ledger import WebhookLedger, IN_FLIGHT, PROCESSED
 
 
 # Configure logging
@@ -93,6 +104,29 @@ SUPABASE_ANON_KEY=os.getenv("SUPABASE_ANON_KEY")
 # Initialize supabase 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
 
+# Durable queue for meeting post-processing (analysis + embeddings)
+meeting_jobs = MeetingJobQueue(redis_client, supabase)
+webhook_ledger = WebhookLedger(redis_client)
+meeting_jobs_worker = None
+
+
+@app.on_event("startup")
+async def startup_event():
+    global meeting_jobs_worker
+    meeting_jobs_worker = asyncio.create_task(meeting_jobs.run())
+    asyncio.create_task(browser_pool.warm_up())
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await meeting_jobs.stop()
+    if meeting_jobs_worker:
+        meeting_jobs_worker.cancel()
+    await campaign_service.stop()
+    google_service.shutdown()
+    await browser_pool.close()
+    await http_fetcher.close()
+
 def create_CSRF_token() -> str:
     """Generate a secure random CSRF token."""
     return secrets.token_urlsafe(32)  # Generate a secure token of 32 bytes
@@ -199,6 +233,7 @@ class ScrapeSourceRequest(BaseModel):
     market: Optional[str] = ""
     batch: Optional[str] = ""
     limit: Optional[int] = 10
+    fresh: bool = False  # bypass the scrape result cache
 
 @app.post('/prospects/discover')
 async def discover_prospects_endpoint(request: ProspectDiscoveryRequest):
@@ -241,7 +276,7 @@ async def discover_prospects_endpoint(request: ProspectDiscoveryRequest):
             logger.error(f"Failed to create job record: {e}")
 
         
-        service = ProspectDiscoveryService()
+        service = ProspectDiscoveryService(redis_client=redis_client)
         prospects = await service.discover_prospects(
             company_description=request.company_description,
             goal=request.goal,
@@ -473,13 +508,14 @@ async def scrape_single_source(request: ScrapeSourceRequest):
             )
 
         call_spec = [{"scraper": source, "kwargs": kwargs_map[source]}]
-        prospects = await scraper.playwright_service.run_scrapers(call_spec)
+        run = await scraper.playwright_service.run_scrapers_detailed(call_spec, use_cache=not request.fresh)
         await scraper.close()
 
         return {
             "source": source,
-            "count": len(prospects),
-            "prospects": prospects,
+            "count": len(run["prospects"]),
+            "prospects": run["prospects"],
+            "stats": run["sources"].get(source),
         }
     except HTTPException:
         raise
@@ -488,6 +524,19 @@ async def scrape_single_source(request: ScrapeSourceRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get('/prospects/scraper-metrics')
+async def get_scraper_metrics():
+    """Average page weight, blocked requests and load time per Playwright source, plus per-host pacing."""
+    return {
+        "status": "success",
+        "metrics": load_metrics.snapshot(),
+        "outcomes": outcome_metrics.snapshot(),
+        "hosts": domain_scheduler.snapshot(),
+        "cache": scrape_result_cache.snapshot(),
+        "routing": routing_cache.snapshot(),
+    }
+
+
 @app.get('/prospects')
 async def get_prospects(min_alignment_score: float = 0.7):
     # Check for discovered prospects in Redis first
@@ -658,41 +707,24 @@ async def track_replies():
             #     # Step 3: Trigger Follow-Up if Required
             #     if intent == "Follow-Up":
             #         generate_followup_email(sender, subject, body)
-        for reply in dummy_replies:
-            sender = reply["from"]
-            subject = reply["subject"]
-            body = reply["body"]
-          
-            # Step 1: AI Sentiment & Intent Analysis
-            # data = await analyze_sentiment(body)
-            sentiment, intent = await analyze_sentiment(body) 
-
-            # Print the data in the desired format
-            print(f"data Sentiment: {sentiment} intent: {intent}")
-            # Step 2: Store in Supabase
-            # supabase.table("emails").update({
-            #     "status": "replied",
-            #     "replied_at": "NOW()",
-            #     "sentiment": sentiment
-            # }).eq("recipient", sender).execute()
-            analyzed_email = {
-                            "email": {
-                                "from": sender,
-                                "subject": subject,
-                                "body": body
-                            },
-                            "analysis": {
-                                "sentiment": sentiment,
-                                "intent": intent
-                            }
-                        }
-            # Step 3: Trigger Follow-Up if Required
-            if intent == "Follow-Up Required":
-                follow_up = await generate_followup_email(sender, subject, body)
-                analyzed_email["suggested_followup"] = follow_up
-
-                print("follow-up", follow_up)
-            analyzed_emails.append(analyzed_email)
+        # Step 1: AI Sentiment & Intent Analysis — all replies in one batch
+        labels = await analyze_sentiments_batch([reply["body"] for reply in dummy_replies])
+
+        for reply, (sentiment, intent) in zip(dummy_replies, labels):
+            analyzed_emails.append({
+                "email": {
+                    "from": reply["from"],
+                    "subject": reply["subject"],
+                    "body": reply["body"],
+                },
+                "analysis": {
+                    "sentiment": sentiment,
+                    "intent": intent
+                }
+            })
+
+        # Step 2: Trigger Follow-Ups concurrently where required
+        await attach_followups(analyzed_emails)
         try:
             redis_client.set(
                 "analyzed_emails",
@@ -815,7 +847,30 @@ async def meeting_webhook(request: Request):
     payload = await request.json()
     event_type = payload.get("event")
     data = payload.get("data", {})
+    bot_id = data.get("bot_id")
+
+    # De-duplicate redeliveries before doing any work
+    ledger_key = webhook_ledger.key(bot_id, event_type, webhook_ledger.fingerprint(payload))
+    state = webhook_ledger.claim(ledger_key)
+    if state == PROCESSED:
+        logger.info("Duplicate %s webhook for bot %s ignored", event_type, bot_id)
+        return {"status": "success", "duplicate": True}
+    if state == IN_FLIGHT:
+        # Non-2xx so the sender redelivers if the in-flight attempt fails
+        raise HTTPException(status_code=409, detail="Identical webhook is already being processed")
+
+    try:
+        response = await _handle_meeting_event(event_type, data)
+    except Exception:
+        webhook_ledger.release(ledger_key)
+        raise
 
+    webhook_ledger.mark_processed(ledger_key)
+    return response
+
+
+async def _handle_meeting_event(event_type: Optional[str], data: Dict) -> Dict:
+    """Dispatch a de-duplicated MeetingBaaS webhook event."""
     # Process different event types
     if event_type == "bot.status_change":
         bot_id = data.get("bot_id")
@@ -828,50 +883,18 @@ async def meeting_webhook(request: Request):
     elif event_type == "complete":
         bot_id = data.get("bot_id")
         mp4_url = data.get("mp4")
-        speakers = data.get("speakers")
-        transcript = data.get("transcript")
-        logger.info("Meeting complete for bot %s. Recording URL: %s", bot_id, mp4_url, transcript)
-
-        result = supabase.table("meetings").select("*").eq("bot_id", bot_id).execute()
-        if not result.data:
-            raise HTTPException(status_code=404, detail=f"No meeting found for bot_id: {bot_id}")
-            
-        meeting = result.data[0]
-                    # Analyze meeting
-        analyzer = MeetingAnalyzer()
-        logger.info(transcript, speakers)
-        analysis = await analyzer.analyze_meeting(transcript, meeting)
-
-
-        meeting_id = meeting['id']
-        
-        logger.info(f"Found meeting: {meeting_id} for bot_id: {bot_id}")
-        
-        # Update meeting with analysis
-        update_data = {
-                "status": "completed",
-                "transcript": transcript,
-                "ai_summary": analysis["ai_summary"],
-                "date": datetime.now().isoformat(),
-                "duration": int(data.get('duration', 0)),
-            }
-        # Update the meeting record
-        result = supabase.table("meetings").update(update_data).eq("id", meeting_id).execute()
-        updated_meeting = result.data[0]
-        logger.info(f"Updated meeting {meeting_id} with transcript and summary")
-        # Save the meeting data (recording, speakers, transcript) into your knowledge base
-        # Store in vector database
-        vector_service = VectorService()
-        await vector_service.store_meeting_data(updated_meeting)
-
-        # Give the transcript to the AI agent it will summarize everything and give action points based on it
-        
-        # Create vector embeddings and store them to Pinecone
-
-        # Use all the data to save in the supabase and the transcription also
+        logger.info("Meeting complete for bot %s. Recording URL: %s", bot_id, mp4_url)
+        if not bot_id:
+            raise HTTPException(status_code=400, detail="Missing bot_id")
 
-        # e.g., insert into your database here
-        return {"status": "success", "meeting_id": meeting["id"]}
+        # Acknowledge immediately; analysis, DB update and embeddings run in
+        # the background worker (see services/meeting_job_service.py)
+        queued = meeting_jobs.enqueue(bot_id, data)
+        return {
+            "status": "success",
+            "bot_id": bot_id,
+            "job": "queued" if queued else "duplicate",
+        }
 
     elif event_type == "failed":
         bot_id = data.get("bot_id")
@@ -1041,7 +1064,8 @@ async def get_meetings(status: Optional[str] = Query(None, description="Filter b
                 "title": meeting.get("title", "Untitled Meeting"),
                 "date": meeting.get("date"),
                 "transcript": meeting.get("transcript", ""),
-                "ai_summary": meeting.get("ai_summary", "")
+                "ai_summary": meeting.get("ai_summary", ""),
+                "processing_status": meeting.get("processing_status"),
             }
             
             # Handle action items and insights (ensure they're properly formatted)
@@ -1140,6 +1164,9 @@ async def store_in_vector_db():
 # ── Google OAuth Endpoints ──────────────────────────────────────
 
 google_service = GoogleService()
+gmail_sync = GmailSyncService(google_service, redis_client)
+campaign_service = CampaignService(google_service, supabase)
+calendar_cache = CalendarCacheService(google_service)
 
 
 class SendEmailRequest(BaseModel):
@@ -1150,6 +1177,18 @@ class SendEmailRequest(BaseModel):
     prospect_id: Optional[str] = None
 
 
+class CampaignEmail(BaseModel):
+    to: str
+    subject: str
+    body: str
+    prospect_id: Optional[str] = None
+
+
+class CampaignRequest(BaseModel):
+    emails: List[CampaignEmail]
+    html: bool = False
+
+
 class CreateEventRequest(BaseModel):
     summary: str
     start_time: str
@@ -1226,6 +1265,8 @@ async def google_disconnect(user: object = Depends(get_current_user)):
     """Disconnect the user's Google account."""
     try:
         await google_service.disconnect(user.id)
+        gmail_sync.reset(user.id)
+        calendar_cache.invalidate(user.id)
         return {"status": "disconnected"}
     except Exception as e:
         logger.error(f"Error disconnecting Google: {e}")
@@ -1283,6 +1324,35 @@ async def send_email_gmail(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/emails/campaigns")
+async def create_email_campaign(
+    request: CampaignRequest,
+    user: object = Depends(get_current_user),
+):
+    """Queue a bulk send; returns immediately with the campaign id for progress polling."""
+    try:
+        campaign = await campaign_service.create_campaign(
+            user_id=user.id,
+            items=[email.dict() for email in request.emails],
+            html=request.html,
+        )
+        return {"status": "success", "campaign": campaign}
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"Error creating campaign: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/emails/campaigns/{campaign_id}")
+async def get_email_campaign(campaign_id: str, user: object = Depends(get_current_user)):
+    """Progress of a queued or running campaign."""
+    campaign = campaign_service.get_campaign(user.id, campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+    return {"status": "success", "campaign": campaign}
+
+
 @app.get("/emails/replies")
 async def get_email_replies(user: object = Depends(get_current_user)):
     """Fetch real email replies from Gmail and analyze them."""
@@ -1290,20 +1360,24 @@ async def get_email_replies(user: object = Depends(get_current_user)):
         user_id = user.id
         logger.info(f"Fetching email replies for user {user_id}")
 
-        replies_raw = await google_service.get_replies_for_sent_emails(
-            user_id=user_id, max_results=20
-        )
+        # Incremental sync: only messages new since the last call are downloaded
+        replies_raw = await gmail_sync.sync_replies(user_id=user_id, max_results=20)
 
-        # Analyze each reply with AI
-        analyzed_emails = []
-        for reply in replies_raw:
-            body = reply.get("body", reply.get("snippet", ""))
-            if not body:
-                continue
+        # Reuse analyses of already-processed messages
+        cached = gmail_sync.get_cached_analysis(user_id, [r["id"] for r in replies_raw])
 
-            sentiment, intent = await analyze_sentiment(body)
+        # Analyze the new replies with AI in one batch
+        replies = [
+            (reply, reply.get("body", reply.get("snippet", "")))
+            for reply in replies_raw
+            if reply["id"] not in cached
+        ]
+        replies = [(reply, body) for reply, body in replies if body]
+        labels = await analyze_sentiments_batch([body for _, body in replies])
 
-            analyzed_email = {
+        fresh = {}
+        for (reply, body), (sentiment, intent) in zip(replies, labels):
+            fresh[reply["id"]] = {
                 "email": {
                     "from": reply["from"],
                     "subject": reply["subject"],
@@ -1318,13 +1392,14 @@ async def get_email_replies(user: object = Depends(get_current_user)):
                 },
             }
 
-            if intent == "Follow-Up Required":
-                follow_up = await generate_followup_email(
-                    reply["from"], reply["subject"], body
-                )
-                analyzed_email["suggested_followup"] = follow_up
+        await attach_followups(list(fresh.values()))
+        gmail_sync.store_analysis(user_id, fresh)
 
-            analyzed_emails.append(analyzed_email)
+        analyzed_emails = [
+            cached.get(r["id"]) or fresh[r["id"]]
+            for r in replies_raw
+            if r["id"] in cached or r["id"] in fresh
+        ]
 
         return {
             "status": "success",
@@ -1338,6 +1413,18 @@ async def get_email_replies(user: object = Depends(get_current_user)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/emails/classifier-metrics")
+async def get_classifier_metrics(user: object = Depends(get_current_user)):
+    """Hit rate and LLM agreement of the local reply pre-classifier (for threshold tuning)."""
+    return {"status": "success", "metrics": pre_classifier.metrics.snapshot()}
+
+
+@app.get("/google/io-metrics")
+async def get_google_io_metrics(user: object = Depends(get_current_user)):
+    """Per-operation call counts, errors, timeouts and latency of Google API I/O."""
+    return {"status": "success", "metrics": google_service.io_stats()}
+
+
 # ── Calendar Endpoints ──────────────────────────────────────────
 
 
@@ -1346,9 +1433,9 @@ async def list_calendar_events(
     max_results: int = 10,
     user: object = Depends(get_current_user),
 ):
-    """List upcoming Google Calendar events."""
+    """List upcoming Google Calendar events (served from the per-user cache)."""
     try:
-        events = await google_service.list_events(
+        events = await calendar_cache.list_events(
             user_id=user.id, max_results=max_results
         )
         return {"status": "success", "events": events}
@@ -1375,9 +1462,52 @@ async def create_calendar_event(
             attendees=request.attendees,
             location=request.location,
         )
+        calendar_cache.mark_stale(user.id)
         return {"status": "success", "event": event}
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         logger.error(f"Error creating calendar event: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/calendar/free-slots")
+async def get_free_slots(
+    duration_minutes: int = 30,
+    days: int = 5,
+    start_hour: int = 9,
+    end_hour: int = 17,
+    timezone: str = "UTC",
+    max_slots: int = 10,
+    user: object = Depends(get_current_user),
+):
+    """Next available meeting slots within working hours, computed from the calendar cache."""
+    try:
+        slots = await calendar_cache.find_free_slots(
+            user_id=user.id,
+            duration_minutes=duration_minutes,
+            days=days,
+            start_hour=start_hour,
+            end_hour=end_hour,
+            timezone_name=timezone,
+            max_slots=max_slots,
+        )
+        return {"status": "success", "slots": slots}
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"Error finding free slots: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/calendar/notifications")
+async def calendar_notification(request: Request):
+    """Google Calendar push notification (events.watch channel)."""
+    accepted = calendar_cache.handle_notification(
+        channel_id=request.headers.get("X-Goog-Channel-ID", ""),
+        token=request.headers.get("X-Goog-Channel-Token", ""),
+        resource_state=request.headers.get("X-Goog-Resource-State", ""),
+    )
+    if not accepted:
+        logger.warning("Ignoring calendar notification for unknown channel")
+    return {"status": "success" if accepted else "ignored"}
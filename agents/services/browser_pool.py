@@ -0,0 +1,203 @@
+"""
+Shared Playwright Browser Pool
+==============================
+One process-wide set of warm Chromium browsers for every Playwright scraper.
+
+  browsers   BROWSER_POOL_SIZE instances, launched once (warm_up() on app
+             startup) and relaunched if one crashes or disconnects
+  pages      at most BROWSER_POOL_MAX_PAGES leases in flight; each lease is a
+             stealth-configured context + page that is reset (about:blank,
+             cookies cleared) and reused by the next scrape
+  recycling  a context is closed after BROWSER_POOL_MAX_USES uses, or as soon
+             as its page / browser is found unhealthy
+
+Scrapers borrow a page with `async with browser_pool.page() as page:` or
+acquire()/release(), so a scrape no longer pays browser launch or context
+setup.
+"""
+
+import asyncio
+import logging
+import os
+import random
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import List, Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+
+logger = logging.getLogger(__name__)
+
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "1"))
+BROWSER_POOL_MAX_PAGES = int(os.getenv("BROWSER_POOL_MAX_PAGES", "6"))
+BROWSER_POOL_MAX_USES = int(os.getenv("BROWSER_POOL_MAX_USES", "20"))
+
+USER_AGENTS = [
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_2_1) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
+]
+
+STEALTH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--disable-infobars",
+    "--disable-dev-shm-usage",
+    "--window-size=1280,800",
+]
+
+STEALTH_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
+    Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3] });
+    window.chrome = { runtime: {} };
+"""
+
+
+@dataclass
+class PageLease:
+    browser: Browser
+    context: BrowserContext
+    page: Page
+    uses: int = 0
+
+
+class BrowserPool:
+    """Warm browsers plus a bounded pool of reusable stealth contexts/pages."""
+
+    def __init__(
+        self,
+        browsers: int = BROWSER_POOL_SIZE,
+        max_pages: int = BROWSER_POOL_MAX_PAGES,
+        max_uses: int = BROWSER_POOL_MAX_USES,
+    ):
+        self.max_uses = max_uses
+        self._playwright = None
+        self._browsers: List[Optional[Browser]] = [None] * max(1, browsers)
+        self._next_browser = 0
+        self._launch_lock = asyncio.Lock()
+        self._idle: List[PageLease] = []
+        self._slots = asyncio.Semaphore(max_pages)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def warm_up(self):
+        """Launch all browsers ahead of the first scrape."""
+        try:
+            for _ in self._browsers:
+                await self._get_browser()
+            logger.info(f"[BrowserPool] {len(self._browsers)} browser(s) ready")
+        except Exception as e:
+            logger.warning(f"[BrowserPool] Warm-up failed, browsers will launch on demand: {e}")
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for lease in idle:
+            await self._discard(lease)
+        for i, browser in enumerate(self._browsers):
+            if browser:
+                try:
+                    await browser.close()
+                except Exception:
+                    pass
+                self._browsers[i] = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    # ------------------------------------------------------------------
+    # Leases
+    # ------------------------------------------------------------------
+
+    async def acquire(self) -> PageLease:
+        await self._slots.acquire()
+        try:
+            while self._idle:
+                lease = self._idle.pop()
+                if self._is_healthy(lease):
+                    return lease
+                await self._discard(lease)
+
+            browser = await self._get_browser()
+            context = await self._new_context(browser)
+            page = await context.new_page()
+            return PageLease(browser, context, page)
+        except Exception:
+            self._slots.release()
+            raise
+
+    async def release(self, lease: PageLease):
+        """Reset the page and return it to the pool (or close it if worn out / broken)."""
+        try:
+            lease.uses += 1
+            if lease.uses >= self.max_uses or not self._is_healthy(lease):
+                await self._discard(lease)
+                return
+            try:
+                await lease.page.goto("about:blank")
+                await lease.context.clear_cookies()
+            except Exception:
+                await self._discard(lease)
+                return
+            self._idle.append(lease)
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def page(self):
+        lease = await self.acquire()
+        try:
+            yield lease.page
+        finally:
+            await self.release(lease)
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _get_browser(self) -> Browser:
+        async with self._launch_lock:
+            if not self._playwright:
+                self._playwright = await async_playwright().start()
+
+            index = self._next_browser % len(self._browsers)
+            self._next_browser += 1
+            browser = self._browsers[index]
+            if browser and browser.is_connected():
+                return browser
+
+            if browser:
+                logger.warning(f"[BrowserPool] Browser {index} disconnected — relaunching")
+            browser = await self._playwright.chromium.launch(headless=True, args=STEALTH_ARGS)
+            self._browsers[index] = browser
+            return browser
+
+    async def _new_context(self, browser: Browser) -> BrowserContext:
+        ctx = await browser.new_context(
+            user_agent=random.choice(USER_AGENTS),
+            viewport={"width": 1280, "height": 800},
+            locale="en-US",
+            timezone_id="America/New_York",
+            extra_http_headers={
+                "Accept-Language": "en-US,en;q=0.9",
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            },
+        )
+        # Mask automation fingerprint
+        await ctx.add_init_script(STEALTH_SCRIPT)
+        return ctx
+
+    def _is_healthy(self, lease: PageLease) -> bool:
+        return lease.browser.is_connected() and not lease.page.is_closed()
+
+    async def _discard(self, lease: PageLease):
+        try:
+            await lease.context.close()
+        except Exception:
+            pass
+
+
+browser_pool = BrowserPool()
@@ -0,0 +1,323 @@
+"""
+Calendar Event Cache
+====================
+Per-user mirror of the primary Google Calendar so /calendar/events and
+scheduling suggestions are answered from memory.
+
+  First sync:   events.list(singleEvents, timeMin = now - 1 day), all pages;
+                the final page's nextSyncToken is kept.
+  Later syncs:  events.list(syncToken) returns only changed / cancelled
+                events. 410 Gone (token expired) → full resync.
+  Freshness:    a mirror is re-synced (incrementally) once it is older than
+                CALENDAR_CACHE_TTL, or immediately after a push notification
+                or an event we created ourselves.
+
+Push invalidation is enabled when GOOGLE_CALENDAR_WEBHOOK_URL is set: an
+events.watch channel is opened per user and Google's POSTs to
+/calendar/notifications mark that user's mirror stale.
+
+find_free_slots() computes open working-hour slots from the mirror, so a
+scheduling query costs no Calendar round trip while the mirror is fresh.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from datetime import time as dtime
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from googleapiclient.errors import HttpError
+
+from services.google_service import GoogleService
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_CACHE_TTL = float(os.getenv("CALENDAR_CACHE_TTL", "60"))
+CALENDAR_WEBHOOK_URL = os.getenv("GOOGLE_CALENDAR_WEBHOOK_URL", "")
+
+SYNC_LOOKBACK = timedelta(days=1)
+PAGE_SIZE = 250
+SLOT_STEP = timedelta(minutes=30)
+
+# Re-open a watch channel this long before Google expires it
+WATCH_RENEW_MARGIN = 3600
+WATCH_RETRY_DELAY = 3600
+
+
+def _parse_time(value: str) -> datetime:
+    """Calendar times are RFC 3339 dateTimes or all-day dates."""
+    if len(value) == 10:
+        return datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _is_busy(event: Dict) -> bool:
+    if event.get("transparency") == "transparent":
+        return False
+    for attendee in event.get("attendees", []):
+        if attendee.get("self") and attendee.get("responseStatus") == "declined":
+            return False
+    return True
+
+
+class CalendarCacheService:
+    """syncToken-based per-user calendar mirror with free-slot lookup."""
+
+    def __init__(self, google_service: GoogleService):
+        self.google = google_service
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # channel id → {"user_id", "resource_id", "expires_at"}
+        self._channels: Dict[str, Dict[str, Any]] = {}
+        self._watch_retry_at: Dict[str, float] = {}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def list_events(
+        self, user_id: str, max_results: int = 10, time_min: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Upcoming events in start order, same shape as GoogleService.list_events."""
+        lower = _parse_time(time_min) if time_min else datetime.now(timezone.utc)
+        state = await self._fresh_state(user_id)
+        if lower < state["window_start"]:
+            # Older than the mirrored window: ask Google directly
+            return await self.google.list_events(user_id, max_results=max_results, time_min=time_min)
+
+        upcoming = [e for e in state["events"].values() if e["end"] > lower]
+        upcoming.sort(key=lambda e: e["start"])
+        return [e["event"] for e in upcoming[:max_results]]
+
+    async def find_free_slots(
+        self,
+        user_id: str,
+        duration_minutes: int = 30,
+        days: int = 5,
+        start_hour: int = 9,
+        end_hour: int = 17,
+        timezone_name: str = "UTC",
+        max_slots: int = 10,
+        include_weekends: bool = False,
+    ) -> List[Dict[str, str]]:
+        """Next open slots of `duration_minutes` inside working hours."""
+        if duration_minutes <= 0 or not 0 <= start_hour < end_hour <= 24:
+            raise ValueError("Invalid slot duration or working hours.")
+        try:
+            tz = ZoneInfo(timezone_name)
+        except Exception:
+            raise ValueError(f"Unknown timezone: {timezone_name}")
+
+        state = await self._fresh_state(user_id)
+        duration = timedelta(minutes=duration_minutes)
+        now = datetime.now(tz)
+        # Start on the next quarter hour
+        cursor_floor = (now + timedelta(minutes=14, seconds=59)).replace(second=0, microsecond=0)
+        cursor_floor -= timedelta(minutes=cursor_floor.minute % 15)
+
+        def window_end(day):
+            if end_hour == 24:
+                return datetime.combine(day + timedelta(days=1), dtime(0), tz)
+            return datetime.combine(day, dtime(end_hour), tz)
+
+        # End of the last working window the loop below generates
+        horizon = window_end((now + timedelta(days=days)).date())
+
+        busy = sorted(
+            (e["start"], e["end"])
+            for e in state["events"].values()
+            if e["busy"] and e["end"] > now and e["start"] < horizon
+        )
+
+        slots: List[Dict[str, str]] = []
+        for offset in range(days + 1):
+            day = (now + timedelta(days=offset)).date()
+            if not include_weekends and day.weekday() >= 5:
+                continue
+            day_start = datetime.combine(day, dtime(start_hour), tz)
+            day_end = window_end(day)
+            for free_start, free_end in self._free_windows(max(day_start, cursor_floor), day_end, busy):
+                slot = free_start
+                while slot + duration <= free_end:
+                    slots.append({"start": slot.isoformat(), "end": (slot + duration).isoformat()})
+                    if len(slots) >= max_slots:
+                        return slots
+                    slot += SLOT_STEP
+        return slots
+
+    def mark_stale(self, user_id: str):
+        """Force an incremental sync on the next read (e.g. after creating an event)."""
+        state = self._states.get(user_id)
+        if state:
+            state["stale"] = True
+
+    def handle_notification(self, channel_id: str, token: str, resource_state: str) -> bool:
+        """Apply a Calendar push notification. Returns False for unknown channels."""
+        channel = self._channels.get(channel_id)
+        if not channel or channel["user_id"] != token:
+            return False
+        if resource_state != "sync":   # "sync" only confirms the channel was opened
+            self.mark_stale(channel["user_id"])
+        return True
+
+    def invalidate(self, user_id: str):
+        """Forget a user's mirror and channels (on Google disconnect)."""
+        self._states.pop(user_id, None)
+        self._watch_retry_at.pop(user_id, None)
+        for channel_id in [c for c, ch in self._channels.items() if ch["user_id"] == user_id]:
+            self._channels.pop(channel_id, None)
+
+    # ------------------------------------------------------------------
+    # Sync internals
+    # ------------------------------------------------------------------
+
+    def _is_fresh(self, state: Optional[Dict[str, Any]]) -> bool:
+        return bool(state) and not state["stale"] and time.monotonic() - state["synced_at"] < CALENDAR_CACHE_TTL
+
+    async def _fresh_state(self, user_id: str) -> Dict[str, Any]:
+        state = self._states.get(user_id)
+        if self._is_fresh(state):
+            return state
+
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            state = self._states.get(user_id)
+            if not self._is_fresh(state):
+                state = await self._sync(user_id, state)
+                self._states[user_id] = state
+
+        if CALENDAR_WEBHOOK_URL:
+            await self._ensure_watch(user_id)
+        return state
+
+    async def _sync(self, user_id: str, state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        service = await self.google.get_service(user_id, "calendar")
+
+        if state and state["sync_token"]:
+            try:
+                items, sync_token = await self._list_all(service, syncToken=state["sync_token"])
+                self._apply(state, items)
+                state.update(sync_token=sync_token, synced_at=time.monotonic(), stale=False)
+                logger.info(f"[CalendarCache] User {user_id}: {len(items)} change(s)")
+                return state
+            except HttpError as e:
+                if e.resp.status != 410:
+                    raise
+                logger.info(f"[CalendarCache] Sync token expired for user {user_id} — full resync")
+
+        window_start = datetime.now(timezone.utc) - SYNC_LOOKBACK
+        items, sync_token = await self._list_all(service, timeMin=window_start.isoformat())
+        state = {
+            "events": {},
+            "sync_token": sync_token,
+            "window_start": window_start,
+            "synced_at": time.monotonic(),
+            "stale": False,
+        }
+        self._apply(state, items)
+        logger.info(f"[CalendarCache] User {user_id}: full sync, {len(state['events'])} event(s)")
+        return state
+
+    async def _list_all(self, service, **params) -> Tuple[List[Dict], Optional[str]]:
+        items: List[Dict] = []
+        page_token = None
+        while True:
+            result = await self.google.execute(
+                service.events().list(
+                    calendarId="primary",
+                    singleEvents=True,
+                    maxResults=PAGE_SIZE,
+                    pageToken=page_token,
+                    **params,
+                ),
+                "calendar.events.list",
+            )
+            items.extend(result.get("items", []))
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                return items, result.get("nextSyncToken")
+
+    def _apply(self, state: Dict[str, Any], items: List[Dict]):
+        events = state["events"]
+        for item in items:
+            if item.get("status") == "cancelled" or "start" not in item:
+                events.pop(item["id"], None)
+                continue
+            events[item["id"]] = {
+                "event": self.google.parse_event(item),
+                "start": _parse_time(item["start"].get("dateTime", item["start"].get("date"))),
+                "end": _parse_time(item["end"].get("dateTime", item["end"].get("date"))),
+                "busy": _is_busy(item),
+            }
+
+        # Keep the mirror bounded: past events fall out of the window
+        window_start = datetime.now(timezone.utc) - SYNC_LOOKBACK
+        for event_id in [i for i, e in events.items() if e["end"] < window_start]:
+            del events[event_id]
+        state["window_start"] = max(state["window_start"], window_start)
+
+    @staticmethod
+    def _free_windows(
+        start: datetime, end: datetime, busy: List[Tuple[datetime, datetime]]
+    ) -> List[Tuple[datetime, datetime]]:
+        windows = []
+        cursor = start
+        for busy_start, busy_end in busy:
+            if busy_end <= cursor or busy_start >= end:
+                continue
+            if busy_start > cursor:
+                windows.append((cursor, busy_start))
+            cursor = max(cursor, busy_end)
+            if cursor >= end:
+                break
+        if cursor < end:
+            windows.append((cursor, end))
+        return windows
+
+    # ------------------------------------------------------------------
+    # Push notifications
+    # ------------------------------------------------------------------
+
+    async def _ensure_watch(self, user_id: str):
+        now = time.time()
+        for channel_id in [c for c, ch in self._channels.items() if ch["expires_at"] <= now]:
+            del self._channels[channel_id]
+        if any(
+            c["user_id"] == user_id and c["expires_at"] - WATCH_RENEW_MARGIN > now
+            for c in self._channels.values()
+        ):
+            return
+        if self._watch_retry_at.get(user_id, 0) > now:
+            return
+
+        channel_id = str(uuid.uuid4())
+        try:
+            service = await self.google.get_service(user_id, "calendar")
+            response = await self.google.execute(
+                service.events().watch(
+                    calendarId="primary",
+                    body={
+                        "id": channel_id,
+                        "type": "web_hook",
+                        "address": CALENDAR_WEBHOOK_URL,
+                        "token": user_id,
+                    },
+                ),
+                "calendar.events.watch",
+            )
+        except Exception as e:
+            self._watch_retry_at[user_id] = now + WATCH_RETRY_DELAY
+            logger.warning(f"[CalendarCache] Could not open watch channel for user {user_id}: {e}")
+            return
+
+        self._channels[channel_id] = {
+            "user_id": user_id,
+            "resource_id": response.get("resourceId"),
+            "expires_at": int(response.get("expiration", 0)) / 1000,
+        }
+        logger.info(f"[CalendarCache] Watching calendar of user {user_id} (channel {channel_id})")
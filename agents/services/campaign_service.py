@@ -0,0 +1,243 @@
+"""
+Outbound Campaign Send Engine
+=============================
+Sends many (recipient, subject, body) items through a user's Gmail account
+without one browser → backend → Gmail round trip per email.
+
+  POST /emails/campaigns      create_campaign() validates, queues and returns
+                              the campaign id immediately (fire-and-forget)
+  per-user worker             runs that user's campaigns one after another;
+                              inside a campaign up to MAX_CONCURRENT_SENDS
+                              emails are in flight, paced by a per-user token
+                              bucket so we stay inside Gmail's sending quota
+  bulk persistence            outcomes are buffered and written to the
+                              `emails` table FLUSH_SIZE rows per insert
+  GET /emails/campaigns/{id}  in-memory progress snapshot; a finished
+                              campaign is "completed", "completed_with_errors"
+                              or, if nothing was sent, "failed"
+
+Rate-limit answers from Gmail (429 / userRateLimitExceeded) drain the
+bucket and the item is retried with backoff.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from googleapiclient.errors import HttpError
+from supabase import Client
+
+from core.rate_limiter import AsyncTokenBucket
+from services.google_service import GoogleService
+
+logger = logging.getLogger(__name__)
+
+SENDS_PER_SECOND = float(os.getenv("GMAIL_SENDS_PER_SECOND", "2"))
+SEND_BURST = int(os.getenv("GMAIL_SEND_BURST", "5"))
+MAX_CONCURRENT_SENDS = int(os.getenv("CAMPAIGN_MAX_CONCURRENT_SENDS", "4"))
+MAX_SEND_ATTEMPTS = 3
+FLUSH_SIZE = 25
+
+# Finished campaigns stay queryable for this long
+CAMPAIGN_RETENTION = timedelta(hours=24)
+MAX_RECORDED_ERRORS = 50
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    if not isinstance(error, HttpError):
+        return False
+    if error.resp.status == 429:
+        return True
+    return error.resp.status == 403 and b"RateLimitExceeded" in (error.content or b"")
+
+
+class CampaignService:
+    """Per-user queued, quota-paced bulk sending via GoogleService."""
+
+    def __init__(self, google_service: GoogleService, supabase: Client):
+        self.google = google_service
+        self.supabase = supabase
+        self._campaigns: Dict[str, Dict[str, Any]] = {}
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._buckets: Dict[str, AsyncTokenBucket] = {}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def create_campaign(
+        self, user_id: str, items: List[Dict[str, Any]], html: bool = False
+    ) -> Dict[str, Any]:
+        """Queue a campaign and return its initial progress snapshot."""
+        if not items:
+            raise ValueError("Campaign has no emails.")
+        # Fail fast if the account isn't connected instead of failing every item
+        await self.google.get_service(user_id, "gmail")
+
+        self._prune_finished()
+        campaign_id = str(uuid.uuid4())
+        self._campaigns[campaign_id] = {
+            "id": campaign_id,
+            "user_id": user_id,
+            "status": "queued",
+            "total": len(items),
+            "sent": 0,
+            "failed": 0,
+            "errors": [],
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "_items": items,
+            "_html": html,
+        }
+
+        queue = self._queues.setdefault(user_id, asyncio.Queue())
+        queue.put_nowait(campaign_id)
+        worker = self._workers.get(user_id)
+        if not worker or worker.done():
+            self._workers[user_id] = asyncio.create_task(self._run_user_queue(user_id))
+
+        logger.info(f"[Campaigns] Queued campaign {campaign_id} ({len(items)} emails) for user {user_id}")
+        return self.get_campaign(user_id, campaign_id)
+
+    def get_campaign(self, user_id: str, campaign_id: str) -> Optional[Dict[str, Any]]:
+        campaign = self._campaigns.get(campaign_id)
+        if not campaign or campaign["user_id"] != user_id:
+            return None
+        snapshot = {k: v for k, v in campaign.items() if not k.startswith("_")}
+        snapshot["pending"] = campaign["total"] - campaign["sent"] - campaign["failed"]
+        return snapshot
+
+    async def stop(self):
+        for task in self._workers.values():
+            task.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers.values(), return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    async def _run_user_queue(self, user_id: str):
+        queue = self._queues[user_id]
+        while not queue.empty():
+            campaign_id = queue.get_nowait()
+            campaign = self._campaigns.get(campaign_id)
+            if not campaign:
+                continue
+            try:
+                await self._send_campaign(campaign)
+            except Exception as e:
+                campaign["status"] = "failed"
+                campaign["errors"].append({"error": str(e)})
+                logger.error(f"[Campaigns] Campaign {campaign_id} aborted: {e}")
+            finally:
+                campaign["finished_at"] = datetime.now(timezone.utc).isoformat()
+                campaign.pop("_items", None)
+
+    async def _send_campaign(self, campaign: Dict[str, Any]):
+        user_id = campaign["user_id"]
+        campaign["status"] = "sending"
+        campaign["started_at"] = datetime.now(timezone.utc).isoformat()
+
+        bucket = self._buckets.setdefault(user_id, AsyncTokenBucket(SENDS_PER_SECOND, SEND_BURST))
+        slots = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+        records: List[Dict[str, Any]] = []
+
+        async def _send(item: Dict[str, Any]):
+            async with slots:
+                record = await self._send_item(user_id, bucket, item, campaign["_html"])
+            if record["status"] == "sent":
+                campaign["sent"] += 1
+            else:
+                campaign["failed"] += 1
+                if len(campaign["errors"]) < MAX_RECORDED_ERRORS:
+                    campaign["errors"].append({"to": item["to"], "error": record.pop("error")})
+            record.pop("error", None)
+            records.append(record)
+            if len(records) >= FLUSH_SIZE:
+                batch = records[:]
+                records.clear()
+                await self._flush(batch)
+
+        await asyncio.gather(*(_send(item) for item in campaign["_items"]))
+        await self._flush(records)
+
+        if not campaign["failed"]:
+            campaign["status"] = "completed"
+        elif campaign["sent"]:
+            campaign["status"] = "completed_with_errors"
+        else:
+            campaign["status"] = "failed"
+        logger.info(
+            f"[Campaigns] Campaign {campaign['id']} done: "
+            f"{campaign['sent']} sent, {campaign['failed']} failed"
+        )
+
+    async def _send_item(
+        self, user_id: str, bucket: AsyncTokenBucket, item: Dict[str, Any], html: bool
+    ) -> Dict[str, Any]:
+        # Same keys on every row: PostgREST bulk inserts reject mixed key sets
+        record = {
+            "user_id": user_id,
+            "recipient": item["to"],
+            "subject": item["subject"],
+            "body": item["body"],
+            "prospect_id": item.get("prospect_id"),
+            "status": None,
+            "sent_at": None,
+            "gmail_message_id": None,
+            "gmail_thread_id": None,
+        }
+
+        for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+            await bucket.acquire()
+            try:
+                result = await self.google.send_email(
+                    user_id=user_id,
+                    to=item["to"],
+                    subject=item["subject"],
+                    body=item["body"],
+                    html=html,
+                )
+                record.update({
+                    "status": "sent",
+                    "sent_at": datetime.now().isoformat(),
+                    "gmail_message_id": result["message_id"],
+                    "gmail_thread_id": result["thread_id"],
+                })
+                return record
+            except Exception as e:
+                if _is_rate_limited(e) and attempt < MAX_SEND_ATTEMPTS:
+                    bucket.drain()
+                    delay = 2 ** attempt * random.uniform(0.8, 1.2)
+                    logger.warning(f"[Campaigns] Gmail rate limit for user {user_id}; retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+                    continue
+                logger.error(f"[Campaigns] Failed to send to {item['to']}: {e}")
+                record.update({"status": "failed", "error": str(e)[:500]})
+                return record
+
+    async def _flush(self, records: List[Dict[str, Any]]):
+        """One insert per batch of outcomes."""
+        if not records:
+            return
+        try:
+            await self.google.run_blocking(
+                self.supabase.table("emails").insert(records).execute,
+                "supabase.emails.insert",
+            )
+        except Exception as e:
+            logger.error(f"[Campaigns] Failed to record {len(records)} email(s): {e}")
+
+    def _prune_finished(self):
+        cutoff = datetime.now(timezone.utc) - CAMPAIGN_RETENTION
+        for campaign_id, campaign in list(self._campaigns.items()):
+            finished = campaign.get("finished_at")
+            if finished and datetime.fromisoformat(finished) < cutoff:
+                del self._campaigns[campaign_id]
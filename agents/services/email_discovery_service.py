@@ -8,22 +8,56 @@ Generates email candidates using 10 common enterprise patterns from
   3. Confidence scoring   — pattern weight × SMTP result
 
 Optional: Hunter.io API fallback if HUNTER_API_KEY is set.
+
+What is learned about a domain is kept in a process-wide DomainIntelCache,
+so prospects at the same company share the work:
+  MX        resolved once per domain (async DNS) and kept for the record's
+            TTL; lookups for the same domain are single-flight
+  SMTP      probes arriving within PROBE_BATCH_WINDOW are coalesced into one
+            session (EHLO / MAIL FROM once, then one RCPT per address), which
+            also tests a random address to detect catch-all servers
+  Facts     catch-all status, whether the server blocks probing (a timeout
+            only pauses probing for PROBE_TIMEOUT_TTL), and the pattern of
+            the last verified address; a known pattern is probed first and
+            alone
 """
 
 import asyncio
 import logging
 import os
 import re
-import smtplib
-import socket
+import time
+import uuid
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Union
 
-import dns.resolver
 import aiohttp
+import aiosmtplib
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
 
 logger = logging.getLogger(__name__)
 
+DNS_TIMEOUT = 5.0
+# Bounds on how long an MX answer is trusted, whatever its record TTL says
+MX_MIN_TTL = 300
+MX_MAX_TTL = 24 * 3600
+# Domains with no MX (NXDOMAIN / no answer) vs. lookups that failed outright
+MX_NEGATIVE_TTL = 3600
+MX_ERROR_TTL = 60
+# Catch-all status and known pattern, and how long a block is respected
+DOMAIN_INTEL_TTL = float(os.getenv("DOMAIN_INTEL_TTL", str(7 * 24 * 3600)))
+PROBE_BLOCKED_TTL = float(os.getenv("PROBE_BLOCKED_TTL", "3600"))
+# A timed-out session may be transient: back off briefly, don't mark a block
+PROBE_TIMEOUT_TTL = float(os.getenv("PROBE_TIMEOUT_TTL", "300"))
+DOMAIN_INTEL_MAX_ENTRIES = 5000
+PROBE_BATCH_WINDOW = 0.05
+MAX_RCPT_PER_SESSION = 50
+PROBE_HELO = "probe.ai-sdr.local"
+PROBE_SENDER = "probe@ai-sdr.local"
+
 # ---------------------------------------------------------------------------
 # Data classes
 # ---------------------------------------------------------------------------
@@ -38,6 +72,18 @@ class EmailCandidate:
     note: str = ""
 
 
+@dataclass
+class DomainIntel:
+    domain: str
+    mx_hosts: List[str] = field(default_factory=list)  # by preference
+    mx_expires_at: float = 0.0
+    catch_all: Optional[bool] = None   # None = not tested yet
+    probe_blocked: bool = False
+    probe_paused_until: float = 0.0    # after a timeout
+    pattern: Optional[str] = None      # pattern_name of a verified address
+    smtp_checked_at: float = 0.0
+
+
 # ---------------------------------------------------------------------------
 # 10 canonical email patterns (ordered by global enterprise frequency)
 # ---------------------------------------------------------------------------
@@ -61,12 +107,172 @@ PATTERN_WEIGHTS = {1: 0.9, 2: 0.8, 3: 0.75, 4: 0.65, 5: 0.6,
                    6: 0.55, 7: 0.70, 8: 0.45, 9: 0.35, 10: 0.40}
 
 
+# ---------------------------------------------------------------------------
+# Domain intelligence cache
+# ---------------------------------------------------------------------------
+
+ProbeResult = Tuple[Optional[int], str]
+
+
+class DomainIntelCache:
+    """MX hosts, SMTP facts and coalesced RCPT probes, per domain."""
+
+    def __init__(self, smtp_timeout: float = 10):
+        self.smtp_timeout = smtp_timeout
+        self._intel: "OrderedDict[str, DomainIntel]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # domain → [(addresses, future)] waiting for the next session
+        self._pending: Dict[str, List[Tuple[List[str], asyncio.Future]]] = {}
+        self._tasks: set = set()
+
+    def get(self, domain: str) -> DomainIntel:
+        intel = self._intel.get(domain)
+        if intel is None:
+            intel = self._intel[domain] = DomainIntel(domain)
+            while len(self._intel) > DOMAIN_INTEL_MAX_ENTRIES:
+                evicted, _ = self._intel.popitem(last=False)
+                self._locks.pop(evicted, None)
+        self._intel.move_to_end(domain)
+
+        ttl = PROBE_BLOCKED_TTL if intel.probe_blocked else DOMAIN_INTEL_TTL
+        if intel.smtp_checked_at and time.monotonic() - intel.smtp_checked_at > ttl:
+            intel.catch_all, intel.probe_blocked, intel.pattern = None, False, None
+            intel.smtp_checked_at = 0.0
+        return intel
+
+    async def mx_hosts(self, domain: str) -> List[str]:
+        """MX hosts of `domain` by preference; [] when it has none."""
+        intel = self.get(domain)
+        if intel.mx_expires_at > time.monotonic():
+            return intel.mx_hosts
+
+        async with self._locks.setdefault(domain, asyncio.Lock()):
+            if intel.mx_expires_at > time.monotonic():
+                return intel.mx_hosts
+            try:
+                answer = await dns.asyncresolver.resolve(domain, "MX", lifetime=DNS_TIMEOUT)
+                intel.mx_hosts = [
+                    str(r.exchange).rstrip(".") for r in sorted(answer, key=lambda r: r.preference)
+                ]
+                ttl = min(max(answer.rrset.ttl, MX_MIN_TTL), MX_MAX_TTL)
+            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.resolver.NoNameservers):
+                intel.mx_hosts, ttl = [], MX_NEGATIVE_TTL
+            except (dns.exception.DNSException, OSError) as e:
+                logger.warning(f"MX check failed for {domain}: {e}")
+                intel.mx_hosts, ttl = [], MX_ERROR_TTL
+            intel.mx_expires_at = time.monotonic() + ttl
+            return intel.mx_hosts
+
+    async def probe(self, domain: str, addresses: List[str]) -> Dict[str, ProbeResult]:
+        """
+        RCPT TO result for each address. Concurrent calls for the same domain
+        share one SMTP session.
+        """
+        future = asyncio.get_running_loop().create_future()
+        waiting = self._pending.setdefault(domain, [])
+        waiting.append((addresses, future))
+        if len(waiting) == 1:
+            task = asyncio.create_task(self._flush(domain))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return await future
+
+    async def _flush(self, domain: str):
+        await asyncio.sleep(PROBE_BATCH_WINDOW)
+        batch = self._pending.pop(domain, [])
+        addresses = list(dict.fromkeys(a for addrs, _ in batch for a in addrs))
+        try:
+            results = await self._session(domain, addresses)
+        except Exception as e:
+            results = {a: (None, f"SMTP probe error: {e}") for a in addresses}
+        for addrs, future in batch:
+            if not future.done():
+                future.set_result({a: results.get(a, (None, "Not probed")) for a in addrs})
+
+    async def _session(self, domain: str, addresses: List[str]) -> Dict[str, ProbeResult]:
+        intel = self.get(domain)
+        hosts = await self.mx_hosts(domain)
+        if not hosts:
+            return {a: (None, "No MX records") for a in addresses}
+        if intel.probe_blocked:
+            return {a: (None, "Server blocks probing (cached)") for a in addresses}
+        if intel.probe_paused_until > time.monotonic():
+            return {a: (None, "SMTP timed out recently (cached)") for a in addresses}
+
+        # A made-up mailbox accepted alongside the real ones means catch-all
+        catch_all_probe = f"zz-{uuid.uuid4().hex[:12]}@{domain}" if intel.catch_all is None else None
+        rcpts = addresses + ([catch_all_probe] if catch_all_probe else [])
+
+        results: Dict[str, ProbeResult] = {}
+        for start in range(0, len(rcpts), MAX_RCPT_PER_SESSION):
+            chunk = rcpts[start:start + MAX_RCPT_PER_SESSION]
+            chunk_results = await self._rcpt_session(hosts[0], chunk)
+            if chunk_results == "timeout":
+                intel.probe_paused_until = time.monotonic() + PROBE_TIMEOUT_TTL
+                logger.info(f"[EmailIntel] SMTP at {domain} timed out; retrying after {PROBE_TIMEOUT_TTL:.0f}s")
+                return {a: results.get(a, (None, "Connection timed out")) for a in addresses}
+            if chunk_results is None:
+                intel.probe_blocked = True
+                intel.smtp_checked_at = time.monotonic()
+                logger.info(f"[EmailIntel] {domain} blocks SMTP probing; skipping it for {PROBE_BLOCKED_TTL:.0f}s")
+                return {a: results.get(a, (None, "Server blocks probing")) for a in addresses}
+            results.update(chunk_results)
+
+        if catch_all_probe and results.get(catch_all_probe, (None,))[0] is not None:
+            intel.catch_all = results[catch_all_probe][0] == 250
+            intel.smtp_checked_at = time.monotonic()
+        results.pop(catch_all_probe, None)
+        logger.info(f"[EmailIntel] Probed {len(addresses)} addresses at {domain} in one session")
+        return results
+
+    async def _rcpt_session(self, mx_host: str, rcpts: List[str]) -> Union[Dict[str, ProbeResult], str, None]:
+        """
+        One SMTP session, one RCPT per address. None if the server won't let
+        us probe, "timeout" if setting up the session timed out.
+        """
+        smtp = aiosmtplib.SMTP(hostname=mx_host, port=25, timeout=self.smtp_timeout, start_tls=False)
+        try:
+            await smtp.connect()
+            await smtp.ehlo(PROBE_HELO)
+            await smtp.mail(PROBE_SENDER)
+        except (aiosmtplib.SMTPTimeoutError, asyncio.TimeoutError) as e:
+            logger.debug(f"[EmailIntel] SMTP setup with {mx_host} timed out: {e}")
+            smtp.close()
+            return "timeout"
+        except (aiosmtplib.SMTPException, OSError) as e:
+            logger.debug(f"[EmailIntel] SMTP setup with {mx_host} failed: {e}")
+            smtp.close()
+            return None
+
+        results: Dict[str, ProbeResult] = {}
+        try:
+            for address in rcpts:
+                try:
+                    response = await smtp.rcpt(address)
+                    results[address] = (response.code, response.message)
+                except aiosmtplib.SMTPResponseException as e:
+                    # SMTPRecipientRefused included: a 5xx here is the answer we want
+                    results[address] = (e.code, e.message)
+        except (aiosmtplib.SMTPException, OSError, asyncio.TimeoutError):
+            for address in rcpts:
+                results.setdefault(address, (None, "Server disconnected early"))
+        finally:
+            try:
+                await smtp.quit()
+            except Exception:
+                smtp.close()
+        return results
+
+
+domain_intel_cache = DomainIntelCache()
+
+
 class EmailDiscoveryService:
     """Discovers and verifies email addresses for a given prospect."""
 
-    def __init__(self):
+    def __init__(self, domain_intel: Optional[DomainIntelCache] = None):
         self.hunter_api_key = os.getenv("HUNTER_API_KEY")
-        self.smtp_timeout = 10  # seconds
+        self.domain_intel = domain_intel or domain_intel_cache
 
     # ------------------------------------------------------------------
     # Public API
@@ -94,18 +300,7 @@ class EmailDiscoveryService:
 
     async def check_mx_records(self, domain: str) -> bool:
         """Check whether `domain` has MX records. Returns True/False."""
-        try:
-            loop = asyncio.get_event_loop()
-            records = await loop.run_in_executor(
-                None, lambda: dns.resolver.resolve(domain, "MX")
-            )
-            return len(records) > 0
-        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer,
-                dns.resolver.NoNameservers, dns.exception.DNSException):
-            return False
-        except Exception as e:
-            logger.warning(f"MX check failed for {domain}: {e}")
-            return False
+        return bool(await self.domain_intel.mx_hosts(domain))
 
     async def verify_smtp(self, email: str, domain: str) -> Tuple[Optional[int], str]:
         """
@@ -113,43 +308,8 @@ class EmailDiscoveryService:
         Returns (smtp_code, note) where smtp_code is None on connection failure.
         250 = accepted, 550/551 = rejected, None = unverifiable (server blocked)
         """
-        try:
-            # Resolve MX
-            loop = asyncio.get_event_loop()
-            mx_records = await loop.run_in_executor(
-                None, lambda: sorted(
-                    dns.resolver.resolve(domain, "MX"),
-                    key=lambda r: r.preference
-                )
-            )
-            if not mx_records:
-                return None, "No MX records"
-
-            mx_host = str(mx_records[0].exchange).rstrip(".")
-
-            def _smtp_probe():
-                try:
-                    with smtplib.SMTP(mx_host, 25, timeout=self.smtp_timeout) as server:
-                        server.ehlo("probe.ai-sdr.local")
-                        code, _ = server.mail("probe@ai-sdr.local")
-                        if code != 250:
-                            return None, "MAIL FROM rejected"
-                        code, msg = server.rcpt(email)
-                        return code, msg.decode("utf-8", errors="ignore")
-                except smtplib.SMTPConnectError:
-                    return None, "SMTP connect failed"
-                except smtplib.SMTPServerDisconnected:
-                    return None, "Server disconnected early"
-                except socket.timeout:
-                    return None, "Connection timed out"
-                except Exception as ex:
-                    return None, str(ex)
-
-            result = await loop.run_in_executor(None, _smtp_probe)
-            return result
-
-        except Exception as e:
-            return None, f"SMTP probe error: {e}"
+        results = await self.domain_intel.probe(domain, [email])
+        return results[email]
 
     async def find_best_email(
         self,
@@ -162,7 +322,7 @@ class EmailDiscoveryService:
         Full pipeline:
           1. Generate 10 candidates
           2. MX check (abort early if domain is dead)
-          3. SMTP probe top N candidates (default 5)
+          3. SMTP probe the domain's known pattern, else top N candidates (default 5)
           4. Try Hunter.io fallback if key available
           5. Return sorted results with confidence scores
         """
@@ -186,40 +346,53 @@ class EmailDiscoveryService:
         if self.hunter_api_key:
             hunter_email = await self._hunter_lookup(first_name, last_name, domain)
 
-        # Step 4 – SMTP probe top N candidates
-        to_probe = candidates[:max_candidates]
-        probe_tasks = [self.verify_smtp(c.address, domain) for c in to_probe]
-        probe_results = await asyncio.gather(*probe_tasks, return_exceptions=True)
-
-        for i, candidate in enumerate(to_probe):
-            result = probe_results[i]
-            if isinstance(result, Exception):
-                code, note = None, str(result)
-            else:
-                code, note = result
-
+        # Step 4 – SMTP probe: the domain's known pattern alone, else top N candidates
+        intel = self.domain_intel.get(domain)
+        known = next((c for c in candidates if c.pattern_name == intel.pattern), None)
+        to_probe = [known] if known else candidates[:max_candidates]
+        results = await self.domain_intel.probe(domain, [c.address for c in to_probe])
+        if known and results[known.address][0] != 250 and not (intel.catch_all or intel.probe_blocked):
+            # Pattern didn't hold for this person — fall back to the usual candidates
+            to_probe += [c for c in candidates[:max_candidates] if c is not known]
+            results.update(await self.domain_intel.probe(domain, [c.address for c in to_probe[1:]]))
+
+        for candidate in to_probe:
+            code, note = results[candidate.address]
             candidate.smtp_code = code
             candidate.note = note
+            weight = PATTERN_WEIGHTS.get(candidate.pattern_rank, 0.3)
 
             if hunter_email and candidate.address.lower() == hunter_email.lower():
                 candidate.confidence = "verified"
                 candidate.note = "Confirmed by Hunter.io"
+            elif code == 250 and intel.catch_all:
+                candidate.confidence = "likely" if candidate is known or weight >= 0.65 else "unverifiable"
+                candidate.note = "Catch-all domain accepts every address"
             elif code == 250:
                 candidate.confidence = "verified"
             elif code in (550, 551, 552, 553):
                 candidate.confidence = "invalid"
             elif code is None:
-                # Server blocked probe — use pattern weight for confidence
-                weight = PATTERN_WEIGHTS.get(candidate.pattern_rank, 0.3)
-                candidate.confidence = "likely" if weight >= 0.65 else "unverifiable"
+                # Server blocked probe — use known pattern or pattern weight for confidence
+                candidate.confidence = "likely" if candidate is known or weight >= 0.65 else "unverifiable"
             else:
                 candidate.confidence = "unverifiable"
 
+            if candidate.confidence == "verified":
+                intel.pattern = candidate.pattern_name
+                intel.smtp_checked_at = intel.smtp_checked_at or time.monotonic()
+
         # For non-probed candidates (rank > max_candidates), mark as unverifiable
-        for candidate in candidates[max_candidates:]:
+        for candidate in candidates:
+            if candidate in to_probe:
+                continue
             weight = PATTERN_WEIGHTS.get(candidate.pattern_rank, 0.3)
-            candidate.confidence = "likely" if weight >= 0.7 else "unverifiable"
-            candidate.note = "Not probed (lower priority pattern)"
+            if known and known.confidence == "verified":
+                candidate.confidence = "unverifiable"
+                candidate.note = "Not probed (domain pattern known)"
+            else:
+                candidate.confidence = "likely" if weight >= 0.7 else "unverifiable"
+                candidate.note = "Not probed (lower priority pattern)"
 
         # Sort: verified first, then by pattern rank
         order = {"verified": 0, "likely": 1, "unverifiable": 2, "invalid": 3, "unknown": 4}
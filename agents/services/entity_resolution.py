@@ -0,0 +1,239 @@
+"""
+Prospect Entity Resolution
+==========================
+Merges records that describe the same person across sources, so "Jane Doe,
+Acme Inc" from Crunchbase and "Jane Doe — ACME" from Google are analyzed,
+enriched and saved once.
+
+  Normalize  names (accents, honorifics, punctuation), companies (legal
+             suffixes: Inc, LLC, GmbH, ...) and URLs (LinkedIn / GitHub
+             profile slug, otherwise host + path without query)
+  Block      each record gets a few blocking keys (profile URL, email,
+             first initial + last name, company + first initial); only
+             records sharing a key are compared, so candidate generation
+             stays near-linear. Records with no person fields (Google,
+             Reddit rows: title/url/snippet only) get one exact key instead,
+             their normalized URL or else their title
+  Score      a pair matches on the same exact key, on the same email or
+             personal profile URL (when names and companies don't
+             contradict it), or on similar names at similar companies.
+             Shared listing / search URLs (a G2 reviews page, an HN thread)
+             are not evidence of identity for records naming a person
+  Merge      matches are unioned into clusters; each cluster becomes its
+             most complete record with missing fields filled from the rest
+             and `sources` listing every source it was seen on
+
+Works on scraper results (name/company), discovery rows (_name/_company,
+title) and analyzed prospects alike. String similarity uses rapidfuzz when
+installed and difflib otherwise.
+"""
+
+import logging
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
+
+logger = logging.getLogger(__name__)
+
+NAME_THRESHOLD = 0.88
+COMPANY_THRESHOLD = 0.85
+# Names compared when a URL or email already ties two records together
+LOOSE_NAME_THRESHOLD = 0.6
+
+HONORIFICS = {"mr", "mrs", "ms", "miss", "dr", "prof", "sir", "jr", "sr", "ii", "iii", "phd", "md", "mba"}
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "llp", "ltd", "limited", "corp", "corporation",
+    "co", "company", "gmbh", "ag", "sa", "sas", "srl", "bv", "nv", "plc", "pty", "oy", "ab", "the",
+}
+PROFILE_HOSTS = {"linkedin.com": "li", "github.com": "gh", "twitter.com": "x", "x.com": "x"}
+# normalize_url() prefixes of URLs that belong to exactly one person
+PERSON_URL_PREFIXES = tuple(f"{p}:" for p in sorted(set(PROFILE_HOSTS.values())))
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+_TITLE_SPLIT_RE = re.compile(r"\s+[-–—|·]\s+")
+
+
+def _fold(text: Optional[str]) -> str:
+    """Lower-case ASCII with punctuation collapsed to single spaces."""
+    text = unicodedata.normalize("NFKD", text or "").encode("ascii", "ignore").decode()
+    return _NON_ALNUM_RE.sub(" ", text.lower()).strip()
+
+
+def normalize_name(name: Optional[str]) -> str:
+    return " ".join(t for t in _fold(name).split() if t not in HONORIFICS)
+
+
+def normalize_company(company: Optional[str]) -> str:
+    return " ".join(t for t in _fold(company).split() if t not in LEGAL_SUFFIXES)
+
+
+def normalize_url(url: Optional[str]) -> str:
+    """Canonical key of a URL: "li:<slug>" for profiles, else host/path."""
+    if not url:
+        return ""
+    parsed = urlparse(url if "//" in url else f"//{url}")
+    host = (parsed.hostname or "").lower()
+    host = host[4:] if host.startswith("www.") else host
+    parts = [p for p in parsed.path.lower().split("/") if p]
+
+    for profile_host, prefix in PROFILE_HOSTS.items():
+        if host == profile_host or host.endswith("." + profile_host):
+            if prefix == "li" and len(parts) >= 2 and parts[0] in ("in", "pub"):
+                return f"li:{parts[1]}"
+            if prefix != "li" and len(parts) == 1:
+                return f"{prefix}:{parts[0]}"
+    return f"{host}/{'/'.join(parts)}" if host else ""
+
+
+def similarity(a: str, b: str) -> float:
+    """0–1 similarity of two normalized strings, insensitive to token order."""
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    if fuzz is not None:
+        return fuzz.token_sort_ratio(a, b) / 100
+    return SequenceMatcher(None, " ".join(sorted(a.split())), " ".join(sorted(b.split()))).ratio()
+
+
+# ---------------------------------------------------------------------------
+# Record view
+# ---------------------------------------------------------------------------
+
+def _fields(record: Dict[str, Any]) -> Dict[str, str]:
+    name = record.get("name") or record.get("_name") or ""
+    company = record.get("company") or record.get("_company") or ""
+    url = record.get("url") or record.get("link") or ""
+    if not name and "linkedin.com/in/" in url and record.get("title"):
+        # "Jane Doe - CTO - Acme | LinkedIn"
+        parts = _TITLE_SPLIT_RE.split(record["title"])
+        name = parts[0]
+        if not company and len(parts) >= 3:
+            company = parts[2]
+    f = {
+        "name": normalize_name(name),
+        "company": normalize_company(company),
+        "url": normalize_url(url),
+        "email": (record.get("email") or record.get("_email") or "").strip().lower(),
+    }
+    # Nothing to resolve a person on: only the very same page is a duplicate
+    exact = ""
+    if not (f["name"] or f["company"] or f["email"]):
+        exact = f["url"] or (f"t:{_fold(record.get('title'))}" if record.get("title") else "")
+    f["exact"] = exact
+    return f
+
+
+def _blocking_keys(f: Dict[str, str]) -> List[str]:
+    if f["exact"]:
+        return [f"x:{f['exact']}"]
+    keys = []
+    if _is_person_url(f["url"]):
+        keys.append(f"u:{f['url']}")
+    if f["email"]:
+        keys.append(f"e:{f['email']}")
+    tokens = f["name"].split()
+    if tokens:
+        initial = tokens[0][0]
+        if len(tokens) > 1:
+            keys.append(f"n:{initial}:{tokens[-1]}")
+        if f["company"]:
+            keys.append(f"c:{f['company']}:{initial}")
+    return keys
+
+
+def _is_person_url(url: str) -> bool:
+    return url.startswith(PERSON_URL_PREFIXES)
+
+
+def _is_match(a: Dict[str, str], b: Dict[str, str]) -> bool:
+    if a["exact"] or b["exact"]:
+        return a["exact"] == b["exact"]
+    name_sim = similarity(a["name"], b["name"])
+    names_agree = not a["name"] or not b["name"] or name_sim >= LOOSE_NAME_THRESHOLD
+    if a["email"] and a["email"] == b["email"]:
+        return names_agree
+    if _is_person_url(a["url"]) and a["url"] == b["url"]:
+        companies_agree = (
+            not a["company"] or not b["company"]
+            or similarity(a["company"], b["company"]) >= COMPANY_THRESHOLD
+        )
+        return names_agree and companies_agree
+    if name_sim < NAME_THRESHOLD:
+        return False
+    return similarity(a["company"], b["company"]) >= COMPANY_THRESHOLD
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def cluster(records: List[Dict[str, Any]]) -> List[List[int]]:
+    """Indices of `records` grouped by entity, groups in order of first appearance."""
+    fields = [_fields(r) for r in records]
+    parent = list(range(len(records)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    blocks: Dict[str, List[int]] = {}
+    for i, f in enumerate(fields):
+        for key in _blocking_keys(f):
+            blocks.setdefault(key, []).append(i)
+
+    compared = set()
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                i, j = members[x], members[y]
+                if (i, j) in compared:
+                    continue
+                compared.add((i, j))
+                root_i, root_j = find(i), find(j)
+                if root_i != root_j and _is_match(fields[i], fields[j]):
+                    parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(records)):
+        groups.setdefault(find(i), []).append(i)
+    return [groups[root] for root in sorted(groups)]
+
+
+def merge(group: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Most complete record of the group, gaps filled from the others."""
+    ranked = sorted(group, key=lambda r: sum(1 for v in r.values() if v not in (None, "", [], {})), reverse=True)
+    merged = dict(ranked[0])
+    for other in ranked[1:]:
+        for key, value in other.items():
+            if merged.get(key) in (None, "", [], {}) and value not in (None, "", [], {}):
+                merged[key] = value
+
+    sources: List[str] = []
+    for record in group:
+        for source in record.get("sources") or [record.get("source")]:
+            if source and source not in sources:
+                sources.append(source)
+    if len(sources) > 1:
+        merged["sources"] = sources
+    return merged
+
+
+def resolve(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """One merged record per entity, in order of first appearance."""
+    groups = cluster(records)
+    resolved = [merge([records[i] for i in group]) if len(group) > 1 else records[group[0]] for group in groups]
+    if len(resolved) < len(records):
+        logger.info(f"[EntityResolution] {len(records)} records → {len(resolved)} entities")
+    return resolved
@@ -0,0 +1,226 @@
+"""
+Incremental Gmail Sync
+======================
+Keeps a per-user mirror of the unread inbox so /emails/replies doesn't
+re-list and re-download every message on each page load.
+
+  First sync:   remember the mailbox historyId, list `in:inbox is:unread`
+                once and fetch those messages.
+  Later syncs:  users.history.list(startHistoryId) returns only what
+                changed; new unread inbox messages are fetched, read /
+                archived / deleted ones are dropped.
+  Expired id:   Gmail answers 404 → fall back to a full sync.
+
+State:
+  google_tokens.gmail_history_id          last synced historyId (Supabase)
+  gmail_sync:<user>:active     SET        ids currently unread in the inbox
+  gmail_sync:<user>:messages   HASH       id → parsed message JSON
+  gmail_sync:<user>:analysis   HASH       id → analyzed email JSON (processed marker)
+
+Steady-state cost is one history call plus one fetch per new message.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from googleapiclient.errors import HttpError
+from redis import Redis
+
+from services.google_service import GoogleService
+
+logger = logging.getLogger(__name__)
+
+SYNC_KEY_PREFIX = "gmail_sync"
+CACHE_TTL = 7 * 24 * 3600  # 7 days
+
+HISTORY_TYPES = ["messageAdded", "messageDeleted", "labelAdded", "labelRemoved"]
+
+
+class GmailSyncService:
+    """historyId-based incremental sync of unread inbox replies per user."""
+
+    def __init__(self, google_service: GoogleService, redis_client: Redis):
+        self.google = google_service
+        self.redis = redis_client
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def sync_replies(self, user_id: str, max_results: int = 20) -> List[Dict[str, Any]]:
+        """Bring the mirror up to date and return the newest unread replies."""
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            service = await self.google.get_service(user_id, "gmail")
+
+            history_id = await self._load_history_id(user_id)
+            changes = None
+            if history_id:
+                try:
+                    changes = await self._fetch_history(service, history_id)
+                except HttpError as e:
+                    if e.resp.status != 404:
+                        raise
+                    logger.info(f"[GmailSync] historyId expired for user {user_id} — full resync")
+
+            if changes is None:
+                added, removed, new_history_id = await self._full_sync(service, max_results)
+                self.redis.delete(self._key(user_id, "active"))
+            else:
+                added, removed, new_history_id = changes
+
+            self._apply_changes(user_id, added, removed)
+            await self._fetch_missing(service, user_id)
+            await self._save_history_id(user_id, new_history_id)
+
+            replies = self._active_messages(user_id)
+            logger.info(
+                f"[GmailSync] User {user_id}: +{len(added)} / -{len(removed)} changes, "
+                f"{len(replies)} unread replies"
+            )
+            return replies[:max_results]
+
+    def get_cached_analysis(self, user_id: str, message_ids: Iterable[str]) -> Dict[str, Dict]:
+        ids = list(message_ids)
+        if not ids:
+            return {}
+        values = self.redis.hmget(self._key(user_id, "analysis"), ids)
+        return {mid: json.loads(v) for mid, v in zip(ids, values) if v}
+
+    def store_analysis(self, user_id: str, analyses: Dict[str, Dict]):
+        """Mark messages as processed by caching their analysis."""
+        if not analyses:
+            return
+        key = self._key(user_id, "analysis")
+        self.redis.hset(key, mapping={mid: json.dumps(a) for mid, a in analyses.items()})
+        self.redis.expire(key, CACHE_TTL)
+
+    def reset(self, user_id: str):
+        """Forget all sync state for a user (e.g. on Google disconnect)."""
+        self.redis.delete(*(self._key(user_id, part) for part in ("active", "messages", "analysis")))
+
+    # ------------------------------------------------------------------
+    # Sync internals
+    # ------------------------------------------------------------------
+
+    async def _full_sync(self, service, max_results: int) -> Tuple[Set[str], Set[str], str]:
+        # Read the historyId first so nothing arriving during the listing is missed
+        profile = await self.google.execute(
+            service.users().getProfile(userId="me"), "gmail.users.getProfile"
+        )
+        result = await self.google.execute(
+            service.users().messages().list(
+                userId="me", q="in:inbox is:unread", maxResults=max_results
+            ),
+            "gmail.messages.list",
+        )
+        added = {m["id"] for m in result.get("messages", [])}
+        return added, set(), profile["historyId"]
+
+    async def _fetch_history(self, service, start_history_id: str) -> Tuple[Set[str], Set[str], str]:
+        added: Set[str] = set()
+        removed: Set[str] = set()
+        latest = start_history_id
+        page_token = None
+
+        while True:
+            result = await self.google.execute(
+                service.users().history().list(
+                    userId="me",
+                    startHistoryId=start_history_id,
+                    historyTypes=HISTORY_TYPES,
+                    pageToken=page_token,
+                ),
+                "gmail.history.list",
+            )
+            for record in result.get("history", []):
+                for entry in record.get("messagesDeleted", []):
+                    mid = entry["message"]["id"]
+                    added.discard(mid)
+                    removed.add(mid)
+                for kind in ("messagesAdded", "labelsAdded", "labelsRemoved"):
+                    for entry in record.get(kind, []):
+                        message = entry["message"]
+                        labels = set(message.get("labelIds", []))
+                        if {"INBOX", "UNREAD"} <= labels:
+                            added.add(message["id"])
+                            removed.discard(message["id"])
+                        else:
+                            added.discard(message["id"])
+                            removed.add(message["id"])
+
+            latest = result.get("historyId", latest)
+            page_token = result.get("nextPageToken")
+            if not page_token:
+                return added, removed, latest
+
+    def _apply_changes(self, user_id: str, added: Set[str], removed: Set[str]):
+        active_key = self._key(user_id, "active")
+        if removed:
+            self.redis.srem(active_key, *removed)
+            self.redis.hdel(self._key(user_id, "messages"), *removed)
+            self.redis.hdel(self._key(user_id, "analysis"), *removed)
+        if added:
+            self.redis.sadd(active_key, *added)
+        self.redis.expire(active_key, CACHE_TTL)
+
+    async def _fetch_missing(self, service, user_id: str):
+        """Download only active messages that aren't cached yet, in batched round trips."""
+        messages_key = self._key(user_id, "messages")
+        active = self.redis.smembers(self._key(user_id, "active"))
+        cached = set(self.redis.hkeys(messages_key))
+        missing = [mid for mid in active if mid not in cached]
+        if not missing:
+            return
+
+        messages, errors = await self.google.batch_get_messages(service, missing, fmt="full")
+        gone = [
+            mid for mid, error in errors.items()
+            if isinstance(error, HttpError) and error.resp.status == 404
+        ]
+        if gone:
+            self.redis.srem(self._key(user_id, "active"), *gone)
+        parsed = {mid: json.dumps(self.google.parse_message(msg)) for mid, msg in messages.items()}
+
+        if parsed:
+            self.redis.hset(messages_key, mapping=parsed)
+        self.redis.expire(messages_key, CACHE_TTL)
+
+    def _active_messages(self, user_id: str) -> List[Dict[str, Any]]:
+        active = list(self.redis.smembers(self._key(user_id, "active")))
+        if not active:
+            return []
+        values = self.redis.hmget(self._key(user_id, "messages"), active)
+        messages = [json.loads(v) for v in values if v]
+        messages.sort(key=lambda m: int(m.get("internalDate") or 0), reverse=True)
+        return messages
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _key(self, user_id: str, part: str) -> str:
+        return f"{SYNC_KEY_PREFIX}:{user_id}:{part}"
+
+    async def _load_history_id(self, user_id: str) -> Optional[str]:
+        result = await self.google.run_blocking(
+            self.google.supabase.table("google_tokens")
+            .select("gmail_history_id")
+            .eq("user_id", user_id)
+            .execute,
+            "supabase.google_tokens.select",
+        )
+        if not result.data:
+            return None
+        return result.data[0].get("gmail_history_id")
+
+    async def _save_history_id(self, user_id: str, history_id: str):
+        await self.google.run_blocking(
+            self.google.supabase.table("google_tokens").update(
+                {"gmail_history_id": str(history_id)}
+            ).eq("user_id", user_id).execute,
+            "supabase.google_tokens.update",
+        )
@@ -1,13 +1,19 @@
 import os
-import json
+import asyncio
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Tuple
 
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
 
 import base64
 from email.mime.text import MIMEText
@@ -38,6 +44,24 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")  # Add this for backend services
 
+# Sub-requests per Gmail batch HTTP call. The API accepts 100, but Google
+# recommends staying at or below 50 to avoid per-user rate limiting.
+GMAIL_BATCH_SIZE = 50
+
+# Headers needed when only metadata is fetched
+METADATA_HEADERS = ["From", "To", "Subject", "Date"]
+
+# Cached credentials are refreshed in the background once they are this
+# close to expiry, so requests never wait on a token refresh
+PROACTIVE_REFRESH_WINDOW = timedelta(minutes=10)
+
+API_VERSIONS = {"gmail": "v1", "calendar": "v3"}
+
+# googleapiclient is blocking; every Google (and token-table) call runs on a
+# dedicated bounded pool so one slow Gmail call never stalls the event loop
+GOOGLE_IO_MAX_WORKERS = int(os.getenv("GOOGLE_IO_MAX_WORKERS", "16"))
+GOOGLE_API_TIMEOUT = float(os.getenv("GOOGLE_API_TIMEOUT", "30"))
+
 
 class GoogleService:
     """Handles Google OAuth, Gmail, and Calendar operations per user."""
@@ -47,6 +71,18 @@ class GoogleService:
         key = SUPABASE_SERVICE_ROLE_KEY if SUPABASE_SERVICE_ROLE_KEY else SUPABASE_ANON_KEY
         self.supabase: Client = create_client(SUPABASE_URL, key)
 
+        # Per-user caches: refreshed Credentials and built API clients
+        self._credentials: Dict[str, Credentials] = {}
+        self._clients: Dict[Tuple[str, str], Tuple[Credentials, Any]] = {}
+        self._credential_locks: Dict[str, asyncio.Lock] = {}
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=GOOGLE_IO_MAX_WORKERS, thread_name_prefix="google-io"
+        )
+        self._local = threading.local()
+        self._io_stats: Dict[str, Dict[str, float]] = {}
+
     # ── OAuth Flow ──────────────────────────────────────────────
 
     def get_auth_url(self, state: str = "") -> str:
@@ -92,15 +128,17 @@ class GoogleService:
             )
             print("[GoogleService] Flow created successfully")
             
-            flow.fetch_token(code=code)
+            await self.run_blocking(partial(flow.fetch_token, code=code), "oauth.fetch_token")
             print("[GoogleService] Token fetched successfully")
             
             credentials = flow.credentials
             print(f"[GoogleService] Got credentials, has refresh_token: {credentials.refresh_token is not None}")
 
             # Get the user's email from Gmail profile
-            service = build("gmail", "v1", credentials=credentials)
-            profile = service.users().getProfile(userId="me").execute()
+            service = build("gmail", "v1", credentials=credentials, cache_discovery=False)
+            profile = await self.execute(
+                service.users().getProfile(userId="me"), "gmail.users.getProfile"
+            )
             email = profile.get("emailAddress", "")
             print(f"[GoogleService] Got Gmail profile for: {email}")
 
@@ -116,12 +154,16 @@ class GoogleService:
             }
             print(f"[GoogleService] Prepared token_data: user_id={user_id}, email={email}")
 
-            result = self.supabase.table("google_tokens").upsert(
-                token_data, on_conflict="user_id"
-            ).execute()
+            result = await self.run_blocking(
+                self.supabase.table("google_tokens").upsert(
+                    token_data, on_conflict="user_id"
+                ).execute,
+                "supabase.google_tokens.upsert",
+            )
             print(f"[GoogleService] Supabase upsert result: {result}")
 
             logger.info(f"Stored Google tokens for user {user_id} ({email})")
+            self.invalidate(user_id)
             print(f"[GoogleService] SUCCESS - Tokens stored for {email}")
             return {"email": email, "connected": True}
         
@@ -134,12 +176,103 @@ class GoogleService:
             raise
 
     async def get_credentials(self, user_id: str) -> Optional[Credentials]:
-        """Retrieve and refresh Google credentials for a user."""
-        result = (
+        """
+        Return valid Google credentials for a user.
+        Served from the per-user cache when possible; a cache miss or an
+        expired token is handled under a per-user lock so concurrent
+        requests trigger a single Supabase read / refresh.
+        """
+        creds = self._credentials.get(user_id)
+        if self._is_usable(creds):
+            if self._expires_soon(creds):
+                self._schedule_refresh(user_id)
+            return creds
+
+        lock = self._credential_locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            creds = self._credentials.get(user_id)
+            if self._is_usable(creds):
+                return creds
+
+            creds = await self._load_credentials(user_id)
+            if creds:
+                self._credentials[user_id] = creds
+            return creds
+
+    async def get_service(self, user_id: str, api: str):
+        """Return a cached googleapiclient client ("gmail" / "calendar") for a user."""
+        creds = await self.get_credentials(user_id)
+        if not creds:
+            raise ValueError("Google account not connected. Please connect first.")
+        return self._client_for(user_id, api, creds)
+
+    def invalidate(self, user_id: str):
+        """Drop cached credentials and clients (after disconnect / reconnect)."""
+        self._credentials.pop(user_id, None)
+        for key in [k for k in self._clients if k[0] == user_id]:
+            self._clients.pop(key, None)
+        task = self._refresh_tasks.pop(user_id, None)
+        if task and not task.done():
+            task.cancel()
+
+    def _client_for(self, user_id: str, api: str, creds: Credentials):
+        # The discovery document is parsed once per (user, api, credentials)
+        cached = self._clients.get((user_id, api))
+        if cached and cached[0] is creds:
+            return cached[1]
+        client = build(api, API_VERSIONS[api], credentials=creds, cache_discovery=False)
+        self._clients[(user_id, api)] = (creds, client)
+        return client
+
+    def _is_usable(self, creds: Optional[Credentials]) -> bool:
+        return bool(creds and creds.token and not creds.expired)
+
+    def _expires_soon(self, creds: Credentials) -> bool:
+        if not creds.expiry or not creds.refresh_token:
+            return False
+        return creds.expiry - datetime.utcnow() < PROACTIVE_REFRESH_WINDOW
+
+    def _schedule_refresh(self, user_id: str):
+        task = self._refresh_tasks.get(user_id)
+        if task and not task.done():
+            return
+        self._refresh_tasks[user_id] = asyncio.create_task(self._background_refresh(user_id))
+
+    async def _background_refresh(self, user_id: str):
+        lock = self._credential_locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            creds = self._credentials.get(user_id)
+            if not creds or not self._expires_soon(creds):
+                return
+            try:
+                await self._refresh_and_store(user_id, creds)
+            except Exception as e:
+                # The current token is still valid; the next request retries
+                logger.warning(f"Background refresh of Google token for {user_id} failed: {e}")
+
+    async def _refresh_and_store(self, user_id: str, creds: Credentials):
+        """Refresh in place (cached clients keep working) and persist the new token."""
+        await self.run_blocking(partial(creds.refresh, Request()), "oauth.refresh")
+        await self.run_blocking(
+            self.supabase.table("google_tokens").update(
+                {
+                    "access_token": creds.token,
+                    "token_expiry": creds.expiry.isoformat() if creds.expiry else None,
+                    "updated_at": datetime.now(timezone.utc).isoformat(),
+                }
+            ).eq("user_id", user_id).execute,
+            "supabase.google_tokens.update",
+        )
+        logger.info(f"Refreshed Google token for user {user_id}")
+
+    async def _load_credentials(self, user_id: str) -> Optional[Credentials]:
+        """Retrieve and refresh Google credentials for a user from Supabase."""
+        result = await self.run_blocking(
             self.supabase.table("google_tokens")
             .select("*")
             .eq("user_id", user_id)
-            .execute()
+            .execute,
+            "supabase.google_tokens.select",
         )
 
         if not result.data:
@@ -164,16 +297,7 @@ class GoogleService:
         # Refresh if expired
         if creds.expired and creds.refresh_token:
             try:
-                creds.refresh(Request())
-                # Update stored tokens
-                self.supabase.table("google_tokens").update(
-                    {
-                        "access_token": creds.token,
-                        "token_expiry": creds.expiry.isoformat() if creds.expiry else None,
-                        "updated_at": datetime.now(timezone.utc).isoformat(),
-                    }
-                ).eq("user_id", user_id).execute()
-                logger.info(f"Refreshed Google token for user {user_id}")
+                await self._refresh_and_store(user_id, creds)
             except Exception as e:
                 logger.error(f"Failed to refresh Google token for {user_id}: {e}")
                 return None
@@ -182,11 +306,12 @@ class GoogleService:
 
     async def get_connection_status(self, user_id: str) -> Dict[str, Any]:
         """Check if a user has connected their Google account."""
-        result = (
+        result = await self.run_blocking(
             self.supabase.table("google_tokens")
             .select("email, scopes, updated_at")
             .eq("user_id", user_id)
-            .execute()
+            .execute,
+            "supabase.google_tokens.select",
         )
 
         if not result.data:
@@ -201,12 +326,71 @@ class GoogleService:
 
     async def disconnect(self, user_id: str) -> bool:
         """Remove a user's Google tokens."""
-        self.supabase.table("google_tokens").delete().eq(
-            "user_id", user_id
-        ).execute()
+        await self.run_blocking(
+            self.supabase.table("google_tokens").delete().eq("user_id", user_id).execute,
+            "supabase.google_tokens.delete",
+        )
+        self.invalidate(user_id)
         logger.info(f"Disconnected Google account for user {user_id}")
         return True
 
+    # ── Blocking I/O ────────────────────────────────────────────
+
+    async def execute(self, request, op: str, timeout: float = GOOGLE_API_TIMEOUT):
+        """Execute a googleapiclient request on the Google I/O pool."""
+        return await self.run_blocking(partial(self._execute_sync, request), op, timeout)
+
+    async def run_blocking(self, fn, op: str, timeout: float = GOOGLE_API_TIMEOUT):
+        """Run a blocking callable on the Google I/O pool with a timeout and per-op stats."""
+        stats = self._io_stats.setdefault(
+            op, {"calls": 0, "errors": 0, "timeouts": 0, "total_ms": 0.0, "max_ms": 0.0}
+        )
+        stats["calls"] += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await asyncio.wait_for(loop.run_in_executor(self._executor, fn), timeout)
+        except asyncio.TimeoutError:
+            stats["timeouts"] += 1
+            logger.warning(f"[GoogleIO] {op} timed out after {timeout:.0f}s")
+            raise
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+
+    def io_stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            op: {
+                "calls": s["calls"],
+                "errors": s["errors"],
+                "timeouts": s["timeouts"],
+                "avg_ms": round(s["total_ms"] / s["calls"], 1) if s["calls"] else 0.0,
+                "max_ms": round(s["max_ms"], 1),
+            }
+            for op, s in self._io_stats.items()
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+    def _thread_http(self, credentials: Credentials) -> AuthorizedHttp:
+        # httplib2.Http is not thread-safe, so each pool thread keeps its own
+        # connection and authorizes it with the calling user's credentials
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = httplib2.Http(timeout=GOOGLE_API_TIMEOUT)
+        return AuthorizedHttp(credentials, http=http)
+
+    def _execute_sync(self, request):
+        credentials = getattr(request.http, "credentials", None)
+        if credentials is None:
+            return request.execute()
+        return request.execute(http=self._thread_http(credentials))
+
     # ── Gmail Operations ────────────────────────────────────────
 
     async def send_email(
@@ -222,7 +406,7 @@ class GoogleService:
         if not creds:
             raise ValueError("Google account not connected. Please connect first.")
 
-        service = build("gmail", "v1", credentials=creds)
+        service = self._client_for(user_id, "gmail", creds)
 
         message = MIMEMultipart("alternative")
         message["to"] = to
@@ -233,11 +417,9 @@ class GoogleService:
 
         raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode("utf-8")
 
-        sent = (
-            service.users()
-            .messages()
-            .send(userId="me", body={"raw": raw_message})
-            .execute()
+        sent = await self.execute(
+            service.users().messages().send(userId="me", body={"raw": raw_message}),
+            "gmail.messages.send",
         )
 
         logger.info(f"Email sent to {to}, message ID: {sent['id']}")
@@ -251,50 +433,22 @@ class GoogleService:
         user_id: str,
         query: str = "in:inbox",
         max_results: int = 20,
+        headers_only: bool = False,
     ) -> List[Dict[str, Any]]:
-        """List Gmail messages matching a query."""
+        """
+        List Gmail messages matching a query.
+        With headers_only=True, messages are fetched with format="metadata"
+        and come back without a body.
+        """
         creds = await self.get_credentials(user_id)
         if not creds:
             raise ValueError("Google account not connected.")
 
-        service = build("gmail", "v1", credentials=creds)
-
-        result = (
-            service.users()
-            .messages()
-            .list(userId="me", q=query, maxResults=max_results)
-            .execute()
+        service = self._client_for(user_id, "gmail", creds)
+        return await self._list_and_fetch(
+            service, query, max_results, "metadata" if headers_only else "full"
         )
 
-        messages = []
-        for msg_ref in result.get("messages", []):
-            msg = (
-                service.users()
-                .messages()
-                .get(userId="me", id=msg_ref["id"], format="full")
-                .execute()
-            )
-            headers = {h["name"]: h["value"] for h in msg["payload"]["headers"]}
-
-            # Extract body
-            body_text = self._extract_body(msg["payload"])
-
-            messages.append(
-                {
-                    "id": msg["id"],
-                    "threadId": msg.get("threadId", ""),
-                    "from": headers.get("From", ""),
-                    "to": headers.get("To", ""),
-                    "subject": headers.get("Subject", ""),
-                    "date": headers.get("Date", ""),
-                    "snippet": msg.get("snippet", ""),
-                    "body": body_text,
-                    "labelIds": msg.get("labelIds", []),
-                }
-            )
-
-        return messages
-
     async def get_replies_for_sent_emails(
         self, user_id: str, max_results: int = 20
     ) -> List[Dict[str, Any]]:
@@ -303,44 +457,82 @@ class GoogleService:
         if not creds:
             raise ValueError("Google account not connected.")
 
-        service = build("gmail", "v1", credentials=creds)
+        service = self._client_for(user_id, "gmail", creds)
 
         # Find threads where we sent an email and got a reply
-        result = (
-            service.users()
-            .messages()
-            .list(
-                userId="me",
-                q="in:inbox is:unread",
-                maxResults=max_results,
-            )
-            .execute()
-        )
-
-        replies = []
-        for msg_ref in result.get("messages", []):
-            msg = (
-                service.users()
-                .messages()
-                .get(userId="me", id=msg_ref["id"], format="full")
-                .execute()
-            )
-            headers = {h["name"]: h["value"] for h in msg["payload"]["headers"]}
-            body_text = self._extract_body(msg["payload"])
+        return await self._list_and_fetch(service, "in:inbox is:unread", max_results, "full")
 
-            replies.append(
-                {
-                    "id": msg["id"],
-                    "threadId": msg.get("threadId", ""),
-                    "from": headers.get("From", ""),
-                    "subject": headers.get("Subject", ""),
-                    "date": headers.get("Date", ""),
-                    "body": body_text,
-                    "snippet": msg.get("snippet", ""),
-                }
-            )
-
-        return replies
+    async def _list_and_fetch(
+        self, service, query: str, max_results: int, fmt: str
+    ) -> List[Dict[str, Any]]:
+        """One list call plus batched gets, all off the event loop."""
+        result = await self.execute(
+            service.users().messages().list(userId="me", q=query, maxResults=max_results),
+            "gmail.messages.list",
+        )
+        ids = [m["id"] for m in result.get("messages", [])]
+        messages, _ = await self.batch_get_messages(service, ids, fmt=fmt)
+        return [self.parse_message(messages[mid]) for mid in ids if mid in messages]
+
+    async def batch_get_messages(
+        self, service, message_ids: List[str], fmt: str = "full"
+    ) -> Tuple[Dict[str, Dict], Dict[str, Exception]]:
+        """
+        Fetch many messages through Gmail's batch endpoint, GMAIL_BATCH_SIZE
+        sub-requests per HTTP round trip, in a worker thread.
+        Returns ({id: message}, {id: error}).
+        """
+        if not message_ids:
+            return {}, {}
+        rounds = -(-len(message_ids) // GMAIL_BATCH_SIZE)
+        messages, errors = await self.run_blocking(
+            partial(self._batch_get_messages_sync, service, message_ids, fmt),
+            "gmail.messages.batchGet",
+            timeout=GOOGLE_API_TIMEOUT * rounds,
+        )
+        for mid, error in errors.items():
+            logger.warning(f"Failed to fetch Gmail message {mid}: {error}")
+        return messages, errors
+
+    def _batch_get_messages_sync(
+        self, service, message_ids: List[str], fmt: str
+    ) -> Tuple[Dict[str, Dict], Dict[str, Exception]]:
+        messages: Dict[str, Dict] = {}
+        errors: Dict[str, Exception] = {}
+
+        def _on_response(request_id, response, exception):
+            if exception is not None:
+                errors[request_id] = exception
+            else:
+                messages[request_id] = response
+
+        for i in range(0, len(message_ids), GMAIL_BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=_on_response)
+            for mid in message_ids[i:i + GMAIL_BATCH_SIZE]:
+                kwargs = {"userId": "me", "id": mid, "format": fmt}
+                if fmt == "metadata":
+                    kwargs["metadataHeaders"] = METADATA_HEADERS
+                request = service.users().messages().get(**kwargs)
+                batch.add(request, request_id=mid)
+            batch.execute(http=self._thread_http(request.http.credentials))
+
+        return messages, errors
+
+    def parse_message(self, msg: Dict) -> Dict[str, Any]:
+        """Flatten a Gmail API message resource into the fields we use."""
+        headers = {h["name"]: h["value"] for h in msg["payload"].get("headers", [])}
+        return {
+            "id": msg["id"],
+            "threadId": msg.get("threadId", ""),
+            "from": headers.get("From", ""),
+            "to": headers.get("To", ""),
+            "subject": headers.get("Subject", ""),
+            "date": headers.get("Date", ""),
+            "internalDate": msg.get("internalDate", ""),
+            "snippet": msg.get("snippet", ""),
+            "body": self._extract_body(msg["payload"]),
+            "labelIds": msg.get("labelIds", []),
+        }
 
     def _extract_body(self, payload: Dict) -> str:
         """Extract text body from Gmail message payload."""
@@ -377,44 +569,41 @@ class GoogleService:
         if not creds:
             raise ValueError("Google account not connected.")
 
-        service = build("calendar", "v3", credentials=creds)
+        service = self._client_for(user_id, "calendar", creds)
 
         if not time_min:
             time_min = datetime.now(timezone.utc).isoformat()
 
-        events_result = (
-            service.events()
-            .list(
+        events_result = await self.execute(
+            service.events().list(
                 calendarId="primary",
                 timeMin=time_min,
                 maxResults=max_results,
                 singleEvents=True,
                 orderBy="startTime",
-            )
-            .execute()
+            ),
+            "calendar.events.list",
         )
 
-        events = []
-        for event in events_result.get("items", []):
-            start = event["start"].get("dateTime", event["start"].get("date"))
-            end = event["end"].get("dateTime", event["end"].get("date"))
-            events.append(
-                {
-                    "id": event["id"],
-                    "summary": event.get("summary", ""),
-                    "description": event.get("description", ""),
-                    "start": start,
-                    "end": end,
-                    "location": event.get("location", ""),
-                    "htmlLink": event.get("htmlLink", ""),
-                    "attendees": [
-                        {"email": a.get("email"), "status": a.get("responseStatus")}
-                        for a in event.get("attendees", [])
-                    ],
-                }
-            )
+        return [self.parse_event(event) for event in events_result.get("items", [])]
 
-        return events
+    def parse_event(self, event: Dict) -> Dict[str, Any]:
+        """Flatten a Calendar API event resource into the fields we use."""
+        start = event["start"].get("dateTime", event["start"].get("date"))
+        end = event["end"].get("dateTime", event["end"].get("date"))
+        return {
+            "id": event["id"],
+            "summary": event.get("summary", ""),
+            "description": event.get("description", ""),
+            "start": start,
+            "end": end,
+            "location": event.get("location", ""),
+            "htmlLink": event.get("htmlLink", ""),
+            "attendees": [
+                {"email": a.get("email"), "status": a.get("responseStatus")}
+                for a in event.get("attendees", [])
+            ],
+        }
 
     async def create_event(
         self,
@@ -431,7 +620,7 @@ class GoogleService:
         if not creds:
             raise ValueError("Google account not connected.")
 
-        service = build("calendar", "v3", credentials=creds)
+        service = self._client_for(user_id, "calendar", creds)
 
         event = {
             "summary": summary,
@@ -450,15 +639,14 @@ class GoogleService:
         if attendees:
             event["attendees"] = [{"email": email} for email in attendees]
 
-        created = (
-            service.events()
-            .insert(
+        created = await self.execute(
+            service.events().insert(
                 calendarId="primary",
                 body=event,
                 conferenceDataVersion=1,
                 sendUpdates="all",
-            )
-            .execute()
+            ),
+            "calendar.events.insert",
         )
 
         logger.info(f"Created calendar event: {created['id']}")
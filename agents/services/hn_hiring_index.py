@@ -0,0 +1,243 @@
+"""
+Hacker News "Who is Hiring" Index
+=================================
+Ingests the current monthly hiring thread once and answers keyword queries
+from a local inverted index, instead of re-reading the thread per keyword.
+
+  Thread:    newest "Ask HN: Who is hiring?" story by `whoishiring`
+             (Algolia search_by_date)
+  Postings:  the story's top-level `kids`, fetched concurrently from the
+             Firebase item API; the "Company | Role | Location" header line
+             is parsed once per posting
+  Index:     token → posting ids, persisted per month to
+             HN_INDEX_DIR/<YYYY-MM>.json
+  Refresh:   after HN_INDEX_REFRESH seconds only kids not indexed yet are
+             fetched, so a refresh is one story call plus new postings
+
+A query token matches every indexed token that contains it ("python" →
+"python3", "engineer" → "engineers"); the union of their posting lists is
+intersected across query tokens and the keyword is then confirmed as a
+substring, so results match the old per-comment substring filter.
+"""
+
+import asyncio
+import html
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from services.http_fetcher import HttpFetcher, http_fetcher
+
+logger = logging.getLogger(__name__)
+
+ALGOLIA_SEARCH_BY_DATE = "https://hn.algolia.com/api/v1/search_by_date"
+FIREBASE_ITEM = "https://hacker-news.firebaseio.com/v0/item/{}.json"
+
+HN_INDEX_DIR = os.getenv("HN_INDEX_DIR", os.path.join(tempfile.gettempdir(), "hn_hiring_index"))
+HN_INDEX_REFRESH = float(os.getenv("HN_INDEX_REFRESH", "3600"))
+HN_FETCH_CONCURRENCY = int(os.getenv("HN_FETCH_CONCURRENCY", "32"))
+
+MAX_POSTING_CHARS = 2000
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+_TAG_RE = re.compile(r"<[^>]+>")
+_BREAK_RE = re.compile(r"<p>|<br\s*/?>", re.IGNORECASE)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t.rstrip(".") for t in _TOKEN_RE.findall(text.lower())]
+
+
+def html_to_text(fragment: Optional[str]) -> str:
+    """HN comment HTML → plain text with one line per paragraph."""
+    if not fragment:
+        return ""
+    return html.unescape(_TAG_RE.sub("", _BREAK_RE.sub("\n", fragment))).strip()
+
+
+def parse_posting(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Turn a Firebase comment item into a posting, or None if it isn't one."""
+    if item.get("deleted") or item.get("dead"):
+        return None
+    text = html_to_text(item.get("text"))
+    if not text:
+        return None
+
+    lines = [l.strip() for l in text.split("\n") if l.strip()]
+    header = lines[0] if lines else ""
+    parts = [p.strip() for p in header.split("|")]
+    return {
+        "id": str(item["id"]),
+        "author": item.get("by", ""),
+        "time": item.get("time"),
+        "header": header,
+        "company": parts[0] if parts else "",
+        "role": parts[1] if len(parts) > 1 else "",
+        "location": parts[2] if len(parts) > 2 else "",
+        "remote": "remote" in header.lower(),
+        "text": text[:MAX_POSTING_CHARS],
+    }
+
+
+class HNHiringIndex:
+    """Monthly inverted index over the current Who is Hiring thread."""
+
+    def __init__(self, fetcher: Optional[HttpFetcher] = None, index_dir: str = HN_INDEX_DIR):
+        self.fetcher = fetcher or http_fetcher
+        self.index_dir = index_dir
+        self._state: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def search(self, keyword: str, limit: int = 15) -> List[Dict[str, Any]]:
+        state = await self.ensure_fresh()
+        if not state:
+            return []
+
+        postings = state["postings"]
+        tokens = tokenize(keyword)
+        if tokens:
+            candidates: Optional[Set[str]] = None
+            for token in tokens:
+                ids = self._ids_containing(state["index"], token)
+                candidates = ids if candidates is None else candidates & ids
+                if not candidates:
+                    return []
+        else:
+            candidates = set(postings)
+
+        kw_lower = keyword.lower()
+        matches = [postings[pid] for pid in candidates if kw_lower in postings[pid]["text"].lower()]
+        # Header matches first, then newest
+        matches.sort(key=lambda p: (kw_lower not in p["header"].lower(), -(p["time"] or 0)))
+        return matches[:limit]
+
+    @staticmethod
+    def _ids_containing(index: Dict[str, List[str]], token: str) -> Set[str]:
+        """Posting ids of every vocabulary token that contains `token`."""
+        ids: Set[str] = set()
+        for vocab_token, posting_ids in index.items():
+            if token in vocab_token:
+                ids.update(posting_ids)
+        return ids
+
+    async def ensure_fresh(self) -> Optional[Dict[str, Any]]:
+        if self._state and time.monotonic() - self._checked_at < HN_INDEX_REFRESH:
+            return self._state
+        async with self._lock:
+            if self._state and time.monotonic() - self._checked_at < HN_INDEX_REFRESH:
+                return self._state
+            try:
+                await self._refresh()
+            except Exception as e:
+                # Keep serving the previous month / last good index
+                logger.error(f"[HNIndex] refresh failed: {e}")
+            self._checked_at = time.monotonic()
+            return self._state
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    async def _refresh(self):
+        story = await self._latest_thread()
+        if not story:
+            logger.warning("[HNIndex] Could not find the current hiring thread")
+            return
+
+        month = datetime.fromtimestamp(story["created_at_i"], timezone.utc).strftime("%Y-%m")
+        state = self._state if self._state and self._state["month"] == month else self._load(month)
+        if not state or state["story_id"] != story["objectID"]:
+            state = {"month": month, "story_id": story["objectID"], "title": story.get("title", ""),
+                     "postings": {}, "index": {}, "skipped": []}
+
+        item = await self.fetcher.get_json(FIREBASE_ITEM.format(state["story_id"]))
+        kids = [str(k) for k in (item or {}).get("kids", [])]
+        known = set(state["postings"]) | set(state["skipped"])
+        new_ids = [k for k in kids if k not in known]
+        if new_ids:
+            postings, skipped = await self._fetch_postings(new_ids)
+            for posting in postings:
+                state["postings"][posting["id"]] = posting
+                for token in set(tokenize(posting["text"])):
+                    state["index"].setdefault(token, []).append(posting["id"])
+            state["skipped"].extend(skipped)
+            self._save(state)
+
+        self._state = state
+        logger.info(
+            f"[HNIndex] {state['title']}: {len(new_ids)} new, "
+            f"{len(state['postings'])} postings indexed"
+        )
+
+    async def _latest_thread(self) -> Optional[Dict[str, Any]]:
+        result = await self.fetcher.get_json(
+            ALGOLIA_SEARCH_BY_DATE,
+            params={"tags": "story,author_whoishiring", "hitsPerPage": 10},
+        )
+        for hit in result.get("hits", []):
+            if "who is hiring" in (hit.get("title") or "").lower():
+                return hit
+        return None
+
+    async def _fetch_postings(self, ids: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Returns (postings, ids that are not postings). Failed fetches are retried next refresh."""
+        slots = asyncio.Semaphore(HN_FETCH_CONCURRENCY)
+        postings: List[Dict[str, Any]] = []
+        skipped: List[str] = []
+
+        async def _fetch(item_id: str):
+            async with slots:
+                try:
+                    item = await self.fetcher.get_json(FIREBASE_ITEM.format(item_id))
+                except Exception as e:
+                    logger.debug(f"[HNIndex] item {item_id} failed: {e}")
+                    return
+            posting = parse_posting(item) if item else None
+            if posting:
+                postings.append(posting)
+            else:
+                skipped.append(item_id)
+
+        await asyncio.gather(*(_fetch(i) for i in ids))
+        return postings, skipped
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _path(self, month: str) -> str:
+        return os.path.join(self.index_dir, f"{month}.json")
+
+    def _load(self, month: str) -> Optional[Dict[str, Any]]:
+        path = self._path(month)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"[HNIndex] Failed to load {path}: {e}")
+            return None
+
+    def _save(self, state: Dict[str, Any]):
+        try:
+            os.makedirs(self.index_dir, exist_ok=True)
+            tmp_path = self._path(state["month"]) + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self._path(state["month"]))
+        except Exception as e:
+            logger.error(f"[HNIndex] Failed to persist index: {e}")
+
+
+hn_hiring_index = HNHiringIndex()
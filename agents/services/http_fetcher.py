@@ -0,0 +1,87 @@
+"""
+HTTP Fetcher
+============
+Process-wide pooled httpx.AsyncClient for sources that don't need a
+browser (JSON APIs, server-rendered HTML). HTTP/2 is used when the `h2`
+package is installed; connections are kept alive and shared by all callers.
+
+HTML is parsed with selectolax when it is installed; callers check
+`HTMLParser is not None` and fall back to Playwright otherwise.
+"""
+
+import logging
+import os
+from typing import Any, Dict, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+from services.browser_pool import USER_AGENTS
+
+logger = logging.getLogger(__name__)
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_FETCH_TIMEOUT", "15"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_FETCH_MAX_CONNECTIONS", "50"))
+
+
+class HttpFetcher:
+    """Lazily created, shared async HTTP client with browser-like defaults."""
+
+    def __init__(self, timeout: float = HTTP_TIMEOUT, max_connections: int = HTTP_MAX_CONNECTIONS):
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                headers={
+                    "User-Agent": USER_AGENTS[0],
+                    "Accept-Language": "en-US,en;q=0.9",
+                },
+            )
+        return self._client
+
+    async def get_json(
+        self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None
+    ) -> Any:
+        response = await self.client.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return response.json()
+
+    async def get_text(
+        self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None
+    ) -> str:
+        response = await self.client.get(
+            url,
+            params=params,
+            headers={"Accept": "text/html,application/xhtml+xml,*/*;q=0.8", **(headers or {})},
+        )
+        response.raise_for_status()
+        return response.text
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+http_fetcher = HttpFetcher()
@@ -0,0 +1,286 @@
+"""
+Meeting Post-Processing Job Queue
+=================================
+The MeetingBaaS `complete` webhook only enqueues a job here and returns,
+so the sender never waits on the slow pipeline. A background worker then:
+  1. Looks up the meeting row by bot_id
+  2. Runs MeetingAnalyzer.analyze_meeting (LLM)
+  3. Updates the meetings row with transcript + summary
+  4. Stores embeddings via VectorService.store_meeting_data
+
+Jobs live in Redis so they survive a restart:
+  meeting_jobs:pending         LIST    bot_ids ready to run
+  meeting_jobs:processing      LIST    bot_ids claimed by a worker (re-queued on startup)
+  meeting_jobs:delayed         ZSET    bot_ids waiting for a retry, scored by run-at time
+  meeting_jobs:job:<bot_id>    STRING  job payload (JSON)
+
+The job key is the bot_id, so a redelivered webhook never creates a second
+job. A job remembers which stage it reached: a retry after a vector-store
+failure does not repeat the LLM analysis. Progress is mirrored onto the
+`meetings` row (processing_status / processing_attempts / processing_error).
+"""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from redis import Redis
+from supabase import Client
+
+from services.meeting_analyzer import MeetingAnalyzer
+from services.vector_service import VectorService
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY    = "meeting_jobs:pending"
+PROCESSING_KEY = "meeting_jobs:processing"
+DELAYED_KEY    = "meeting_jobs:delayed"
+JOB_KEY_PREFIX = "meeting_jobs:job:"
+
+# Finished jobs are kept this long so late redeliveries are still ignored
+FINISHED_JOB_TTL = 7 * 24 * 3600
+
+STAGE_ANALYZE       = "analyze"
+STAGE_STORE_VECTORS = "store_vectors"
+
+
+class MeetingJobQueue:
+    """Durable, retrying post-processing queue for completed meetings."""
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        supabase: Client,
+        max_attempts: int = 5,
+        base_backoff: float = 30.0,
+        max_backoff: float = 30 * 60.0,
+        poll_interval: float = 1.0,
+        max_concurrent_jobs: int = 2,
+    ):
+        self.redis = redis_client
+        self.supabase = supabase
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        self._slots = asyncio.Semaphore(max_concurrent_jobs)
+        self._running = False
+        self._tasks: set = set()
+
+    # ------------------------------------------------------------------
+    # Producer side (called from the webhook)
+    # ------------------------------------------------------------------
+
+    def enqueue(self, bot_id: str, data: Dict[str, Any]) -> bool:
+        """
+        Queue post-processing for `bot_id`.
+        Returns False if a job for this bot already exists (queued, running,
+        retrying or recently finished), True if a new job was created.
+        """
+        job = {
+            "bot_id": bot_id,
+            "data": {
+                "transcript": data.get("transcript"),
+                "speakers": data.get("speakers"),
+                "duration": data.get("duration", 0),
+                "mp4": data.get("mp4"),
+            },
+            "stage": STAGE_ANALYZE,
+            "status": "queued",
+            "attempts": 0,
+            "analysis": None,
+            "last_error": None,
+            "enqueued_at": datetime.now(timezone.utc).isoformat(),
+        }
+        created = self.redis.set(self._job_key(bot_id), json.dumps(job), nx=True)
+        if not created:
+            logger.info(f"[MeetingJobs] Job for bot {bot_id} already exists — skipping")
+            return False
+
+        self.redis.lpush(PENDING_KEY, bot_id)
+        logger.info(f"[MeetingJobs] Queued post-processing for bot {bot_id}")
+        return True
+
+    def get_job(self, bot_id: str) -> Optional[Dict[str, Any]]:
+        raw = self.redis.get(self._job_key(bot_id))
+        return json.loads(raw) if raw else None
+
+    # ------------------------------------------------------------------
+    # Worker side
+    # ------------------------------------------------------------------
+
+    async def run(self):
+        """Worker loop. Start once per process on app startup."""
+        self._running = True
+        self._recover_in_flight()
+        logger.info("[MeetingJobs] Worker started")
+
+        while self._running:
+            try:
+                self._promote_due_retries()
+                await self._slots.acquire()
+                bot_id = self.redis.rpoplpush(PENDING_KEY, PROCESSING_KEY)
+                if not bot_id:
+                    self._slots.release()
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                task = asyncio.create_task(self._run_job(bot_id))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"[MeetingJobs] Worker loop error: {e}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def stop(self):
+        self._running = False
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        logger.info("[MeetingJobs] Worker stopped")
+
+    def _recover_in_flight(self):
+        """Jobs claimed by a worker that died mid-run go back to pending."""
+        recovered = 0
+        while self.redis.rpoplpush(PROCESSING_KEY, PENDING_KEY):
+            recovered += 1
+        if recovered:
+            logger.warning(f"[MeetingJobs] Re-queued {recovered} interrupted job(s)")
+
+    def _promote_due_retries(self):
+        due = self.redis.zrangebyscore(DELAYED_KEY, 0, time.time())
+        for bot_id in due:
+            # zrem guards against another worker promoting the same id
+            if self.redis.zrem(DELAYED_KEY, bot_id):
+                self.redis.lpush(PENDING_KEY, bot_id)
+
+    async def _run_job(self, bot_id: str):
+        try:
+            job = self.get_job(bot_id)
+            if not job:
+                logger.warning(f"[MeetingJobs] Payload missing for bot {bot_id} — dropping")
+                return
+
+            job["attempts"] += 1
+            job["status"] = "processing"
+            self._save_job(job)
+            self._update_meeting(bot_id, {
+                "processing_status": "processing",
+                "processing_attempts": job["attempts"],
+            })
+
+            try:
+                await self._process(job)
+            except Exception as e:
+                self._handle_failure(job, e)
+                return
+
+            job["status"] = "completed"
+            job["last_error"] = None
+            self._save_job(job, ttl=FINISHED_JOB_TTL)
+            self._update_meeting(bot_id, {
+                "processing_status": "completed",
+                "processing_error": None,
+            })
+            logger.info(f"[MeetingJobs] Completed bot {bot_id} in {job['attempts']} attempt(s)")
+        except Exception as e:
+            logger.error(f"[MeetingJobs] Unexpected error running bot {bot_id}: {e}")
+        finally:
+            self.redis.lrem(PROCESSING_KEY, 1, bot_id)
+            self._slots.release()
+
+    async def _process(self, job: Dict[str, Any]):
+        bot_id = job["bot_id"]
+        data = job["data"]
+
+        result = self.supabase.table("meetings").select("*").eq("bot_id", bot_id).execute()
+        if not result.data:
+            raise LookupError(f"No meeting found for bot_id: {bot_id}")
+        meeting = result.data[0]
+        logger.info(f"[MeetingJobs] Found meeting: {meeting['id']} for bot_id: {bot_id}")
+
+        if job["stage"] == STAGE_ANALYZE:
+            analyzer = MeetingAnalyzer()
+            analysis = await analyzer.analyze_meeting(data["transcript"], meeting)
+
+            update_data = {
+                "status": "completed",
+                "transcript": data["transcript"],
+                "ai_summary": analysis["ai_summary"],
+                "date": datetime.now().isoformat(),
+                "duration": int(data.get("duration") or 0),
+                "processing_status": "analyzed",
+            }
+            result = self.supabase.table("meetings").update(update_data).eq("id", meeting["id"]).execute()
+            meeting = result.data[0]
+            logger.info(f"[MeetingJobs] Updated meeting {meeting['id']} with transcript and summary")
+
+            # Persist progress so a retry resumes at the vector stage
+            job["analysis"] = analysis
+            job["stage"] = STAGE_STORE_VECTORS
+            self._save_job(job)
+
+        vector_data = {
+            **meeting,
+            **(job.get("analysis") or {}),
+            "speakers": data.get("speakers") or [],
+        }
+        vector_service = VectorService()
+        await vector_service.store_meeting_data(vector_data, meeting.get("user_id"))
+
+    def _handle_failure(self, job: Dict[str, Any], error: Exception):
+        bot_id = job["bot_id"]
+        job["last_error"] = str(error)
+
+        if job["attempts"] >= self.max_attempts:
+            job["status"] = "failed"
+            self._save_job(job, ttl=FINISHED_JOB_TTL)
+            self._update_meeting(bot_id, {
+                "processing_status": "failed",
+                "processing_error": str(error)[:1000],
+            })
+            logger.error(
+                f"[MeetingJobs] Bot {bot_id} failed permanently after "
+                f"{job['attempts']} attempt(s): {error}"
+            )
+            return
+
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (job["attempts"] - 1))
+        delay *= random.uniform(0.8, 1.2)
+        job["status"] = "retrying"
+        self._save_job(job)
+        self.redis.zadd(DELAYED_KEY, {bot_id: time.time() + delay})
+        self._update_meeting(bot_id, {
+            "processing_status": "retrying",
+            "processing_error": str(error)[:1000],
+        })
+        logger.warning(
+            f"[MeetingJobs] Bot {bot_id} attempt {job['attempts']} failed ({error}); "
+            f"retrying in {delay:.0f}s"
+        )
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    def _job_key(self, bot_id: str) -> str:
+        return f"{JOB_KEY_PREFIX}{bot_id}"
+
+    def _save_job(self, job: Dict[str, Any], ttl: Optional[int] = None):
+        if ttl:
+            self.redis.set(self._job_key(job["bot_id"]), json.dumps(job), ex=ttl)
+        else:
+            self.redis.set(self._job_key(job["bot_id"]), json.dumps(job))
+
+    def _update_meeting(self, bot_id: str, fields: Dict[str, Any]):
+        """Best-effort status mirror onto the meetings row."""
+        try:
+            fields["processing_updated_at"] = datetime.now(timezone.utc).isoformat()
+            self.supabase.table("meetings").update(fields).eq("bot_id", bot_id).execute()
+        except Exception as e:
+            logger.error(f"[MeetingJobs] Failed to update status for bot {bot_id}: {e}")
@@ -7,38 +7,52 @@ Each scraper returns a normalized List[Dict] with:
 
 AI Router (ScraperRouterService) picks the best scrapers based on the
 user's goal using an LLM call, then runs them in parallel.
+
+Sources with a JSON API (HN hiring index, GitHub public members) or
+server-rendered listings (HTTP_FIRST_SOURCES) are fetched over plain HTTP
+through the shared http_fetcher; the pooled browser is only used when a
+page needs JavaScript or the HTTP attempt fails.
+
+Every page load, over HTTP or in the browser, takes a slot from the shared
+per-host domain_scheduler instead of sleeping a random interval: requests
+go out immediately while the host is within its rate, and 429/503 answers
+or challenge pages slow that host down for all scrapers.
+
+run_scrapers gives every source a deadline inside an overall budget and
+returns whatever finished in time; a source that stalls past half its
+deadline gets one hedged second attempt, unless its host allows a single
+request at a time (the hedge would only queue behind the stalled one).
+Per-source outcomes
+(ok / empty / blocked / timeout / error) are returned with the results.
 """
 
 import asyncio
+import contextvars
 import logging
-import random
+import os
 import re
-from typing import Any, Dict, List, Optional
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
 
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from core.rate_limiter import DomainScheduler
+from services.browser_pool import BrowserPool, PageLease, browser_pool
+from services.entity_resolution import resolve
+from services.http_fetcher import HTMLParser, http_fetcher
+from services.hn_hiring_index import hn_hiring_index
+from services.scrape_result_cache import ScrapeResultCache, scrape_result_cache
 
 logger = logging.getLogger(__name__)
 
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
+
 # ---------------------------------------------------------------------------
-# Stealth helpers
+# Helpers
 # ---------------------------------------------------------------------------
 
-USER_AGENTS = [
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_2_1) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.2 Safari/605.1.15",
-]
-
-STEALTH_ARGS = [
-    "--disable-blink-features=AutomationControlled",
-    "--no-sandbox",
-    "--disable-setuid-sandbox",
-    "--disable-infobars",
-    "--disable-dev-shm-usage",
-    "--window-size=1280,800",
-]
-
 def _normalized(
     name: str = "",
     role: str = "",
@@ -64,8 +78,379 @@ def _normalized(
     return result
 
 
-async def _delay(min_s: float = 1.5, max_s: float = 4.0):
-    await asyncio.sleep(random.uniform(min_s, max_s))
+# ---------------------------------------------------------------------------
+# Per-host politeness
+# ---------------------------------------------------------------------------
+
+SCRAPER_HOST_RATE = float(os.getenv("SCRAPER_HOST_RATE", "1"))
+SCRAPER_HOST_BURST = int(os.getenv("SCRAPER_HOST_BURST", "3"))
+SCRAPER_HOST_CONCURRENCY = int(os.getenv("SCRAPER_HOST_CONCURRENCY", "2"))
+# How long a browser scrape waits for the first card to render
+CARD_WAIT_MS = int(os.getenv("SCRAPER_CARD_WAIT_MS", "8000"))
+
+# host → (requests/second, burst, concurrency) for sites quick to challenge bots
+HOST_LIMITS = {
+    "crunchbase.com": (0.3, 1, 1),
+    "g2.com":         (0.5, 2, 1),
+    "wellfound.com":  (0.5, 2, 1),
+    "angel.co":       (0.5, 2, 1),
+}
+
+# Page titles of captcha / bot-wall interstitials (Cloudflare, PerimeterX, Imperva, ...)
+BLOCK_PAGE_MARKERS = (
+    "captcha", "just a moment", "attention required", "access denied",
+    "are you a robot", "are you human", "verify you are human",
+    "pardon our interruption", "security check",
+)
+
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+domain_scheduler = DomainScheduler(
+    rate=SCRAPER_HOST_RATE,
+    burst=SCRAPER_HOST_BURST,
+    concurrency=SCRAPER_HOST_CONCURRENCY,
+    limits=HOST_LIMITS,
+)
+
+
+def _is_block_page(title: Optional[str]) -> bool:
+    title = (title or "").lower()
+    return any(marker in title for marker in BLOCK_PAGE_MARKERS)
+
+
+def _html_title(html_text: str) -> str:
+    match = _TITLE_RE.search(html_text[:20000])
+    return match.group(1).strip() if match else ""
+
+
+def _retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    try:
+        return float((headers or {}).get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# run_scrapers deadlines
+# ---------------------------------------------------------------------------
+
+RUN_SCRAPERS_BUDGET = float(os.getenv("RUN_SCRAPERS_BUDGET", "25"))
+# Fraction of a source's deadline after which a stalled scrape is hedged
+HEDGE_AFTER = float(os.getenv("SCRAPER_HEDGE_AFTER", "0.5"))
+
+# Seconds each source may take; API-backed sources answer much faster
+SCRAPER_DEADLINES: Dict[str, float] = {
+    "product_hunt": 15,
+    "g2":           20,
+    "hacker_news":  10,
+    "github":       15,
+    "crunchbase":   20,
+    "wellfound":    20,
+    "yc_directory": 20,
+    "angellist":    20,
+}
+DEFAULT_DEADLINE = 20.0
+
+# Host each source scrapes; hedging needs a second domain_scheduler slot there
+SOURCE_HOSTS: Dict[str, str] = {
+    "product_hunt": "producthunt.com",
+    "g2":           "g2.com",
+    "github":       "github.com",
+    "crunchbase":   "crunchbase.com",
+    "wellfound":    "wellfound.com",
+    "yc_directory": "ycombinator.com",
+    "angellist":    "angel.co",
+}
+
+# Per-scrape flags ("blocked", "hedged") raised from deep inside a scraper
+_scrape_signals: contextvars.ContextVar[Optional[Dict[str, bool]]] = contextvars.ContextVar(
+    "scrape_signals", default=None
+)
+
+
+def _signal(flag: str):
+    signals = _scrape_signals.get()
+    if signals is not None:
+        signals[flag] = True
+
+
+# ---------------------------------------------------------------------------
+# Page load policies
+# ---------------------------------------------------------------------------
+
+# Scrapers only read text, so nothing that is merely rendered is downloaded
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet"})
+
+TRACKER_DOMAINS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "facebook.net", "connect.facebook.com",
+    "segment.io", "segment.com", "hotjar.com", "mixpanel.com",
+    "amplitude.com", "heapanalytics.com", "fullstory.com", "clarity.ms",
+    "intercom.io", "intercomcdn.com", "hs-analytics.net", "hs-scripts.com",
+    "snap.licdn.com", "ads-twitter.com", "sentry.io", "nr-data.net",
+    "browser-intake-datadoghq.com", "optimizely.com", "quantserve.com",
+    "scorecardresearch.com",
+)
+
+
+@dataclass(frozen=True)
+class LoadPolicy:
+    wait_until: str = "domcontentloaded"
+    block_resource_types: FrozenSet[str] = BLOCKED_RESOURCE_TYPES
+    block_trackers: bool = True
+
+
+# Server-rendered pages are readable at DOMContentLoaded; client-rendered
+# directories need their XHR results, which blocking makes cheap to wait for
+LOAD_POLICIES: Dict[str, LoadPolicy] = {
+    "product_hunt": LoadPolicy(),
+    "g2":           LoadPolicy(),
+    "github":       LoadPolicy(),
+    "crunchbase":   LoadPolicy(wait_until="load"),
+    "wellfound":    LoadPolicy(),
+    "yc_directory": LoadPolicy(wait_until="networkidle"),
+    "angellist":    LoadPolicy(wait_until="networkidle"),
+}
+
+
+def _is_tracker(url: str) -> bool:
+    host = urlparse(url).hostname or ""
+    return any(host == d or host.endswith("." + d) for d in TRACKER_DOMAINS)
+
+
+class ScrapeSession:
+    """A pooled page instrumented with one source's load policy for one scrape."""
+
+    def __init__(self, lease: PageLease, source: str, policy: LoadPolicy):
+        self.lease = lease
+        self.page = lease.page
+        self.source = source
+        self.policy = policy
+        self.bytes = 0
+        self.requests = 0
+        self.blocked = 0
+        self.load_ms = 0.0
+
+    async def start(self):
+        await self.page.route("**/*", self._route)
+        self.page.on("response", self._on_response)
+
+    async def stop(self):
+        self.page.remove_listener("response", self._on_response)
+        await self.page.unroute("**/*", self._route)
+
+    async def goto(self, url: str, timeout: int):
+        started = time.perf_counter()
+        try:
+            return await self.page.goto(url, wait_until=self.policy.wait_until, timeout=timeout)
+        finally:
+            self.load_ms += (time.perf_counter() - started) * 1000
+
+    async def _route(self, route):
+        request = route.request
+        if request.resource_type in self.policy.block_resource_types or (
+            self.policy.block_trackers and _is_tracker(request.url)
+        ):
+            self.blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def _on_response(self, response):
+        # content-length is absent on chunked responses, so this is a lower bound
+        self.requests += 1
+        try:
+            self.bytes += int(response.headers.get("content-length") or 0)
+        except ValueError:
+            pass
+
+
+class LoadMetrics:
+    """Process-wide per-source page weight and load time."""
+
+    def __init__(self):
+        self.by_source: Dict[str, Dict[str, float]] = {}
+
+    def record(self, session: ScrapeSession):
+        stats = self.by_source.setdefault(
+            session.source, {"scrapes": 0, "bytes": 0, "requests": 0, "blocked": 0, "load_ms": 0.0}
+        )
+        stats["scrapes"] += 1
+        stats["bytes"] += session.bytes
+        stats["requests"] += session.requests
+        stats["blocked"] += session.blocked
+        stats["load_ms"] += session.load_ms
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {
+            source: {
+                "scrapes": s["scrapes"],
+                "avg_kb": round(s["bytes"] / s["scrapes"] / 1024, 1),
+                "avg_requests": round(s["requests"] / s["scrapes"], 1),
+                "avg_blocked": round(s["blocked"] / s["scrapes"], 1),
+                "avg_load_ms": round(s["load_ms"] / s["scrapes"]),
+            }
+            for source, s in self.by_source.items()
+        }
+
+
+load_metrics = LoadMetrics()
+
+
+class OutcomeMetrics:
+    """Process-wide count of run_scrapers outcomes per source."""
+
+    OUTCOMES = ("ok", "empty", "blocked", "timeout", "error")
+
+    def __init__(self):
+        self.by_source: Dict[str, Dict[str, int]] = {}
+
+    def record(self, source: str, outcome: str):
+        counts = self.by_source.setdefault(source, dict.fromkeys(self.OUTCOMES, 0))
+        counts[outcome] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        return {source: dict(counts) for source, counts in self.by_source.items()}
+
+
+outcome_metrics = OutcomeMetrics()
+
+
+# ---------------------------------------------------------------------------
+# Extraction specs
+# ---------------------------------------------------------------------------
+
+# Per source: card selectors tried in order until one matches, and
+# field → "selector" (innerText) or "selector@attr". ":scope" is the card itself.
+EXTRACTION_SPECS: Dict[str, Dict[str, Any]] = {
+    "product_hunt": {
+        "cards": ["[data-test='post-item']", "article"],
+        "fields": {"name": "h3, h2", "tagline": "p", "href": "a@href"},
+    },
+    "g2": {
+        "cards": ["[itemprop='review']", ".paper.paper--white.paper--box"],
+        "fields": {
+            "reviewer": "[itemprop='author']",
+            "title": "[itemprop='name']",
+            "body": "[itemprop='reviewBody']",
+            "job_info": ".mt-4th",
+        },
+    },
+    "github": {
+        "cards": ["[data-bulk-actions-id]", ".member-container, li.d-flex"],
+        "fields": {"name": "a.d-block, span[data-login]", "href": "a[href]@href"},
+    },
+    "crunchbase": {
+        "cards": ["cb-organization-card, [data-testid='search-result']", "h4 a, .identifier-label"],
+        "fields": {"text": ":scope", "href": "a@href"},
+    },
+    "wellfound": {
+        "cards": ["[data-test='StartupResult'], .job-listing, article"],
+        "fields": {
+            "company": "h2, h3, .startup-link",
+            "role": ".role, [data-test='JobListingJobTitle']",
+            "href": "a@href",
+        },
+    },
+    "yc_directory": {
+        "cards": ["._company_86jzd_338, a[class*='company']", "li._companyCard"],
+        "fields": {
+            "name": "span._coName_86jzd_453, h4",
+            "description": "span._coDescription_86jzd_478, p",
+            "batch": "._batch_86jzd_492, span[class*='batch']",
+            "href": "a@href",
+        },
+    },
+    "angellist": {
+        "cards": [".profile, [class*='ProfileCard'], .s-grid-item"],
+        "fields": {
+            "name": "h2, h3, [class*='Name']",
+            "role": "[class*='role'], [class*='title']",
+            "company": "[class*='company'], [class*='org']",
+            "href": "a@href",
+        },
+    },
+}
+
+# Sources whose listings are server-rendered: tried over plain HTTP first
+HTTP_FIRST_SOURCES = {"product_hunt", "g2", "yc_directory"}
+
+# Runs in the page: one IPC round trip returns every card of a source
+EXTRACT_CARDS_JS = """
+([cardSelectors, fields, limit]) => {
+    let cards = [];
+    for (const sel of cardSelectors) {
+        cards = Array.from(document.querySelectorAll(sel));
+        if (cards.length) break;
+    }
+    if (limit) cards = cards.slice(0, limit);
+    return cards.map(card => {
+        const out = {};
+        for (const [name, spec] of Object.entries(fields)) {
+            const [sel, attr] = spec.split('@');
+            const el = sel === ':scope' ? card : card.querySelector(sel);
+            out[name] = el ? (attr ? el.getAttribute(attr) : el.innerText) : null;
+        }
+        return out;
+    });
+}
+"""
+
+
+async def _wait_for_cards(page, source: str):
+    """Return as soon as the first card is attached; extraction copes with none."""
+    try:
+        await page.wait_for_selector(", ".join(EXTRACTION_SPECS[source]["cards"]), timeout=CARD_WAIT_MS)
+    except Exception:
+        logger.debug(f"[Scrapers] no {source} cards after {CARD_WAIT_MS}ms")
+
+
+async def _extract_cards(page, source: str, limit: Optional[int] = None) -> List[Dict[str, Optional[str]]]:
+    spec = EXTRACTION_SPECS[source]
+    return await page.evaluate(EXTRACT_CARDS_JS, [spec["cards"], spec["fields"], limit])
+
+
+def _extract_cards_html(html_text: str, source: str, limit: Optional[int] = None) -> List[Dict[str, Optional[str]]]:
+    """Same spec as _extract_cards, applied to raw HTML with selectolax."""
+    spec = EXTRACTION_SPECS[source]
+    tree = HTMLParser(html_text)
+    nodes = []
+    for sel in spec["cards"]:
+        nodes = tree.css(sel)
+        if nodes:
+            break
+    if limit:
+        nodes = nodes[:limit]
+
+    cards = []
+    for node in nodes:
+        card = {}
+        for name, field in spec["fields"].items():
+            sel, _, attr = field.partition("@")
+            el = node if sel == ":scope" else node.css_first(sel)
+            if el is None:
+                card[name] = None
+            elif attr:
+                card[name] = el.attributes.get(attr)
+            else:
+                card[name] = el.text(separator="\n", strip=True)
+        cards.append(card)
+    return cards
+
+
+def _github_headers() -> Dict[str, str]:
+    headers = {"Accept": "application/vnd.github+json"}
+    if GITHUB_TOKEN:
+        headers["Authorization"] = f"Bearer {GITHUB_TOKEN}"
+    return headers
+
+
+def _text(value: Optional[str]) -> str:
+    return (value or "").strip()
+
+
+def _absolute(href: Optional[str], base: str) -> str:
+    return f"{base}{href}" if href and href.startswith("/") else (href or "")
 
 
 # ---------------------------------------------------------------------------
@@ -74,49 +459,102 @@ async def _delay(min_s: float = 1.5, max_s: float = 4.0):
 
 class PlaywrightScraperService:
     """
-    Manages a single shared browser instance and exposes async scraper
-    methods for 8 prospect-discovery platforms.
+    Exposes async scraper methods for 8 prospect-discovery platforms.
+    Pages are borrowed from the process-wide BrowserPool.
     """
 
-    def __init__(self):
-        self._browser: Optional[Browser] = None
-        self._playwright = None
-
-    async def _get_browser(self) -> Browser:
-        if self._browser and self._browser.is_connected():
-            return self._browser
-        self._playwright = await async_playwright().start()
-        self._browser = await self._playwright.chromium.launch(
-            headless=True,
-            args=STEALTH_ARGS,
-        )
-        return self._browser
-
-    async def _new_context(self) -> BrowserContext:
-        browser = await self._get_browser()
-        ctx = await browser.new_context(
-            user_agent=random.choice(USER_AGENTS),
-            viewport={"width": 1280, "height": 800},
-            locale="en-US",
-            timezone_id="America/New_York",
-            extra_http_headers={
-                "Accept-Language": "en-US,en;q=0.9",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            },
-        )
-        # Mask automation fingerprint
-        await ctx.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', { get: () => undefined });
-            Object.defineProperty(navigator, 'plugins', { get: () => [1, 2, 3] });
-            window.chrome = { runtime: {} };
-        """)
-        return ctx
+    def __init__(self, pool: Optional[BrowserPool] = None, cache: Optional[ScrapeResultCache] = None):
+        self.pool = pool or browser_pool
+        self.cache = cache or scrape_result_cache
 
     async def close(self):
-        if self._browser:
-            await self._browser.close()
-        if self._playwright:
-            await self._playwright.stop()
+        # The pool is shared by every instance; it is closed on app shutdown
+        pass
+
+    async def _start_session(self, source: str) -> ScrapeSession:
+        lease = await self.pool.acquire()
+        session = ScrapeSession(lease, source, LOAD_POLICIES.get(source, LoadPolicy()))
+        try:
+            await session.start()
+        except Exception:
+            await self.pool.release(lease)
+            raise
+        return session
+
+    async def _end_session(self, session: ScrapeSession):
+        try:
+            await session.stop()
+        except Exception as e:
+            # A page that still carries this policy must not be reused
+            logger.debug(f"[Scrapers] failed to remove load policy for {session.source}: {e}")
+            await session.page.close()
+        load_metrics.record(session)
+        logger.info(
+            f"[Scrapers] {session.source} page load {session.load_ms:.0f}ms, "
+            f"{session.bytes / 1024:.0f} KB over {session.requests} responses, "
+            f"{session.blocked} requests blocked"
+        )
+        await self.pool.release(session.lease)
+
+    async def _fetch_cards(
+        self, source: str, url: str, limit: int, timeout: int
+    ) -> List[Dict[str, Optional[str]]]:
+        """Plain HTTP for server-rendered sources, the browser otherwise."""
+        if source in HTTP_FIRST_SOURCES:
+            cards = await self._static_cards(source, url, limit)
+            if cards is not None:
+                return cards
+        return await self._browser_cards(source, url, limit, timeout)
+
+    async def _static_cards(self, source: str, url: str, limit: int) -> Optional[List[Dict[str, Optional[str]]]]:
+        """Cards parsed from the raw HTML; None when a browser is needed."""
+        if HTMLParser is None:
+            return None
+        try:
+            async with domain_scheduler.slot(url):
+                try:
+                    html_text = await http_fetcher.get_text(url)
+                except httpx.HTTPStatusError as e:
+                    domain_scheduler.report(
+                        url, e.response.status_code, retry_after=_retry_after(e.response.headers)
+                    )
+                    raise
+                blocked = _is_block_page(_html_title(html_text))
+                domain_scheduler.report(url, blocked=blocked)
+        except Exception as e:
+            logger.info(f"[Scrapers] {source} HTTP fetch failed, using browser: {e}")
+            return None
+        if blocked:
+            logger.info(f"[Scrapers] {source} answered HTTP with a challenge page, using browser")
+            return None
+        cards = _extract_cards_html(html_text, source, limit)
+        if not cards:
+            logger.info(f"[Scrapers] {source} has no server-rendered cards, using browser")
+            return None
+        logger.info(f"[Scrapers] {source} served over HTTP ({len(cards)} cards)")
+        return cards
+
+    async def _browser_cards(
+        self, source: str, url: str, limit: int, timeout: int
+    ) -> List[Dict[str, Optional[str]]]:
+        # The host slot is taken before the page lease so a paused host doesn't pin a page
+        async with domain_scheduler.slot(url):
+            session = await self._start_session(source)
+            try:
+                response = await session.goto(url, timeout=timeout)
+                status = response.status if response else None
+                blocked = _is_block_page(await session.page.title())
+                domain_scheduler.report(
+                    url, status, blocked, _retry_after(response.headers if response else None)
+                )
+                if blocked or status in (429, 503):
+                    _signal("blocked")
+                    logger.warning(f"[Scrapers] {source} pushed back ({'challenge page' if blocked else status})")
+                    return []
+                await _wait_for_cards(session.page, source)
+                return await _extract_cards(session.page, source, limit)
+            finally:
+                await self._end_session(session)
 
     # ------------------------------------------------------------------ #
     # 1. Product Hunt                                                       #
@@ -127,43 +565,23 @@ class PlaywrightScraperService:
         Returns makers/founders of matching products as prospects.
         """
         results = []
-        ctx = await self._new_context()
         try:
-            page = await ctx.new_page()
             url = f"https://www.producthunt.com/search?q={keyword.replace(' ', '+')}"
-            logger.info(f"[ProductHunt] Navigating to {url}")
-            await page.goto(url, wait_until="domcontentloaded", timeout=20000)
-            await _delay()
-
-            cards = await page.query_selector_all("[data-test='post-item']")
-            if not cards:
-                # fallback selector
-                cards = await page.query_selector_all("article")
-
-            for card in cards[:limit]:
-                try:
-                    name_el   = await card.query_selector("h3, h2")
-                    tagline_el = await card.query_selector("p")
-                    link_el   = await card.query_selector("a")
-                    name_text   = (await name_el.inner_text()).strip()   if name_el   else ""
-                    tagline_txt = (await tagline_el.inner_text()).strip() if tagline_el else ""
-                    href        = await link_el.get_attribute("href")    if link_el   else ""
-                    full_url    = f"https://www.producthunt.com{href}" if href and href.startswith("/") else href
-
-                    results.append(_normalized(
-                        name=name_text,
-                        role="Founder / Maker",
-                        company=name_text,
-                        url=full_url or url,
-                        source="Product Hunt",
-                        snippet=tagline_txt,
-                    ))
-                except Exception as e:
-                    logger.debug(f"[ProductHunt] card parse error: {e}")
+            logger.info(f"[ProductHunt] Fetching {url}")
+            cards = await self._fetch_cards("product_hunt", url, limit, timeout=20000)
+
+            for card in cards:
+                name_text = _text(card["name"])
+                results.append(_normalized(
+                    name=name_text,
+                    role="Founder / Maker",
+                    company=name_text,
+                    url=_absolute(card["href"], "https://www.producthunt.com") or url,
+                    source="Product Hunt",
+                    snippet=_text(card["tagline"]),
+                ))
         except Exception as e:
             logger.error(f"[ProductHunt] scrape error: {e}")
-        finally:
-            await ctx.close()
 
         logger.info(f"[ProductHunt] Found {len(results)} results for '{keyword}'")
         return results
@@ -179,52 +597,32 @@ class PlaywrightScraperService:
         Reviewers who give 1–3 stars are warm prospects (actively dissatisfied).
         """
         results = []
-        ctx = await self._new_context()
         try:
-            page = await ctx.new_page()
             url = f"https://www.g2.com/products/{competitor_slug}/reviews"
-            logger.info(f"[G2] Navigating to {url}")
-            await page.goto(url, wait_until="domcontentloaded", timeout=25000)
-            await _delay(2, 5)
-
-            review_cards = await page.query_selector_all("[itemprop='review']")
-            if not review_cards:
-                review_cards = await page.query_selector_all(".paper.paper--white.paper--box")
-
-            for card in review_cards[:limit]:
-                try:
-                    reviewer_el = await card.query_selector("[itemprop='author']")
-                    title_el    = await card.query_selector("[itemprop='name']")
-                    body_el     = await card.query_selector("[itemprop='reviewBody']")
-                    job_el      = await card.query_selector(".mt-4th")
-
-                    reviewer = (await reviewer_el.inner_text()).strip() if reviewer_el else "Unknown"
-                    title    = (await title_el.inner_text()).strip()    if title_el    else ""
-                    body     = (await body_el.inner_text()).strip()[:300] if body_el   else ""
-                    job_info = (await job_el.inner_text()).strip()      if job_el      else ""
-
-                    # Parse "Title at Company"
-                    role, company = "", ""
-                    if " at " in job_info:
-                        parts = job_info.split(" at ", 1)
-                        role = parts[0].strip()
-                        company = parts[1].strip()
-
-                    results.append(_normalized(
-                        name=reviewer,
-                        role=role,
-                        company=company,
-                        url=url,
-                        source="G2",
-                        snippet=f"Review of {competitor_slug}: {body}",
-                        extra={"review_title": title},
-                    ))
-                except Exception as e:
-                    logger.debug(f"[G2] card parse error: {e}")
+            logger.info(f"[G2] Fetching {url}")
+            cards = await self._fetch_cards("g2", url, limit, timeout=25000)
+
+            for card in cards:
+                job_info = _text(card["job_info"])
+
+                # Parse "Title at Company"
+                role, company = "", ""
+                if " at " in job_info:
+                    parts = job_info.split(" at ", 1)
+                    role = parts[0].strip()
+                    company = parts[1].strip()
+
+                results.append(_normalized(
+                    name=_text(card["reviewer"]) or "Unknown",
+                    role=role,
+                    company=company,
+                    url=url,
+                    source="G2",
+                    snippet=f"Review of {competitor_slug}: {_text(card['body'])[:300]}",
+                    extra={"review_title": _text(card["title"])},
+                ))
         except Exception as e:
             logger.error(f"[G2] scrape error: {e}")
-        finally:
-            await ctx.close()
 
         logger.info(f"[G2] Found {len(results)} reviewers for '{competitor_slug}'")
         return results
@@ -234,71 +632,24 @@ class PlaywrightScraperService:
     # ------------------------------------------------------------------ #
     async def scrape_hacker_news_hiring(self, keyword: str, limit: int = 15) -> List[Dict]:
         """
-        Scrapes the latest HN "Who is Hiring" thread (monthly, posted by whoishiring).
-        Filters comments matching `keyword`.
+        Postings from the latest HN "Who is Hiring" thread (monthly, posted by
+        whoishiring) matching `keyword`, answered from the local HN hiring index.
         """
         results = []
-        ctx = await self._new_context()
         try:
-            page = await ctx.new_page()
-            # Search HN for the latest hiring thread
-            search_url = f"https://hn.algolia.com/api/v1/search?query=Who+is+Hiring&tags=story,author_whoishiring&hitsPerPage=1"
-            await page.goto(search_url, wait_until="domcontentloaded", timeout=15000)
-            content = await page.content()
-
-            # Extract thread ID from JSON response
-            thread_id_match = re.search(r'"objectID":"(\d+)"', content)
-            if not thread_id_match:
-                logger.warning("[HN] Could not find hiring thread ID")
-                await ctx.close()
-                return results
-
-            thread_id = thread_id_match.group(1)
-            thread_url = f"https://news.ycombinator.com/item?id={thread_id}"
-            logger.info(f"[HN] Loading thread {thread_url}")
-
-            await page.goto(thread_url, wait_until="domcontentloaded", timeout=25000)
-            await _delay(2, 4)
-
-            comments = await page.query_selector_all(".comment-tree .athing.comtr")
-            kw_lower = keyword.lower()
-
-            for comment in comments:
-                if len(results) >= limit:
-                    break
-                try:
-                    text_el = await comment.query_selector(".comment .commtext")
-                    if not text_el:
-                        continue
-                    text = (await text_el.inner_text()).strip()
-                    if kw_lower not in text.lower():
-                        continue
-
-                    # First line is usually "Company | Role | Location | Remote/Onsite"
-                    lines  = [l.strip() for l in text.split("\n") if l.strip()]
-                    first  = lines[0] if lines else ""
-                    parts  = [p.strip() for p in first.split("|")]
-                    company = parts[0] if parts else ""
-                    role    = parts[1] if len(parts) > 1 else keyword
-                    snippet = " ".join(lines[:3])
-
-                    user_el  = await comment.query_selector(".hnuser")
-                    username = (await user_el.inner_text()).strip() if user_el else ""
-
-                    results.append(_normalized(
-                        name=username,
-                        role=role,
-                        company=company,
-                        url=thread_url,
-                        source="Hacker News Hiring",
-                        snippet=snippet,
-                    ))
-                except Exception as e:
-                    logger.debug(f"[HN] comment parse error: {e}")
+            for posting in await hn_hiring_index.search(keyword, limit):
+                lines = [l.strip() for l in posting["text"].split("\n") if l.strip()]
+                results.append(_normalized(
+                    name=posting["author"],
+                    role=posting["role"] or keyword,
+                    company=posting["company"],
+                    url=f"https://news.ycombinator.com/item?id={posting['id']}",
+                    source="Hacker News Hiring",
+                    snippet=" ".join(lines[:3]),
+                    extra={"location": posting["location"], "remote": posting["remote"]},
+                ))
         except Exception as e:
             logger.error(f"[HN] scrape error: {e}")
-        finally:
-            await ctx.close()
 
         logger.info(f"[HN] Found {len(results)} hiring posts for '{keyword}'")
         return results
@@ -308,45 +659,37 @@ class PlaywrightScraperService:
     # ------------------------------------------------------------------ #
     async def scrape_github_org(self, org_name: str, limit: int = 10) -> List[Dict]:
         """
-        Scrapes github.com/{org_name}/people for public members.
+        Lists public members of `org_name` via the GitHub API, falling back
+        to scraping github.com/orgs/{org_name}/people.
         Returns member names, roles (bio), and profile URLs.
         """
         results = []
-        ctx = await self._new_context()
         try:
-            page = await ctx.new_page()
             url = f"https://github.com/orgs/{org_name}/people"
-            logger.info(f"[GitHub] Navigating to {url}")
-            await page.goto(url, wait_until="domcontentloaded", timeout=20000)
-            await _delay()
-
-            members = await page.query_selector_all("[data-bulk-actions-id]")
-            if not members:
-                # Try public members page
-                members = await page.query_selector_all(".member-container, li.d-flex")
-
-            for m in members[:limit]:
-                try:
-                    name_el  = await m.query_selector("a.d-block, span[data-login]")
-                    login_el = await m.query_selector("a[href]")
-                    name     = (await name_el.inner_text()).strip() if name_el else ""
-                    href     = await login_el.get_attribute("href") if login_el else ""
-                    profile  = f"https://github.com{href}" if href and href.startswith("/") else href
-
-                    results.append(_normalized(
-                        name=name,
-                        role="Engineer / Contributor",
-                        company=org_name,
-                        url=profile or url,
-                        source="GitHub",
-                        snippet=f"GitHub member of {org_name}",
-                    ))
-                except Exception as e:
-                    logger.debug(f"[GitHub] member parse error: {e}")
+            try:
+                members = await http_fetcher.get_json(
+                    f"https://api.github.com/orgs/{org_name}/public_members",
+                    params={"per_page": min(max(limit, 1), 100)},
+                    headers=_github_headers(),
+                )
+                cards = [{"name": m["login"], "href": m["html_url"]} for m in members[:limit]]
+                logger.info(f"[GitHub] Fetched public members of {org_name} via API")
+            except Exception as e:
+                # Unauthenticated API calls are limited to 60/hour
+                logger.info(f"[GitHub] API unavailable ({e}); falling back to {url}")
+                cards = await self._browser_cards("github", url, limit, timeout=20000)
+
+            for m in cards:
+                results.append(_normalized(
+                    name=_text(m["name"]),
+                    role="Engineer / Contributor",
+                    company=org_name,
+                    url=_absolute(m["href"], "https://github.com") or url,
+                    source="GitHub",
+                    snippet=f"GitHub member of {org_name}",
+                ))
         except Exception as e:
             logger.error(f"[GitHub] scrape error: {e}")
-        finally:
-            await ctx.close()
 
         logger.info(f"[GitHub] Found {len(results)} members for org '{org_name}'")
         return results
@@ -362,46 +705,30 @@ class PlaywrightScraperService:
         Returns key executives/founders from company cards.
         """
         results = []
-        ctx = await self._new_context()
         try:
-            page = await ctx.new_page()
             url = f"https://www.crunchbase.com/search/people/field/persons/facet_ids/{keyword.replace(' ', '-').lower()}"
             # Fallback: use the simpler org search
             url = f"https://www.crunchbase.com/search/organizations/field/organizations/short_description/{keyword.replace(' ', '%20')}"
             logger.info(f"[Crunchbase] Navigating to {url}")
-            await page.goto(url, wait_until="domcontentloaded", timeout=25000)
-            await _delay(3, 6)
+            cards = await self._fetch_cards("crunchbase", url, limit, timeout=25000)
 
             # Crunchbase is heavily JS-rendered; extract what's visible
-            cards = await page.query_selector_all("cb-organization-card, [data-testid='search-result']")
-            if not cards:
-                cards = await page.query_selector_all("h4 a, .identifier-label")
-
-            for card in cards[:limit]:
-                try:
-                    link_el = await card.query_selector("a")
-                    text    = (await card.inner_text()).strip()
-                    href    = await link_el.get_attribute("href") if link_el else ""
-                    full_url = f"https://www.crunchbase.com{href}" if href and href.startswith("/") else href
-
-                    lines = [l.strip() for l in text.split("\n") if l.strip()]
-                    name    = lines[0] if lines else text[:80]
-                    snippet = " | ".join(lines[1:3]) if len(lines) > 1 else ""
-
-                    results.append(_normalized(
-                        name=name,
-                        role="Founder / Executive",
-                        company=name,
-                        url=full_url or url,
-                        source="Crunchbase",
-                        snippet=snippet,
-                    ))
-                except Exception as e:
-                    logger.debug(f"[Crunchbase] card parse error: {e}")
+            for card in cards:
+                text  = _text(card["text"])
+                lines = [l.strip() for l in text.split("\n") if l.strip()]
+                name    = lines[0] if lines else text[:80]
+                snippet = " | ".join(lines[1:3]) if len(lines) > 1 else ""
+
+                results.append(_normalized(
+                    name=name,
+                    role="Founder / Executive",
+                    company=name,
+                    url=_absolute(card["href"], "https://www.crunchbase.com") or url,
+                    source="Crunchbase",
+                    snippet=snippet,
+                ))
         except Exception as e:
             logger.error(f"[Crunchbase] scrape error: {e}")
-        finally:
-            await ctx.close()
 
         logger.info(f"[Crunchbase] Found {len(results)} results for '{keyword}'")
         return results
@@ -415,41 +742,26 @@ class PlaywrightScraperService:
         Returns startup employees and founders for each matching company.
         """
         results = []
-        ctx = await self._new_context()
         try:
-            page = await ctx.new_page()
             query = f"{role} {keyword}".strip().replace(" ", "%20")
             url = f"https://wellfound.com/jobs?q={query}"
             logger.info(f"[Wellfound] Navigating to {url}")
-            await page.goto(url, wait_until="domcontentloaded", timeout=25000)
-            await _delay(2, 5)
-
-            job_cards = await page.query_selector_all("[data-test='StartupResult'], .job-listing, article")
-            for card in job_cards[:limit]:
-                try:
-                    company_el = await card.query_selector("h2, h3, .startup-link")
-                    role_el    = await card.query_selector(".role, [data-test='JobListingJobTitle']")
-                    link_el    = await card.query_selector("a")
-
-                    company_name = (await company_el.inner_text()).strip() if company_el else ""
-                    role_name    = (await role_el.inner_text()).strip()    if role_el    else role
-                    href         = await link_el.get_attribute("href")     if link_el    else ""
-                    full_url     = f"https://wellfound.com{href}" if href and href.startswith("/") else href
-
-                    results.append(_normalized(
-                        name=company_name,
-                        role=role_name,
-                        company=company_name,
-                        url=full_url or url,
-                        source="Wellfound",
-                        snippet=f"{role_name} position at {company_name}",
-                    ))
-                except Exception as e:
-                    logger.debug(f"[Wellfound] card parse error: {e}")
+            cards = await self._fetch_cards("wellfound", url, limit, timeout=25000)
+
+            for card in cards:
+                company_name = _text(card["company"])
+                role_name    = _text(card["role"]) if card["role"] is not None else role
+
+                results.append(_normalized(
+                    name=company_name,
+                    role=role_name,
+                    company=company_name,
+                    url=_absolute(card["href"], "https://wellfound.com") or url,
+                    source="Wellfound",
+                    snippet=f"{role_name} position at {company_name}",
+                ))
         except Exception as e:
             logger.error(f"[Wellfound] scrape error: {e}")
-        finally:
-            await ctx.close()
 
         logger.info(f"[Wellfound] Found {len(results)} results for '{role}'")
         return results
@@ -463,48 +775,26 @@ class PlaywrightScraperService:
         Returns YC-backed company founders as prospects.
         """
         results = []
-        ctx = await self._new_context()
         try:
-            page = await ctx.new_page()
             url = f"https://www.ycombinator.com/companies?q={keyword.replace(' ', '+')}"
             if batch:
                 url += f"&batch={batch}"
-            logger.info(f"[YC] Navigating to {url}")
-            await page.goto(url, wait_until="domcontentloaded", timeout=25000)
-            await _delay(2, 5)
-
-            cards = await page.query_selector_all("._company_86jzd_338, a[class*='company']")
-            if not cards:
-                cards = await page.query_selector_all("li._companyCard")
-
-            for card in cards[:limit]:
-                try:
-                    name_el    = await card.query_selector("span._coName_86jzd_453, h4")
-                    desc_el    = await card.query_selector("span._coDescription_86jzd_478, p")
-                    batch_el   = await card.query_selector("._batch_86jzd_492, span[class*='batch']")
-                    link_el    = await card.query_selector("a")
-
-                    name    = (await name_el.inner_text()).strip()  if name_el  else ""
-                    desc    = (await desc_el.inner_text()).strip()  if desc_el  else ""
-                    batch_v = (await batch_el.inner_text()).strip() if batch_el else ""
-                    href    = await link_el.get_attribute("href")   if link_el  else ""
-                    full_url = f"https://www.ycombinator.com{href}" if href and href.startswith("/") else href
-
-                    results.append(_normalized(
-                        name=name,
-                        role="Founder / CEO",
-                        company=name,
-                        url=full_url or url,
-                        source="YC Directory",
-                        snippet=desc,
-                        extra={"yc_batch": batch_v},
-                    ))
-                except Exception as e:
-                    logger.debug(f"[YC] card parse error: {e}")
+            logger.info(f"[YC] Fetching {url}")
+            cards = await self._fetch_cards("yc_directory", url, limit, timeout=25000)
+
+            for card in cards:
+                name = _text(card["name"])
+                results.append(_normalized(
+                    name=name,
+                    role="Founder / CEO",
+                    company=name,
+                    url=_absolute(card["href"], "https://www.ycombinator.com") or url,
+                    source="YC Directory",
+                    snippet=_text(card["description"]),
+                    extra={"yc_batch": _text(card["batch"])},
+                ))
         except Exception as e:
             logger.error(f"[YC] scrape error: {e}")
-        finally:
-            await ctx.close()
 
         logger.info(f"[YC] Found {len(results)} companies for '{keyword}'")
         return results
@@ -518,42 +808,24 @@ class PlaywrightScraperService:
         Returns investor/founder profiles.
         """
         results = []
-        ctx = await self._new_context()
         try:
-            page = await ctx.new_page()
             url = f"https://angel.co/people?market={market.replace(' ', '+')}&role={role}"
             logger.info(f"[AngelList] Navigating to {url}")
-            await page.goto(url, wait_until="domcontentloaded", timeout=25000)
-            await _delay(3, 6)
-
-            profiles = await page.query_selector_all(".profile, [class*='ProfileCard'], .s-grid-item")
-            for profile in profiles[:limit]:
-                try:
-                    name_el    = await profile.query_selector("h2, h3, [class*='Name']")
-                    role_el    = await profile.query_selector("[class*='role'], [class*='title']")
-                    company_el = await profile.query_selector("[class*='company'], [class*='org']")
-                    link_el    = await profile.query_selector("a")
-
-                    name_txt    = (await name_el.inner_text()).strip()    if name_el    else ""
-                    role_txt    = (await role_el.inner_text()).strip()    if role_el    else role
-                    company_txt = (await company_el.inner_text()).strip() if company_el else ""
-                    href        = await link_el.get_attribute("href")     if link_el    else ""
-                    full_url    = f"https://angel.co{href}" if href and href.startswith("/") else href
-
-                    results.append(_normalized(
-                        name=name_txt,
-                        role=role_txt,
-                        company=company_txt,
-                        url=full_url or url,
-                        source="AngelList",
-                        snippet=f"{role_txt} in {market}",
-                    ))
-                except Exception as e:
-                    logger.debug(f"[AngelList] profile parse error: {e}")
+            cards = await self._fetch_cards("angellist", url, limit, timeout=25000)
+
+            for profile in cards:
+                role_txt = _text(profile["role"]) if profile["role"] is not None else role
+
+                results.append(_normalized(
+                    name=_text(profile["name"]),
+                    role=role_txt,
+                    company=_text(profile["company"]),
+                    url=_absolute(profile["href"], "https://angel.co") or url,
+                    source="AngelList",
+                    snippet=f"{role_txt} in {market}",
+                ))
         except Exception as e:
             logger.error(f"[AngelList] scrape error: {e}")
-        finally:
-            await ctx.close()
 
         logger.info(f"[AngelList] Found {len(results)} profiles for market '{market}'")
         return results
@@ -561,11 +833,33 @@ class PlaywrightScraperService:
     # ------------------------------------------------------------------ #
     # Parallel runner (used internally by router service)                   #
     # ------------------------------------------------------------------ #
-    async def run_scrapers(self, scraper_calls: List[Dict]) -> List[Dict]:
+    async def run_scrapers(self, scraper_calls: List[Dict], use_cache: bool = True) -> List[Dict]:
         """
         Run multiple scrapers in parallel.
         `scraper_calls` is a list of dicts: { "scraper": str, "kwargs": dict }
-        Returns merged, deduplicated results.
+        Returns merged, deduplicated results (see run_scrapers_detailed).
+        """
+        return (await self.run_scrapers_detailed(scraper_calls, use_cache=use_cache))["prospects"]
+
+    async def run_scrapers_detailed(
+        self,
+        scraper_calls: List[Dict],
+        use_cache: bool = True,
+        budget: float = RUN_SCRAPERS_BUDGET,
+        hedge: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Run multiple scrapers in parallel within `budget` seconds.
+        Results come from the scrape result cache when available
+        (use_cache=False forces a live scrape and refreshes the cache).
+        A source that misses its deadline contributes nothing to this run,
+        but its scrape keeps going in the background and fills the cache.
+
+        Returns:
+            {
+              "prospects": [...merged, deduplicated...],
+              "sources": {scraper: {"outcome", "results", "ms", "hedged"}},
+            }
         """
         scraper_map = {
             "product_hunt":       self.scrape_product_hunt,
@@ -580,34 +874,91 @@ class PlaywrightScraperService:
 
         tasks = []
         for call in scraper_calls:
-            fn = scraper_map.get(call.get("scraper"))
+            name = call.get("scraper")
+            fn = scraper_map.get(name)
             if fn:
-                tasks.append(fn(**call.get("kwargs", {})))
+                kwargs = call.get("kwargs", {})
+                if not use_cache:
+                    self.cache.invalidate_key(name, kwargs)
+                deadline = min(SCRAPER_DEADLINES.get(name, DEFAULT_DEADLINE), budget)
+                tasks.append(self._run_one(name, fn, kwargs, deadline, hedge))
             else:
                 logger.warning(f"Unknown scraper: {call.get('scraper')}")
 
         if not tasks:
-            return []
-
-        nested_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        merged = []
-        seen_urls = set()
-        seen_names = set()
-
-        for batch in nested_results:
-            if isinstance(batch, Exception):
-                logger.error(f"Scraper task failed: {batch}")
-                continue
-            for r in batch:
-                key_url  = r.get("url", "")
-                key_name = (r.get("name", "") + r.get("company", "")).lower().strip()
-                if key_url in seen_urls or (key_name and key_name in seen_names):
-                    continue
-                seen_urls.add(key_url)
-                if key_name:
-                    seen_names.add(key_name)
-                merged.append(r)
-
-        logger.info(f"[run_scrapers] Merged {len(merged)} unique results from {len(tasks)} scrapers")
-        return merged
+            return {"prospects": [], "sources": {}}
+
+        nested_results = await asyncio.gather(*tasks)
+
+        combined = []
+        sources: Dict[str, Dict[str, Any]] = {}
+        for name, batch, stats in nested_results:
+            sources[name] = stats
+            combined.extend(batch)
+        merged = resolve(combined)
+
+        summary = ", ".join(f"{n}={st['outcome']}" for n, st in sources.items())
+        logger.info(f"[run_scrapers] Merged {len(merged)} unique results from {len(tasks)} scrapers ({summary})")
+        return {"prospects": merged, "sources": sources}
+
+    async def _run_one(
+        self, name: str, fn, kwargs: Dict[str, Any], deadline: float, hedge: bool
+    ) -> Tuple[str, List[Dict], Dict[str, Any]]:
+        """One source under its deadline → (name, results, stats). Never raises."""
+        started = time.perf_counter()
+        signals: Dict[str, bool] = {}
+        # The cache's scrape task is created below and inherits this context
+        _scrape_signals.set(signals)
+        if name in SOURCE_HOSTS and domain_scheduler.concurrency(SOURCE_HOSTS[name]) < 2:
+            hedge = False
+        hedge_after = deadline * HEDGE_AFTER if hedge else None
+        results: List[Dict] = []
+        try:
+            results = await asyncio.wait_for(
+                self.cache.get_or_fetch(name, kwargs, lambda: self._hedged(name, fn, kwargs, hedge_after)),
+                timeout=deadline,
+            )
+            outcome = "ok" if results else ("blocked" if signals.get("blocked") else "empty")
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            logger.warning(f"[run_scrapers] {name} missed its {deadline:.0f}s deadline")
+        except Exception as e:
+            outcome = "error"
+            logger.error(f"Scraper task failed: {e}")
+
+        outcome_metrics.record(name, outcome)
+        return name, results, {
+            "outcome": outcome,
+            "results": len(results),
+            "ms": round((time.perf_counter() - started) * 1000),
+            "hedged": signals.get("hedged", False),
+        }
+
+    async def _hedged(self, name: str, fn, kwargs: Dict[str, Any], hedge_after: Optional[float]) -> List[Dict]:
+        """
+        Run the scraper; if it hasn't finished after `hedge_after` seconds,
+        start a second attempt and keep the first non-empty result.
+        """
+        primary = asyncio.create_task(fn(**kwargs))
+        if hedge_after is None:
+            return await primary
+        done, _ = await asyncio.wait({primary}, timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        logger.info(f"[run_scrapers] {name} stalled for {hedge_after:.0f}s — starting a hedged attempt")
+        _signal("hedged")
+        pending = {primary, asyncio.create_task(fn(**kwargs))}
+        fallback: List[Dict] = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task.result():
+                            return task.result()
+                        fallback = task.result()
+            return fallback
+        finally:
+            for task in pending:
+                task.cancel()
@@ -6,28 +6,54 @@ Multi-source prospect discovery pipeline:
   2. Google Search + Reddit (existing)
   3. AI-routed Playwright scrapers: Product Hunt, G2, HN, GitHub,
      Crunchbase, Wellfound, YC Directory, AngelList (NEW)
-  4. LLM analyzes + scores all prospects
+  4. Entity resolution merges the same person seen on several sources
+     (services/entity_resolution.py), a local pre-filter drops implausible
+     hits (services/prospect_prefilter.py), then the LLM analyzes + scores them
   5. Email discovery + verification for top prospects (NEW)
 """
 
 import logging
 import json
 import asyncio
-from typing import List, Dict, Any, Optional
+import os
+from typing import List, Dict, Any, Optional, Tuple
+
+from redis import Redis
 
 from services.llm_service import LLMService
 from services.web_search_service import WebSearchService
 from services.query_generator_service import QueryGeneratorService
 from services.scraper_router_service import ScraperRouterService
 from services.email_discovery_service import EmailDiscoveryService
+from services.entity_resolution import cluster, resolve
+from services.prospect_prefilter import prospect_prefilter
 
 logger = logging.getLogger(__name__)
 
+ANALYSIS_BATCH_SIZE = int(os.getenv("ANALYSIS_BATCH_SIZE", "10"))
+ANALYSIS_CONCURRENCY = int(os.getenv("ANALYSIS_CONCURRENCY", "4"))
+ANALYSIS_MAX_ATTEMPTS = 2
+# Upper bound on one run's LLM spend, not a quality cut-off
+ANALYSIS_MAX_CANDIDATES = int(os.getenv("ANALYSIS_MAX_CANDIDATES", "200"))
+
+# Compact row encoding of a candidate; "id" ties the LLM's answer back to it
+CANDIDATE_COLUMNS = ["id", "source", "name", "role", "company", "url", "title", "snippet"]
+SNIPPET_CHARS = 300
+
+
+def _cell(candidate: Dict, column: str) -> str:
+    if column in ("name", "role", "company"):
+        value = candidate.get(column) or candidate.get(f"_{column}")
+    else:
+        value = candidate.get(column)
+    value = " ".join(str(value or "").split())
+    return value[:SNIPPET_CHARS] if column == "snippet" else value
+
 
 class ProspectDiscoveryService:
-    def __init__(self):
+    def __init__(self, redis_client: Optional[Redis] = None):
         self.llm_service = LLMService()
-        self.web_search_service = WebSearchService()
+        self.web_search_service = WebSearchService(redis_client=redis_client)
         self.query_generator_service = QueryGeneratorService()
         self.scraper_router = ScraperRouterService()
         self.email_discovery = EmailDiscoveryService()
@@ -93,7 +119,8 @@ class ProspectDiscoveryService:
             pw_prospects = playwright_result.get("prospects", [])
             logger.info(
                 f"[Playwright] Added {len(pw_prospects)} results "
-                f"(scrapers: {playwright_result.get('scrapers_used', [])}). "
+                f"(scrapers: {playwright_result.get('scrapers_used', [])}, "
+                f"outcomes: {playwright_result.get('source_stats', {})}). "
                 f"Rationale: {playwright_result.get('rationale', '')}"
             )
             # Adapt playwright results to match web search result format
@@ -113,18 +140,18 @@ class ProspectDiscoveryService:
         elif isinstance(playwright_result, Exception):
             logger.error(f"Playwright scraping failed: {playwright_result}")
 
-        # ── Dedup by URL ───────────────────────────────────────────────────
-        unique_map: Dict[str, Dict] = {}
-        for p in all_raw:
-            key = p.get("url") or p.get("title", "")
-            if key and key not in unique_map:
-                unique_map[key] = p
+        # ── Entity resolution across sources ───────────────────────────────
+        unique_list = resolve([p for p in all_raw if p.get("url") or p.get("title")])
+        logger.info(f"[Discovery] {len(unique_list)} unique prospects from all sources")
 
-        unique_list = list(unique_map.values())
-        logger.info(f"[Discovery] {len(unique_list)} unique prospects from all sources before LLM analysis")
+        # ── Local pre-filter: job boards, listicles, nameless threads ──────
+        unique_list = await prospect_prefilter.filter(unique_list, goal, job_titles)
+        logger.info(f"[Discovery] {len(unique_list)} prospects sent to LLM analysis")
 
         # ── LLM Analysis & Scoring ─────────────────────────────────────────
         analyzed = await self._analyze_prospects(unique_list, company_description, goal)
+        # The LLM may still emit one person twice (e.g. from two snippets)
+        analyzed = sorted(resolve(analyzed), key=lambda x: x.get("alignment_score", 0), reverse=True)
 
         # ── Email Enrichment (top prospects only) ──────────────────────────
         if enable_email_discovery and analyzed:
@@ -133,14 +160,11 @@ class ProspectDiscoveryService:
         return analyzed
 
     # ──────────────────────────────────────────────────────────────────────
-    # Private: Google + Reddit search (unchanged from original)
+    # Private: Google + Reddit search
     # ──────────────────────────────────────────────────────────────────────
     async def _run_google_reddit_search(
         self, preferences: Dict, goal: str, job_titles: List[str]
     ) -> List[Dict]:
-        import random, time
-
-        all_prospects = []
         try:
             search_queries = await self.query_generator_service.generate_search_queries(preferences)
             logger.info(f"Generated search queries: {search_queries}")
@@ -148,30 +172,34 @@ class ProspectDiscoveryService:
             logger.error(f"Query generation failed: {e}")
             return []
 
-        for query in search_queries:
+        # All queries at once; WebSearchService paces them per API key
+        async def _search(query: str) -> List[Dict]:
             logger.info(f"Searching Google for: {query}")
             try:
-                await asyncio.sleep(random.uniform(0.5, 1.5))
                 if "site:linkedin.com/in/" in query:
                     results = await self.web_search_service.search_linkedin_profiles(query, num_results=5)
                 elif "site:reddit.com" in query:
                     results = await self.web_search_service.search_reddit(query, num_results=5)
                 else:
                     results = await self.web_search_service.search_google(query, num_results=5)
-
-                logger.info(f"Found {len(results)} results for: {query}")
-                for result in results:
-                    all_prospects.append({
-                        "source":      result.get("source", "Web"),
-                        "title":       result.get("title"),
-                        "url":         result.get("link"),
-                        "snippet":     result.get("snippet"),
-                        "search_term": query,
-                    })
             except Exception as e:
                 logger.error(f"Error searching '{query}': {e}")
-
-        return all_prospects
+                return []
+
+            logger.info(f"Found {len(results)} results for: {query}")
+            return [
+                {
+                    "source":      result.get("source", "Web"),
+                    "title":       result.get("title"),
+                    "url":         result.get("link"),
+                    "snippet":     result.get("snippet"),
+                    "search_term": query,
+                }
+                for result in results
+            ]
+
+        per_query = await asyncio.gather(*(_search(q) for q in search_queries))
+        return [prospect for results in per_query for prospect in results]
 
     # ──────────────────────────────────────────────────────────────────────
     # Private: LLM analysis (enhanced to use structured playwright fields)
@@ -179,27 +207,59 @@ class ProspectDiscoveryService:
     async def _analyze_prospects(
         self, raw_prospects: List[Dict], company_desc: str, goal: str
     ) -> List[Dict]:
+        """
+        Score every candidate: ANALYSIS_BATCH_SIZE candidates per LLM call,
+        at most ANALYSIS_CONCURRENCY calls in flight. A batch whose call or
+        JSON fails is retried on its own; results are collected as batches
+        finish and returned sorted by alignment_score.
+        """
         if not raw_prospects:
             return []
 
+        candidates = raw_prospects[:ANALYSIS_MAX_CANDIDATES]
+        if len(raw_prospects) > ANALYSIS_MAX_CANDIDATES:
+            logger.warning(f"[Analysis] Scoring the first {ANALYSIS_MAX_CANDIDATES} of {len(raw_prospects)} candidates")
+
+        batches = [
+            list(enumerate(candidates))[i:i + ANALYSIS_BATCH_SIZE]
+            for i in range(0, len(candidates), ANALYSIS_BATCH_SIZE)
+        ]
+        slots = asyncio.Semaphore(ANALYSIS_CONCURRENCY)
+
+        async def _run(batch):
+            async with slots:
+                return await self._analyze_batch(batch, company_desc, goal)
+
+        final_list: List[Dict] = []
+        for finished in asyncio.as_completed([_run(b) for b in batches]):
+            final_list.extend(await finished)
+
+        logger.info(f"[Analysis] {len(final_list)} prospects scored from {len(candidates)} candidates in {len(batches)} batch(es)")
+        return sorted(final_list, key=lambda x: x.get("alignment_score", 0), reverse=True)
+
+    async def _analyze_batch(
+        self, batch: List[Tuple[int, Dict]], company_desc: str, goal: str
+    ) -> List[Dict]:
         system_prompt = """You are an expert SDR agent.
 Your goal is to analyze search results and scraped prospect data to identify
 high-quality leads based on the user's company and goal.
-Use any structured fields (_name, _role, _company) when available.
-Return a JSON list of analyzed prospects."""
-
-        candidates = raw_prospects[:20] if len(raw_prospects) > 20 else raw_prospects
+Candidates are given as a table: one JSON array per row, columns as listed.
+Use the structured name/role/company columns when they are filled.
+Return a JSON list with one analyzed prospect per real person, each carrying
+the "id" of the row it came from."""
 
+        rows = [[i] + [_cell(c, col) for col in CANDIDATE_COLUMNS[1:]] for i, c in batch]
         user_prompt = f"""
 **My Company:** {company_desc}
 **My Goal:** {goal}
 
-**Candidates to Analyze:**
-{json.dumps(candidates, indent=2)}
+**Candidates** (columns: {", ".join(CANDIDATE_COLUMNS)}):
+{chr(10).join(json.dumps(row, ensure_ascii=False, separators=(",", ":")) for row in rows)}
 
 **Output Format (JSON List):**
 [
   {{
+    "id": 0,
     "name": "Full Name",
     "role": "Job Title",
     "company": "Company Name",
@@ -217,6 +277,7 @@ Return a JSON list of analyzed prospects."""
 """
         structure = [
             {
+                "id": 0,
                 "name": "string",
                 "role": "string",
                 "company": "string",
@@ -232,29 +293,49 @@ Return a JSON list of analyzed prospects."""
             }
         ]
 
-        try:
-            analyzed_data = await self.llm_service.get_json_response(
-                system_prompt=system_prompt,
-                user_prompt=user_prompt,
-                json_structure=structure,
-            )
-
-            final_list = []
-            if isinstance(analyzed_data, list):
-                for p in analyzed_data:
-                    if p.get("name") == "Unknown" and p.get("company") == "Unknown":
-                        continue
-                    p["alignment_score"] = float(p.get("alignment_score", 0))
-                    if not isinstance(p.get("pain_points"), list):
-                        p["pain_points"] = []
-                    final_list.append(p)
-
-            return sorted(final_list, key=lambda x: x.get("alignment_score", 0), reverse=True)
-
-        except Exception as e:
-            logger.error(f"LLM analysis failed: {e}")
+        by_id = dict(batch)
+        for attempt in range(1, ANALYSIS_MAX_ATTEMPTS + 1):
+            try:
+                analyzed_data = await self.llm_service.get_json_response(
+                    system_prompt=system_prompt,
+                    user_prompt=user_prompt,
+                    json_structure=structure,
+                )
+                if not isinstance(analyzed_data, list):
+                    raise ValueError("expected a JSON list")
+                break
+            except Exception as e:
+                logger.error(f"[Analysis] Batch of {len(batch)} failed (attempt {attempt}/{ANALYSIS_MAX_ATTEMPTS}): {e}")
+        else:
             return []
 
+        final_list = []
+        for p in analyzed_data:
+            if not isinstance(p, dict):
+                continue
+            if p.get("name") == "Unknown" and p.get("company") == "Unknown":
+                continue
+            # Facts we already know beat whatever the model echoed back
+            raw_id = p.pop("id", None)
+            try:
+                original = by_id.get(int(raw_id))
+            except (TypeError, ValueError):
+                original = None
+            if original is None:
+                logger.warning(f"[Analysis] No candidate for returned id {raw_id!r}; keeping the model's url/source")
+            else:
+                p["url"] = original.get("url") or p.get("url")
+                p["source"] = original.get("source") or p.get("source")
+                p["email"] = p.get("email") or original.get("_email")
+            try:
+                p["alignment_score"] = float(p.get("alignment_score", 0))
+            except (TypeError, ValueError):
+                p["alignment_score"] = 0.0
+            if not isinstance(p.get("pain_points"), list):
+                p["pain_points"] = []
+            final_list.append(p)
+        return final_list
+
     # ──────────────────────────────────────────────────────────────────────
     # Private: Email enrichment for high-score prospects
     # ──────────────────────────────────────────────────────────────────────
@@ -266,10 +347,20 @@ Return a JSON list of analyzed prospects."""
         discover and verify their email address.
         Runs enrichment tasks in parallel (up to max_to_enrich).
         """
-        to_enrich = [
-            p for p in prospects
-            if p.get("alignment_score", 0) >= min_score and not p.get("email")
-        ][:max_to_enrich]
+        # One lookup per entity; its result is applied to every record of that entity
+        groups = cluster(prospects)
+        to_enrich: List[Dict] = []
+        enrich_groups: List[List[int]] = []
+        for group in sorted(groups, key=lambda g: -max(prospects[i].get("alignment_score", 0) for i in g)):
+            members = [prospects[i] for i in group]
+            if any(p.get("email") for p in members):
+                continue
+            best = max(members, key=lambda p: p.get("alignment_score", 0))
+            if best.get("alignment_score", 0) >= min_score:
+                to_enrich.append(best)
+                enrich_groups.append(group)
+            if len(to_enrich) >= max_to_enrich:
+                break
 
         if not to_enrich:
             logger.info("[Email] No prospects need email enrichment")
@@ -283,20 +374,13 @@ Return a JSON list of analyzed prospects."""
         ]
         enriched = await asyncio.gather(*tasks, return_exceptions=True)
 
-        # Build lookup map: name+company → enriched data
-        enrichment_map: Dict[str, Dict] = {}
-        for original, result in zip(to_enrich, enriched):
-            if isinstance(result, Exception):
-                logger.warning(f"[Email] Enrichment failed for {original.get('name')}: {result}")
+        # Merge enrichment back into every record of the entity
+        for original, group, enriched_p in zip(to_enrich, enrich_groups, enriched):
+            if isinstance(enriched_p, Exception):
+                logger.warning(f"[Email] Enrichment failed for {original.get('name')}: {enriched_p}")
                 continue
-            key = f"{original.get('name','')}|{original.get('company','')}".lower()
-            enrichment_map[key] = result
-
-        # Merge enrichment back into prospects list
-        for p in prospects:
-            key = f"{p.get('name','')}|{p.get('company','')}".lower()
-            if key in enrichment_map:
-                enriched_p = enrichment_map[key]
+            for i in group:
+                p = prospects[i]
                 p["email"]             = enriched_p.get("email") or p.get("email")
                 p["email_confidence"]  = enriched_p.get("email_confidence", "unverifiable")
                 p["email_candidates"]  = enriched_p.get("email_candidates", [])
@@ -0,0 +1,235 @@
+"""
+Prospect Pre-Filter
+===================
+Cheap local scoring of raw discovery hits before they reach the LLM, so
+analysis tokens are spent on plausible people rather than job boards,
+listicles and nameless threads.
+
+  URL class   person profiles (linkedin.com/in, GitHub users, Crunchbase
+              people, ...) score up; job boards, company pages and generic
+              content sites score down
+  Person      structured name/role fields from scrapers score up; Reddit
+              threads naming nobody (no author, u/ mention, self-introduction
+              or "Name, CEO" in the title / snippet) score down
+  Titles      the target job titles (full phrase or most of their words)
+              in the hit's role / title / snippet score up
+  Embedding   optional: cosine similarity between the goal and each hit,
+              all computed in one batched embeddings call; it only re-ranks
+
+Hits whose rule score is below PREFILTER_THRESHOLD are dropped and the rest
+are returned best-first by rule score plus the embedding term. If fewer
+than PREFILTER_MIN_KEEP clear the bar, the best PREFILTER_MIN_KEEP are kept
+anyway, so a run never comes back empty just because of the pre-filter.
+"""
+
+import logging
+import math
+import os
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+PREFILTER_THRESHOLD = float(os.getenv("PREFILTER_THRESHOLD", "0.35"))
+PREFILTER_MIN_KEEP = int(os.getenv("PREFILTER_MIN_KEEP", "10"))
+PREFILTER_USE_EMBEDDINGS = os.getenv("PREFILTER_USE_EMBEDDINGS", "true").lower() == "true"
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_WEIGHT = 0.3
+
+BASE_SCORE = 0.4
+
+# (host suffix, path regex or None, score adjustment)
+URL_RULES: List[Tuple[str, Optional[re.Pattern], float]] = [
+    ("linkedin.com", re.compile(r"^/(in|pub)/"), 0.3),
+    ("linkedin.com", re.compile(r"^/jobs"), -0.5),
+    ("linkedin.com", re.compile(r"^/company/"), -0.15),
+    ("github.com", re.compile(r"^/[^/]+/?$"), 0.2),
+    ("crunchbase.com", re.compile(r"^/person/"), 0.25),
+    ("wellfound.com", re.compile(r"^/u/"), 0.2),
+    ("angel.co", re.compile(r"^/u/"), 0.2),
+    ("producthunt.com", re.compile(r"^/@"), 0.2),
+    ("twitter.com", re.compile(r"^/[^/]+/?$"), 0.1),
+    ("x.com", re.compile(r"^/[^/]+/?$"), 0.1),
+]
+JOB_BOARDS = (
+    "indeed.com", "glassdoor.com", "ziprecruiter.com", "monster.com", "simplyhired.com",
+    "careerbuilder.com", "lever.co", "greenhouse.io", "workable.com", "builtin.com",
+    "dice.com", "remoteok.com", "weworkremotely.com",
+)
+CONTENT_SITES = (
+    "wikipedia.org", "youtube.com", "medium.com", "quora.com", "forbes.com",
+    "techcrunch.com", "hubspot.com", "investopedia.com", "pinterest.com",
+)
+JOB_BOARD_PENALTY = -0.5
+CONTENT_PENALTY = -0.25
+
+LISTICLE_RE = re.compile(
+    r"\b(top \d+|\d+ best|best \w+ (tools|software|companies)|how to|guide|what is|jobs? (in|at|for)|salary|salaries)\b",
+    re.IGNORECASE,
+)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# A person named in a Reddit title / snippet: "u/jdoe", "I'm Jane", "Jane Doe, CEO"
+_NAME = r"[A-Z][a-z]+(?: [A-Z][a-z]+)?"
+REDDIT_PERSON_RE = re.compile(
+    r"\bu/[A-Za-z0-9_-]{3,}"
+    rf"|\b(?:I'm|I am|my name is|this is) {_NAME}\b"
+    rf"|\b{_NAME},? (?:the |our |a )?(?:CEO|CTO|COO|CMO|VP|founder|co-founder|cofounder|head of|director)\b"
+)
+REDDIT_NO_AUTHOR = {"", "[deleted]", "automoderator"}
+
+
+def _host_matches(host: str, domain: str) -> bool:
+    return host == domain or host.endswith("." + domain)
+
+
+def _url_score(url: str) -> Tuple[float, str]:
+    parsed = urlparse(url or "")
+    host = (parsed.hostname or "").lower()
+    if not host:
+        return 0.0, ""
+    for domain, path_re, adjustment in URL_RULES:
+        if _host_matches(host, domain) and (path_re is None or path_re.search(parsed.path)):
+            return adjustment, f"url:{domain}"
+    if any(_host_matches(host, d) for d in JOB_BOARDS):
+        return JOB_BOARD_PENALTY, "url:job_board"
+    if any(_host_matches(host, d) for d in CONTENT_SITES):
+        return CONTENT_PENALTY, "url:content"
+    return 0.0, ""
+
+
+def _title_score(text: str, job_titles: List[str]) -> Tuple[float, str]:
+    text_lower = text.lower()
+    words = set(_WORD_RE.findall(text_lower))
+    best, reason = 0.0, ""
+    for title in job_titles:
+        title_lower = title.lower().strip()
+        if not title_lower:
+            continue
+        if re.search(rf"\b{re.escape(title_lower)}\b", text_lower):
+            return 0.3, f"title:{title}"
+        title_words = _WORD_RE.findall(title_lower)
+        if title_words:
+            overlap = sum(w in words for w in title_words) / len(title_words)
+            if overlap >= 0.5 and 0.15 * overlap > best:
+                best, reason = 0.15 * overlap, f"title~{title}"
+    return best, reason
+
+
+def _text(candidate: Dict[str, Any]) -> str:
+    return " ".join(
+        str(candidate.get(k) or "")
+        for k in ("_name", "_role", "_company", "name", "role", "company", "title", "snippet")
+    )
+
+
+def _names_reddit_person(candidate: Dict[str, Any]) -> bool:
+    """Whether a Reddit hit carries an author or names someone in its text."""
+    if (candidate.get("author") or "").strip().lower() not in REDDIT_NO_AUTHOR:
+        return True
+    if re.search(r"reddit\.com/(user|u)/", candidate.get("url") or ""):
+        return True
+    text = f"{candidate.get('title') or ''} {candidate.get('snippet') or ''}"
+    return bool(REDDIT_PERSON_RE.search(text))
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class ProspectPrefilter:
+    """Rule + optional embedding scoring that runs before LLM analysis."""
+
+    def __init__(self, threshold: float = PREFILTER_THRESHOLD, use_embeddings: bool = PREFILTER_USE_EMBEDDINGS):
+        self.threshold = threshold
+        self.use_embeddings = use_embeddings
+        self._client: Optional[AsyncOpenAI] = None
+
+    def score(self, candidate: Dict[str, Any], job_titles: List[str]) -> Tuple[float, List[str]]:
+        """Local score in [0, 1] plus the reasons that moved it."""
+        score, reasons = BASE_SCORE, []
+
+        adjustment, reason = _url_score(candidate.get("url", ""))
+        if reason:
+            score += adjustment
+            reasons.append(reason)
+
+        has_person = bool(candidate.get("_name") or candidate.get("name"))
+        if has_person:
+            score += 0.2
+            reasons.append("named_person")
+        elif "reddit" in (candidate.get("source") or "").lower() and not _names_reddit_person(candidate):
+            score -= 0.25
+            reasons.append("reddit_no_person")
+
+        title = candidate.get("title") or ""
+        if not has_person and LISTICLE_RE.search(title):
+            score -= 0.2
+            reasons.append("listicle")
+
+        adjustment, reason = _title_score(
+            " ".join(str(candidate.get(k) or "") for k in ("_role", "role", "title", "snippet")), job_titles
+        )
+        if reason:
+            score += adjustment
+            reasons.append(reason)
+
+        return max(0.0, min(1.0, score)), reasons
+
+    async def filter(
+        self, candidates: List[Dict[str, Any]], goal: str, job_titles: List[str]
+    ) -> List[Dict[str, Any]]:
+        """Candidates worth sending to the LLM, best first."""
+        if not candidates:
+            return []
+
+        # (candidate, rule score, rank, reasons): the rule score decides what's kept, the rank the order
+        scored = []
+        for candidate in candidates:
+            score, reasons = self.score(candidate, job_titles)
+            scored.append((candidate, score, score, reasons))
+        if self.use_embeddings and goal:
+            similarities = await self._goal_similarities(goal, [_text(c) for c in candidates])
+            if similarities:
+                # Centred on the batch mean: a hit is ranked relative to its peers, never dropped for it
+                mean = sum(similarities) / len(similarities)
+                scored = [
+                    (c, s, s + EMBEDDING_WEIGHT * (sim - mean) * 5, reasons + [f"goal_sim:{sim:.2f}"])
+                    for (c, s, _, reasons), sim in zip(scored, similarities)
+                ]
+
+        scored.sort(key=lambda item: item[2], reverse=True)
+        kept = [item for item in scored if item[1] >= self.threshold]
+        if len(kept) < min(PREFILTER_MIN_KEEP, len(scored)):
+            kept = scored[:PREFILTER_MIN_KEEP]
+        kept_ids = {id(item[0]) for item in kept}
+
+        for candidate, score, rank, reasons in kept:
+            candidate["_prefilter_score"] = round(max(0.0, min(1.0, rank)), 3)
+        logger.info(f"[Prefilter] Kept {len(kept)} of {len(candidates)} candidates (threshold {self.threshold})")
+        for candidate, score, rank, reasons in scored:
+            if id(candidate) not in kept_ids:
+                logger.debug(f"[Prefilter] Dropped {candidate.get('url')} ({score:.2f}: {', '.join(reasons)})")
+        return [candidate for candidate, _, _, _ in kept]
+
+    async def _goal_similarities(self, goal: str, texts: List[str]) -> Optional[List[float]]:
+        """Cosine similarity of each text to the goal, in one embeddings call."""
+        try:
+            if self._client is None:
+                self._client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            response = await self._client.embeddings.create(
+                input=[goal] + [t[:2000] or "-" for t in texts], model=EMBEDDING_MODEL
+            )
+            vectors = [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+            return [_cosine(vectors[0], v) for v in vectors[1:]]
+        except Exception as e:
+            logger.warning(f"[Prefilter] Embedding similarity skipped: {e}")
+            return None
+
+
+prospect_prefilter = ProspectPrefilter()
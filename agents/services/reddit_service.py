@@ -1,66 +1,173 @@
-import os
+"""
+Reddit Search Service
+=====================
+Async Reddit search over the OAuth JSON API, without PRAW or executor
+threads.
+
+  Auth      application-only OAuth (client_credentials); the bearer token
+            is cached until shortly before it expires and refreshed once
+            on a 401
+  HTTP      the shared pooled http_fetcher client
+  Fan-out   search_posts() queries several subreddits and search_many()
+            several queries concurrently, paced by one token bucket
+            (REDDIT_QPS, inside Reddit's 100 requests/minute per client)
+  Cache     results per (query, subreddit, limit) for REDDIT_CACHE_TTL
+
+Reddit's listing API has no field selection, so only the fields we return
+are read from each post, and sr_detail expansion is left off.
+"""
+
+import asyncio
 import logging
-import praw
-from typing import List, Dict, Any
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from core.rate_limiter import AsyncTokenBucket
+from services.http_fetcher import HttpFetcher, http_fetcher
 
 logger = logging.getLogger(__name__)
 
+TOKEN_URL = "https://www.reddit.com/api/v1/access_token"
+SEARCH_URL = "https://oauth.reddit.com/r/{subreddit}/search"
+
+REDDIT_QPS = float(os.getenv("REDDIT_QPS", "1.5"))
+REDDIT_BURST = int(os.getenv("REDDIT_BURST", "10"))
+REDDIT_CACHE_TTL = float(os.getenv("REDDIT_CACHE_TTL", "900"))
+# Refresh the token this long before Reddit expires it
+TOKEN_EXPIRY_MARGIN = 60
+SNIPPET_CHARS = 300
+
+
 class RedditService:
-    def __init__(self):
+    def __init__(self, fetcher: Optional[HttpFetcher] = None):
         self.client_id = os.getenv("REDDIT_CLIENT_ID")
         self.client_secret = os.getenv("REDDIT_CLIENT_SECRET")
         self.user_agent = os.getenv("REDDIT_USER_AGENT", "python:ai-sdr-agent:v1.0 (by /u/your_username)")
-        
-        if not self.client_id or not self.client_secret:
+        self.fetcher = fetcher or http_fetcher
+        self.enabled = bool(self.client_id and self.client_secret)
+
+        if not self.enabled:
             logger.warning("Reddit API credentials not found. Reddit search will be disabled.")
-            self.reddit = None
-        else:
-            try:
-                self.reddit = praw.Reddit(
-                    client_id=self.client_id,
-                    client_secret=self.client_secret,
-                    user_agent=self.user_agent
-                )
-                logger.info("Reddit API initialized successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize Reddit API: {str(e)}")
-                self.reddit = None
-
-    async def search_posts(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+
+        self._token: Optional[str] = None
+        self._token_expires_at = 0.0
+        self._token_lock = asyncio.Lock()
+        self._bucket = AsyncTokenBucket(REDDIT_QPS, REDDIT_BURST)
+        # (query, subreddit, limit) → (expires_at, results)
+        self._cache: Dict[Tuple[str, str, int], Tuple[float, List[Dict[str, Any]]]] = {}
+
+    async def search_posts(
+        self, query: str, limit: int = 10, subreddits: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Search for Reddit posts.
+        Search for Reddit posts in `subreddits` (default: all), queried in
+        parallel. One subreddit keeps Reddit's relevance order; several are
+        merged into the top `limit` posts by score.
         """
-        if not self.reddit:
+        if not self.enabled:
             logger.warning("Reddit API not initialized. Skipping Reddit search.")
             return []
 
-        try:
-            # PRAW search is synchronous, so we should run it in an executor if strict async is needed,
-            # but for simplicity in this MVP we'll run it directly or wrap if it blocks too long.
-            # Convert async call pattern if needed, but PRAW is sync.
-            import asyncio
-            loop = asyncio.get_event_loop()
-            
-            def _search():
-                subreddit = self.reddit.subreddit("all")
-                results = []
-                # search() returns a generator
-                for submission in subreddit.search(query, limit=limit):
-                    results.append({
-                        "title": submission.title,
-                        "url": submission.url,
-                        "snippet": submission.selftext[:300] if submission.selftext else submission.title,
-                        "source": "Reddit",
-                        "author": str(submission.author),
-                        "subreddit": str(submission.subreddit),
-                        "score": submission.score,
-                        "created_utc": submission.created_utc
-                    })
-                return results
-
-            results = await loop.run_in_executor(None, _search)
-            return results
+        subreddits = subreddits or ["all"]
+        batches = await asyncio.gather(*(self._search(query, sub, limit) for sub in subreddits))
+        if len(batches) == 1:
+            return batches[0][:limit]
+        seen, merged = set(), []
+        for post in sorted((p for batch in batches for p in batch), key=lambda p: p["score"], reverse=True):
+            if post["id"] not in seen:
+                seen.add(post["id"])
+                merged.append(post)
+        return merged[:limit]
+
+    async def search_many(
+        self, queries: List[str], limit: int = 10, subreddits: Optional[List[str]] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """search_posts for several queries at once → {query: posts}."""
+        results = await asyncio.gather(*(self.search_posts(q, limit, subreddits) for q in queries))
+        return dict(zip(queries, results))
 
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _search(self, query: str, subreddit: str, limit: int) -> List[Dict[str, Any]]:
+        cache_key = (" ".join(query.lower().split()), subreddit.lower(), limit)
+        cached = self._cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return [dict(p) for p in cached[1]]
+
+        try:
+            listing = await self._get(
+                SEARCH_URL.format(subreddit=subreddit),
+                {
+                    "q": query,
+                    "limit": min(limit, 100),
+                    "sort": "relevance",
+                    "restrict_sr": "true" if subreddit != "all" else "false",
+                    "type": "link",
+                    "raw_json": 1,
+                },
+            )
         except Exception as e:
-            logger.error(f"Error searching Reddit for '{query}': {str(e)}")
+            logger.error(f"Error searching Reddit for '{query}' in r/{subreddit}: {str(e)}")
             return []
+
+        results = [self._parse(child["data"]) for child in listing.get("data", {}).get("children", [])]
+        self._cache[cache_key] = (time.monotonic() + REDDIT_CACHE_TTL, results)
+        self._prune_cache()
+        return [dict(p) for p in results]
+
+    async def _get(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        for attempt in range(2):
+            await self._bucket.acquire()
+            headers = {"Authorization": f"Bearer {await self._access_token()}", "User-Agent": self.user_agent}
+            try:
+                return await self.fetcher.get_json(url, params=params, headers=headers)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 401 and attempt == 0:
+                    self._token = None      # revoked or expired early
+                    continue
+                if e.response.status_code == 429:
+                    self._bucket.drain()
+                raise
+
+    async def _access_token(self) -> str:
+        if self._token and time.monotonic() < self._token_expires_at:
+            return self._token
+        async with self._token_lock:
+            if self._token and time.monotonic() < self._token_expires_at:
+                return self._token
+            response = await self.fetcher.client.post(
+                TOKEN_URL,
+                data={"grant_type": "client_credentials"},
+                auth=(self.client_id, self.client_secret),
+                headers={"User-Agent": self.user_agent},
+            )
+            response.raise_for_status()
+            payload = response.json()
+            self._token = payload["access_token"]
+            self._token_expires_at = time.monotonic() + payload.get("expires_in", 3600) - TOKEN_EXPIRY_MARGIN
+            return self._token
+
+    @staticmethod
+    def _parse(post: Dict[str, Any]) -> Dict[str, Any]:
+        selftext = post.get("selftext") or ""
+        return {
+            "id": post.get("id"),
+            "title": post.get("title"),
+            "url": post.get("url"),
+            "snippet": selftext[:SNIPPET_CHARS] if selftext else post.get("title"),
+            "source": "Reddit",
+            "author": post.get("author"),
+            "subreddit": post.get("subreddit"),
+            "score": post.get("score", 0),
+            "created_utc": post.get("created_utc"),
+        }
+
+    def _prune_cache(self):
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _) in self._cache.items() if expires_at <= now]:
+            del self._cache[key]
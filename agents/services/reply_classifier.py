@@ -0,0 +1,319 @@
+"""
+Local Reply Pre-Classifier
+==========================
+Fast path in front of the LLM for trivially classifiable email replies.
+Two stages, both pure Python:
+  1. Rules   — regexes for auto-replies, unsubscribes, flat rejections and
+               meeting requests/confirmations
+  2. Model   — optional bag-of-words softmax regression over joint
+               "Sentiment|Intent" labels, trained offline from labelled
+               past replies (see utils/train_reply_classifier.py)
+
+A reply is answered locally only when the best stage is at least
+REPLY_FASTPATH_THRESHOLD confident; everything else goes to the LLM.
+
+Metrics (hit rate, and agreement with LLM labels bucketed by local
+confidence) are kept per process so the threshold can be tuned. A small
+REPLY_FASTPATH_AUDIT_RATE fraction of fast-path hits is also sent to the
+LLM purely to keep measuring agreement on the cases we skip.
+"""
+
+import json
+import logging
+import math
+import os
+import random
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(__file__), "reply_classifier_model.json")
+
+FASTPATH_THRESHOLD = float(os.getenv("REPLY_FASTPATH_THRESHOLD", "0.85"))
+AUDIT_RATE = float(os.getenv("REPLY_FASTPATH_AUDIT_RATE", "0.05"))
+
+# Only the fresh part of a reply is classified; long bodies are mostly signatures
+MAX_CHARS = 1500
+
+
+@dataclass
+class LocalPrediction:
+    sentiment: str
+    intent: str
+    confidence: float
+    source: str   # "rule:<name>" | "model"
+
+
+# ---------------------------------------------------------------------------
+# Stage 1: rules
+# ---------------------------------------------------------------------------
+
+# name, patterns, (sentiment, intent), confidence, penalize_hedging
+RULES = [
+    ("auto_reply", [
+        r"\bout of (the )?office\b",
+        r"\bauto(matic)?[- ]?(reply|response)\b",
+        r"\b(currently )?on (annual |parental |maternity |paternity )?leave\b",
+        r"\blimited access to (my )?e-?mail\b",
+        r"\b(i will|i'll) be back (in the office )?on\b",
+    ], ("Neutral", "No Action"), 0.96, False),
+    ("unsubscribe", [
+        r"\bunsubscribe\b",
+        r"\b(remove|take) me (off|from)\b",
+        r"\bstop (emailing|contacting|messaging) me\b",
+        r"\bdo not (contact|email) me\b",
+    ], ("Negative", "Not Interested"), 0.97, False),
+    ("not_interested", [
+        r"\bnot interested\b",
+        # Only a reply that opens with it: "no thanks needed, let's meet" is not a rejection
+        r"^\s*no,? thanks?\b(?!\s+(needed|necessary|required))",
+        r"\bnot a (good )?fit\b",
+        r"\b(decided|chosen|chose) to go with (another|a different)\b",
+        r"\bno longer (interested|looking)\b",
+    ], ("Negative", "Not Interested"), 0.92, True),
+    ("meeting_confirmed", [
+        r"\b(i'?ve|i have) (booked|scheduled|accepted)\b",
+        r"\bsee you (then|on|next)\b",
+        r"\b(invite|invitation) accepted\b",
+    ], ("Positive", "Interested"), 0.9, True),
+    ("meeting_request", [
+        r"\blet'?s (set up|schedule|book|find) (a )?(call|meeting|time|demo)\b",
+        r"\bcan we (schedule|set up|book) (a )?([\w-]+ )?(call|meeting|demo)\b",
+        r"\b(happy|glad|keen|love) to (chat|talk|meet|connect|hop on a call)\b",
+        r"\bsend (me )?(your|a) calendar\b",
+    ], ("Positive", "Follow-Up Required"), 0.9, True),
+]
+
+_COMPILED_RULES = [
+    (name, [re.compile(p, re.IGNORECASE) for p in patterns], labels, conf, hedge)
+    for name, patterns, labels, conf, hedge in RULES
+]
+
+# Replies that hedge ("not interested now, but...") need the LLM
+_HEDGE_RE = re.compile(r"\b(but|however|although|unless|maybe|perhaps)\b", re.IGNORECASE)
+HEDGE_PENALTY = 0.3
+
+_QUOTE_HEADER_RE = re.compile(r"^\s*(on .+ wrote:|-+ ?original message ?-+|from: .+)\s*$", re.IGNORECASE)
+
+
+def strip_quoted(text: str) -> str:
+    """Drop quoted history so our own outreach wording can't trigger rules."""
+    fresh = []
+    for line in (text or "").splitlines():
+        if _QUOTE_HEADER_RE.match(line):
+            break
+        if line.lstrip().startswith(">"):
+            continue
+        fresh.append(line)
+    return "\n".join(fresh).strip()[:MAX_CHARS]
+
+
+def apply_rules(text: str) -> Optional[LocalPrediction]:
+    best = None
+    hedged = bool(_HEDGE_RE.search(text))
+    matched = [
+        (name, labels, conf, penalize)
+        for name, patterns, labels, conf, penalize in _COMPILED_RULES
+        if any(p.search(text) for p in patterns)
+    ]
+    # Positive and negative cues in one reply ("not a fit now, let's set up a call later")
+    conflicting = {labels[0] for _, labels, _, _ in matched} >= {"Positive", "Negative"}
+    for name, (sentiment, intent), conf, penalize in matched:
+        score = conf - (HEDGE_PENALTY if penalize and (hedged or conflicting) else 0.0)
+        if not best or score > best.confidence:
+            best = LocalPrediction(sentiment, intent, score, f"rule:{name}")
+    return best
+
+
+# ---------------------------------------------------------------------------
+# Stage 2: linear model
+# ---------------------------------------------------------------------------
+
+_TOKEN_RE = re.compile(r"[a-z][a-z']+")
+
+
+def extract_features(text: str) -> List[str]:
+    tokens = _TOKEN_RE.findall(text.lower())
+    return tokens + [f"{a}_{b}" for a, b in zip(tokens, tokens[1:])]
+
+
+class LinearReplyModel:
+    """Multinomial logistic regression over unigram + bigram presence features."""
+
+    def __init__(self, labels: List[str], weights: Dict[str, Dict[str, float]], bias: Dict[str, float]):
+        self.labels = labels
+        self.weights = weights
+        self.bias = bias
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        feats = set(extract_features(text))
+        scores = {
+            label: self.bias.get(label, 0.0) + sum(self.weights[label].get(f, 0.0) for f in feats)
+            for label in self.labels
+        }
+        top = max(scores.values())
+        exp = {label: math.exp(s - top) for label, s in scores.items()}
+        total = sum(exp.values())
+        return {label: v / total for label, v in exp.items()}
+
+    def predict(self, text: str) -> Optional[LocalPrediction]:
+        probs = self.predict_proba(text)
+        label, prob = max(probs.items(), key=lambda kv: kv[1])
+        sentiment, intent = label.split("|", 1)
+        return LocalPrediction(sentiment, intent, prob, "model")
+
+    @classmethod
+    def train(
+        cls,
+        examples: List[Tuple[str, str, str]],
+        epochs: int = 30,
+        learning_rate: float = 0.3,
+        l2: float = 1e-4,
+        min_count: int = 2,
+    ) -> "LinearReplyModel":
+        """Fit on (text, sentiment, intent) examples with plain SGD."""
+        data = [(set(extract_features(strip_quoted(t))), f"{s}|{i}") for t, s, i in examples]
+        labels = sorted({y for _, y in data})
+
+        counts: Dict[str, int] = {}
+        for feats, _ in data:
+            for f in feats:
+                counts[f] = counts.get(f, 0) + 1
+        vocab = {f for f, c in counts.items() if c >= min_count}
+
+        model = cls(labels, {label: {} for label in labels}, {label: 0.0 for label in labels})
+        rng = random.Random(0)
+        for _ in range(epochs):
+            rng.shuffle(data)
+            for feats, y in data:
+                feats = feats & vocab
+                scores = {
+                    label: model.bias[label] + sum(model.weights[label].get(f, 0.0) for f in feats)
+                    for label in labels
+                }
+                top = max(scores.values())
+                exp = {label: math.exp(s - top) for label, s in scores.items()}
+                total = sum(exp.values())
+                for label in labels:
+                    grad = exp[label] / total - (1.0 if label == y else 0.0)
+                    model.bias[label] -= learning_rate * grad
+                    w = model.weights[label]
+                    for f in feats:
+                        w[f] = w.get(f, 0.0) * (1 - learning_rate * l2) - learning_rate * grad
+
+        # Drop near-zero weights to keep the shipped file small
+        for label in labels:
+            model.weights[label] = {f: round(v, 4) for f, v in model.weights[label].items() if abs(v) > 1e-3}
+        return model
+
+    def to_dict(self) -> Dict:
+        return {"labels": self.labels, "weights": self.weights, "bias": self.bias}
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["LinearReplyModel"]:
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            return cls(data["labels"], data["weights"], data["bias"])
+        except Exception as e:
+            logger.error(f"Failed to load reply classifier model from {path}: {e}")
+            return None
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+class ClassifierMetrics:
+    """Process-wide counters for tuning the fast-path threshold."""
+
+    BUCKETS = 10
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.total = 0
+        self.fast_path = 0
+        self.escalated = 0
+        self.by_source: Dict[str, int] = {}
+        # Per confidence decile: [compared, agreed]
+        self.agreement = [[0, 0] for _ in range(self.BUCKETS)]
+
+    def record_fast_path(self, prediction: LocalPrediction):
+        self.total += 1
+        self.fast_path += 1
+        self.by_source[prediction.source] = self.by_source.get(prediction.source, 0) + 1
+
+    def record_escalation(self):
+        self.total += 1
+        self.escalated += 1
+
+    def record_agreement(self, prediction: LocalPrediction, llm_labels: Tuple[str, str]):
+        bucket = min(self.BUCKETS - 1, int(prediction.confidence * self.BUCKETS))
+        self.agreement[bucket][0] += 1
+        if (prediction.sentiment, prediction.intent) == tuple(llm_labels):
+            self.agreement[bucket][1] += 1
+
+    def snapshot(self) -> Dict:
+        compared = sum(c for c, _ in self.agreement)
+        agreed = sum(a for _, a in self.agreement)
+        return {
+            "threshold": FASTPATH_THRESHOLD,
+            "audit_rate": AUDIT_RATE,
+            "total": self.total,
+            "fast_path": self.fast_path,
+            "escalated": self.escalated,
+            "hit_rate": self.fast_path / self.total if self.total else 0.0,
+            "by_source": dict(self.by_source),
+            "llm_agreement": agreed / compared if compared else None,
+            "llm_agreement_by_confidence": [
+                {
+                    "confidence": f"{i / self.BUCKETS:.1f}-{(i + 1) / self.BUCKETS:.1f}",
+                    "compared": c,
+                    "agreement": a / c if c else None,
+                }
+                for i, (c, a) in enumerate(self.agreement)
+            ],
+        }
+
+
+# ---------------------------------------------------------------------------
+# Public entry point
+# ---------------------------------------------------------------------------
+
+class ReplyPreClassifier:
+    def __init__(self, model_path: Optional[str] = None, threshold: float = FASTPATH_THRESHOLD):
+        self.threshold = threshold
+        self.model = LinearReplyModel.load(model_path or os.getenv("REPLY_CLASSIFIER_MODEL", DEFAULT_MODEL_PATH))
+        self.metrics = ClassifierMetrics()
+        if self.model:
+            logger.info(f"Loaded reply classifier model with labels {self.model.labels}")
+
+    def predict(self, text: str) -> Optional[LocalPrediction]:
+        """Best local guess, regardless of threshold."""
+        fresh = strip_quoted(text)
+        if not fresh:
+            return None
+        candidates = [apply_rules(fresh)]
+        if self.model:
+            candidates.append(self.model.predict(fresh))
+        candidates = [c for c in candidates if c]
+        return max(candidates, key=lambda c: c.confidence) if candidates else None
+
+    def is_confident(self, prediction: Optional[LocalPrediction]) -> bool:
+        return bool(prediction) and prediction.confidence >= self.threshold
+
+    def should_audit(self) -> bool:
+        return random.random() < AUDIT_RATE
+
+
+pre_classifier = ReplyPreClassifier()
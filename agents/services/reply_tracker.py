@@ -1,7 +1,11 @@
 import os
+import json
+import asyncio
 import logging
+from typing import List, Optional, Tuple
 from dotenv import load_dotenv
 from services.llm_service import LLMService
+from services.reply_classifier import pre_classifier
 from langchain_core.messages import SystemMessage, HumanMessage
 
 
@@ -20,7 +24,41 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+VALID_SENTIMENTS = ['Positive', 'Neutral', 'Negative']
+VALID_INTENTS = ['Interested', 'Need More Info', 'Follow-Up Required', 'Not Interested', 'No Action']
+
+# Replies per structured LLM call, and how many of those calls run at once
+BATCH_SIZE = 20
+MAX_CONCURRENT_LLM_CALLS = 4
+
+def _validate_labels(sentiment, intent) -> Tuple[str, str]:
+    """Clamp LLM output to the known label sets"""
+    if sentiment not in VALID_SENTIMENTS:
+        sentiment = 'Neutral'  # fallback
+    if intent not in VALID_INTENTS:
+        intent = 'Need More Info'  # fallback
+    return sentiment, intent
+
 async def analyze_sentiment(text):
+    """Analyze sentiment & intent of an email response, using the local fast path when it is confident"""
+    local = pre_classifier.predict(text)
+    audit = False
+    if pre_classifier.is_confident(local):
+        pre_classifier.metrics.record_fast_path(local)
+        audit = pre_classifier.should_audit()
+        if not audit:
+            return local.sentiment, local.intent
+    else:
+        pre_classifier.metrics.record_escalation()
+
+    labels = await _analyze_with_llm(text)
+    if labels and local:
+        pre_classifier.metrics.record_agreement(local, labels)
+    if audit:
+        return local.sentiment, local.intent
+    return labels or ('Neutral', 'Need More Info')  # safe fallback
+
+async def _analyze_with_llm(text) -> Optional[Tuple[str, str]]:
     """Use AI to analyze sentiment & intent of email responses for Atlan's data catalog/governance solutions"""
     try:
         logger.info("Starting sentiment analysis for text")
@@ -41,7 +79,9 @@ async def analyze_sentiment(text):
             
             Format your response exactly as:
             Sentiment: [Positive/Neutral/Negative]
-            Intent: [Interested/Need More Info/Follow-Up Required/Not Interested]"""),
+            Intent: [Interested/Need More Info/Follow-Up Required/Not Interested/No Action]
+
+            Use No Action for automatic replies such as out-of-office messages."""),
             
             HumanMessage(content=f"""Analyze this email response to Atlan's outreach: '{text}'
             
@@ -67,26 +107,99 @@ async def analyze_sentiment(text):
             if not sentiment or not intent:
                 raise ValueError("Missing sentiment or intent in response")
                 
-            # Validate sentiment
-            valid_sentiments = ['Positive', 'Neutral', 'Negative']
-            if sentiment not in valid_sentiments:
-                sentiment = 'Neutral'  # fallback
-                
-            # Validate intent
-            valid_intents = ['Interested', 'Need More Info', 'Follow-Up Required', 'Not Interested']
-            if intent not in valid_intents:
-                intent = 'Need More Info'  # fallback
-                
+            sentiment, intent = _validate_labels(sentiment, intent)
+
             logger.info(f"Successfully extracted sentiment: {sentiment} and intent: {intent}")
             return sentiment, intent
             
         except Exception as e:
             logger.error(f"Error parsing AI response: {str(e)}")
-            return 'Neutral', 'Need More Info'  # safe fallback
+            return None
 
     except Exception as e:
         logger.error(f"Error in sentiment analysis: {str(e)}")
-        return 'Neutral', 'Need More Info'  # safe fallback
+        return None
+
+async def _classify_chunk(items: List[Tuple[int, str]]) -> dict:
+    """Classify (index, text) replies in one structured call. Returns {index: (sentiment, intent)}"""
+    payload = [{"id": idx, "text": text[:2000]} for idx, text in items]
+    system_prompt = f"""You analyze email responses specifically for Atlan, a modern data catalog and governance platform.
+    For EACH reply, classify:
+    - sentiment: one of {VALID_SENTIMENTS}
+    - intent: one of {VALID_INTENTS} (No Action for automatic replies such as out-of-office)
+    Return one result per input id."""
+    user_prompt = f"Replies to Atlan's outreach (JSON list of id/text):\n{json.dumps(payload, separators=(',', ':'))}"
+    json_structure = {"results": [{"id": 0, "sentiment": "Positive", "intent": "Interested"}]}
+
+    response = await AI_MODEL.get_json_response(system_prompt, user_prompt, json_structure)
+    wanted = {idx for idx, _ in items}
+    labels = {}
+    for row in response.get("results", []) if isinstance(response, dict) else []:
+        try:
+            idx = int(row.get("id"))
+        except (TypeError, ValueError):
+            continue
+        if idx in wanted:
+            labels[idx] = _validate_labels(row.get("sentiment"), row.get("intent"))
+    return labels
+
+async def analyze_sentiments_batch(texts: List[str]) -> List[Tuple[str, str]]:
+    """
+    Classify many replies at once. Confident local predictions are answered
+    without the LLM; the rest are grouped BATCH_SIZE per LLM call, chunks run
+    concurrently, and any reply the model skipped falls back to a single
+    call. Results are returned in input order.
+    """
+    if not texts:
+        return []
+
+    predictions = [pre_classifier.predict(text) for text in texts]
+    labels = {}
+    to_llm = []
+    for i, prediction in enumerate(predictions):
+        if pre_classifier.is_confident(prediction):
+            pre_classifier.metrics.record_fast_path(prediction)
+            labels[i] = (prediction.sentiment, prediction.intent)
+            if pre_classifier.should_audit():
+                to_llm.append(i)  # sent only to measure agreement
+        else:
+            pre_classifier.metrics.record_escalation()
+            to_llm.append(i)
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM_CALLS)
+
+    async def _run_chunk(indices):
+        async with semaphore:
+            try:
+                return await _classify_chunk([(i, texts[i]) for i in indices])
+            except Exception as e:
+                logger.error(f"Batch sentiment analysis failed for {len(indices)} replies: {str(e)}")
+                return {}
+
+    chunks = [to_llm[o:o + BATCH_SIZE] for o in range(0, len(to_llm), BATCH_SIZE)]
+    llm_labels = {}
+    for chunk_labels in await asyncio.gather(*[_run_chunk(c) for c in chunks]):
+        llm_labels.update(chunk_labels)
+
+    missing = [i for i in to_llm if i not in llm_labels and i not in labels]
+    if missing:
+        logger.info(f"Falling back to single-reply analysis for {len(missing)} replies")
+
+        async def _run_single(i):
+            async with semaphore:
+                result = await _analyze_with_llm(texts[i])
+                if result:
+                    llm_labels[i] = result
+
+        await asyncio.gather(*[_run_single(i) for i in missing])
+
+    for i, result in llm_labels.items():
+        if predictions[i]:
+            pre_classifier.metrics.record_agreement(predictions[i], result)
+        labels.setdefault(i, result)
+
+    logger.info(f"Batch-analyzed {len(texts)} replies ({len(texts) - len(to_llm)} via local fast path)")
+    return [labels.get(i, ('Neutral', 'Need More Info')) for i in range(len(texts))]
 
 async def generate_followup_email(recipient, subject, reply_text):
     """AI generates a follow-up email for interested prospects"""
@@ -123,3 +236,38 @@ async def generate_followup_email(recipient, subject, reply_text):
     except Exception as e:
         logger.error(f"Error generating follow-up email: {str(e)}")
         raise
+
+async def generate_followup_emails(
+    followups: List[Tuple[str, str, str]], message_ids: Optional[List[str]] = None
+) -> List[Optional[dict]]:
+    """
+    Generate follow-ups for many (recipient, subject, reply_text) tuples
+    concurrently. Results keep input order; failed generations are logged
+    (with the matching entry of `message_ids`, when given) and returned as None.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM_CALLS)
+    message_ids = message_ids or [None] * len(followups)
+
+    async def _run(message_id, recipient, subject, reply_text):
+        async with semaphore:
+            try:
+                return await generate_followup_email(recipient, subject, reply_text)
+            except Exception as e:
+                logger.error(f"Follow-up generation failed for message {message_id} ({recipient}): {str(e)}")
+                return None
+
+    return await asyncio.gather(*[_run(mid, *r) for mid, r in zip(message_ids, followups)])
+
+async def attach_followups(analyzed_emails: List[dict]) -> List[dict]:
+    """Add a suggested_followup to every analyzed email whose intent needs one"""
+    needs_followup = [e for e in analyzed_emails if e["analysis"]["intent"] == "Follow-Up Required"]
+    follow_ups = await generate_followup_emails(
+        [(e["email"]["from"], e["email"]["subject"], e["email"]["body"]) for e in needs_followup],
+        message_ids=[
+            f"{e['email'].get('id', '?')} (thread {e['email'].get('threadId', '?')})" for e in needs_followup
+        ],
+    )
+    for analyzed_email, follow_up in zip(needs_followup, follow_ups):
+        if follow_up:
+            analyzed_email["suggested_followup"] = follow_up
+    return analyzed_emails
@@ -0,0 +1,147 @@
+"""
+Scraper Routing Cache
+=====================
+Memoizes ScraperRouterService routing decisions so repeat discovery runs
+don't wait on an LLM call to pick sources.
+
+  Exact    sha256 of the normalized inputs (goal, company description, job
+           titles, keyword hint, max_scrapers)
+  Similar  cosine similarity between text-embedding-3-small embeddings of
+           the same normalized text; the best stored decision at or above
+           ROUTING_SIMILARITY_THRESHOLD lends its scraper selection (the
+           caller rebuilds params for its own goal)
+  Miss     the caller asks the LLM and put()s the decision under both keys
+
+Entries live for ROUTING_CACHE_TTL and at most ROUTING_CACHE_MAX_ENTRIES
+are kept (LRU). Embedding failures only disable the similarity step.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from openai import AsyncOpenAI
+
+logger = logging.getLogger(__name__)
+
+ROUTING_CACHE_TTL = float(os.getenv("ROUTING_CACHE_TTL", str(24 * 3600)))
+ROUTING_CACHE_MAX_ENTRIES = int(os.getenv("ROUTING_CACHE_MAX_ENTRIES", "256"))
+SIMILARITY_THRESHOLD = float(os.getenv("ROUTING_SIMILARITY_THRESHOLD", "0.95"))
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+def routing_text(
+    goal: str, company_description: str, job_titles: List[str], keyword_hint: str, max_scrapers: int
+) -> str:
+    """Canonical text of a routing request: case and whitespace don't matter."""
+    parts = [
+        f"goal: {goal}",
+        f"company: {company_description}",
+        f"titles: {', '.join(sorted(t.strip() for t in job_titles if t.strip()))}",
+        f"hint: {keyword_hint}",
+        f"scrapers: {max_scrapers}",
+    ]
+    return " ".join("\n".join(parts).lower().split())
+
+
+def _unit(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+class RoutingCache:
+    """Exact + embedding-similarity cache of routing decisions."""
+
+    def __init__(
+        self,
+        ttl: float = ROUTING_CACHE_TTL,
+        max_entries: int = ROUTING_CACHE_MAX_ENTRIES,
+        threshold: float = SIMILARITY_THRESHOLD,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.threshold = threshold
+        # hash → {"decision", "embedding", "stored_at"}
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._client: Optional[AsyncOpenAI] = None
+        self.stats = {"rules": 0, "exact": 0, "similar": 0, "llm": 0}
+
+    async def get(self, text: str) -> Tuple[Optional[Dict[str, Any]], Optional[List[float]], str]:
+        """
+        Returns (decision or None, embedding of `text` or None, "exact" |
+        "similar" | "miss"). The embedding is handed back so put() doesn't
+        compute it a second time. A "similar" decision belongs to another
+        request: only its selected_scrapers apply to this one.
+        """
+        self._expire()
+        key = self._hash(text)
+        entry = self._entries.get(key)
+        if entry:
+            self._entries.move_to_end(key)
+            return self._copy(entry["decision"]), entry["embedding"], "exact"
+
+        embedding = await self._embed(text)
+        if embedding is None:
+            return None, None, "miss"
+
+        best_key, best_score = None, 0.0
+        for other_key, other in self._entries.items():
+            if other["embedding"] is None:
+                continue
+            score = sum(a * b for a, b in zip(embedding, other["embedding"]))
+            if score > best_score:
+                best_key, best_score = other_key, score
+        if best_key and best_score >= self.threshold:
+            self._entries.move_to_end(best_key)
+            logger.info(f"[RoutingCache] Reusing routing of a similar request (cosine {best_score:.3f})")
+            return self._copy(self._entries[best_key]["decision"]), embedding, "similar"
+        return None, embedding, "miss"
+
+    def put(self, text: str, decision: Dict[str, Any], embedding: Optional[List[float]] = None):
+        key = self._hash(text)
+        self._entries[key] = {
+            "decision": self._copy(decision),
+            "embedding": embedding,
+            "stored_at": time.monotonic(),
+        }
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.stats, "entries": len(self._entries)}
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    @staticmethod
+    def _copy(decision: Dict[str, Any]) -> Dict[str, Any]:
+        return json.loads(json.dumps(decision))
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.ttl
+        for key in [k for k, e in self._entries.items() if e["stored_at"] < cutoff]:
+            del self._entries[key]
+
+    async def _embed(self, text: str) -> Optional[List[float]]:
+        try:
+            if self._client is None:
+                self._client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            response = await self._client.embeddings.create(input=text, model=EMBEDDING_MODEL)
+            return _unit(response.data[0].embedding)
+        except Exception as e:
+            logger.warning(f"[RoutingCache] Embedding failed, similarity lookup skipped: {e}")
+            return None
+
+
+routing_cache = RoutingCache()
@@ -0,0 +1,143 @@
+"""
+Scraper Result Cache
+====================
+In-process cache of normalized scraper results so repeat discovery runs
+don't re-scrape the same listing minutes later.
+
+  Key:        (source, normalized kwargs): strings are lower-cased and
+              whitespace-collapsed, empty values dropped, keys sorted
+  Fresh:      age < SOURCE_TTLS[source] → returned as-is
+  Stale:      age < STALE_FACTOR × TTL → returned immediately while one
+              background task re-scrapes (stale-while-revalidate)
+  Expired:    older than that, or never seen → the caller awaits the scrape
+  In flight:  concurrent requests for the same key share one scrape
+              (single-flight), whether it is a miss or a revalidation
+
+Empty results are kept for EMPTY_TTL only, so a blocked or failed scrape
+is retried soon instead of being pinned for a whole TTL.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCRAPE_CACHE_MAX_ENTRIES = int(os.getenv("SCRAPE_CACHE_MAX_ENTRIES", "512"))
+STALE_FACTOR = float(os.getenv("SCRAPE_CACHE_STALE_FACTOR", "4"))
+EMPTY_TTL = 60.0
+
+HOUR = 3600.0
+DAY = 24 * HOUR
+
+# How often each source's listings meaningfully change
+SOURCE_TTLS: Dict[str, float] = {
+    "product_hunt": 6 * HOUR,     # new launches daily
+    "g2":           DAY,
+    "hacker_news":  6 * HOUR,     # monthly thread, postings keep arriving
+    "github":       DAY,
+    "crunchbase":   DAY,
+    "wellfound":    12 * HOUR,
+    "yc_directory": 7 * DAY,      # batches change a few times a year
+    "angellist":    12 * HOUR,
+}
+DEFAULT_TTL = 6 * HOUR
+
+Fetch = Callable[[], Awaitable[List[Dict[str, Any]]]]
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def cache_key(source: str, kwargs: Dict[str, Any]) -> str:
+    normalized = {k: _normalize(v) for k, v in kwargs.items() if v not in (None, "", [], ())}
+    return f"{source}:{json.dumps(normalized, sort_keys=True, default=str)}"
+
+
+class ScrapeResultCache:
+    """Per-source TTL cache with stale-while-revalidate and single-flight."""
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_entries: int = SCRAPE_CACHE_MAX_ENTRIES):
+        self.ttls = ttls or SOURCE_TTLS
+        self.max_entries = max_entries
+        # key → (results, fetched_at); kept in LRU order
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.stats = {"fresh": 0, "stale": 0, "miss": 0, "coalesced": 0}
+
+    async def get_or_fetch(self, source: str, kwargs: Dict[str, Any], fetch: Fetch) -> List[Dict[str, Any]]:
+        key = cache_key(source, kwargs)
+        entry = self._entries.get(key)
+        if entry:
+            results, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            ttl = self.ttls.get(source, DEFAULT_TTL) if results else EMPTY_TTL
+            if age < ttl:
+                self.stats["fresh"] += 1
+                self._entries.move_to_end(key)
+                return self._copy(results)
+            if results and age < ttl * STALE_FACTOR:
+                self.stats["stale"] += 1
+                self._entries.move_to_end(key)
+                if key not in self._inflight:
+                    logger.info(f"[ScrapeCache] {source} served stale ({age:.0f}s old), revalidating")
+                    self._start(key, source, fetch)
+                return self._copy(results)
+
+        if key in self._inflight:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["miss"] += 1
+            self._start(key, source, fetch)
+        return self._copy(await asyncio.shield(self._inflight[key]))
+
+    def invalidate(self, source: Optional[str] = None):
+        """Drop every entry, or only those of one source."""
+        if source is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if k.startswith(f"{source}:")]:
+            del self._entries[key]
+
+    def invalidate_key(self, source: str, kwargs: Dict[str, Any]):
+        self._entries.pop(cache_key(source, kwargs), None)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**self.stats, "entries": len(self._entries), "in_flight": len(self._inflight)}
+
+    def _start(self, key: str, source: str, fetch: Fetch):
+        task = asyncio.create_task(self._fetch(key, source, fetch))
+        self._inflight[key] = task
+        # Nobody may await a background revalidation; don't leave its error unretrieved
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def _fetch(self, key: str, source: str, fetch: Fetch) -> List[Dict[str, Any]]:
+        try:
+            results = await fetch()
+            self._entries[key] = (results, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return results
+        except Exception as e:
+            logger.error(f"[ScrapeCache] {source} scrape failed: {e}")
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    @staticmethod
+    def _copy(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Callers annotate prospects in place (emails, scores)
+        return [dict(r) for r in results]
+
+
+scrape_result_cache = ScrapeResultCache()
@@ -6,18 +6,23 @@ the user's prospect search goal, saving time and avoiding irrelevant sources.
 
 Flow:
   1. Receive: goal, company_description, job_titles, optional keyword hints
-  2. LLM call → produces { selected_scrapers: [...], params: {...}, rationale: "..." }
+  2. Routing decision → { selected_scrapers: [...], params: {...}, rationale: "..." }
+     a. rules:  the goal names sources or a competitor outright → no LLM
+     b. cache:  same inputs routed before → routing_cache; embedding-similar
+                inputs reuse only the scraper selection, with params rebuilt
+     c. LLM call, whose decision is then cached
   3. Map scraper names to PlaywrightScraperService methods + runtime params
   4. Execute selected scrapers in parallel via PlaywrightScraperService.run_scrapers()
   5. Return merged, deduplicated results
 """
 
-import asyncio
 import logging
+import re
 from typing import Any, Dict, List, Optional
 
 from services.llm_service import LLMService
 from services.playwright_scraper_service import PlaywrightScraperService
+from services.routing_cache import routing_cache, routing_text
 
 logger = logging.getLogger(__name__)
 
@@ -68,6 +73,115 @@ SCRAPER_REGISTRY = {
 }
 
 
+# ---------------------------------------------------------------------------
+# Rules-based fast router — explicit source names and competitor mentions
+# ---------------------------------------------------------------------------
+SOURCE_PATTERNS = {
+    "product_hunt": re.compile(r"\bproduct ?hunt\b"),
+    "g2":           re.compile(r"\bg2\b"),
+    "hacker_news":  re.compile(r"\b(hacker ?news|who is hiring)\b"),
+    "github":       re.compile(r"\bgithub\b"),
+    "crunchbase":   re.compile(r"\bcrunchbase\b"),
+    "wellfound":    re.compile(r"\bwellfound\b"),
+    "yc_directory": re.compile(r"\b(y ?combinator|yc[- ]backed|yc (founders|companies|startups))\b"),
+    "angellist":    re.compile(r"\bangel ?list\b"),
+}
+DETERMINERS = ("the", "a", "an", "their", "our", "my", "your", "his", "her", "its", "this", "that", "these", "those")
+COMPETITOR_RE = re.compile(
+    r"\b(?:alternatives? to|competitors? of|switch(?:ing)? (?:away )?from|unhappy with|churning from)"
+    rf"\s+(?:(?:{'|'.join(DETERMINERS)})\s+)*([a-z0-9][a-z0-9.\-]*)"
+)
+# Words that follow the competitor phrases but aren't a product (→ leave it to the LLM)
+NON_PRODUCT_WORDS = {
+    "current", "existing", "legacy", "old", "other", "some", "any", "all", "every", "incumbent",
+    "manual", "spreadsheet", "spreadsheets", "paper", "email", "emails", "inbox",
+    "crm", "crms", "erp", "ats", "tool", "tools", "software", "app", "apps", "platform", "platforms",
+    "vendor", "vendors", "provider", "providers", "solution", "solutions", "system", "systems",
+    "service", "services", "product", "products", "competitor", "competitors", "agency", "agencies",
+    "it", "them", "us", "using", "their", "the",
+}
+GITHUB_ORG_RE = re.compile(r"github\.com/(?:orgs/)?([a-z0-9][a-z0-9\-]*)")
+
+
+def _scraper_params(name: str, text: str, keyword: str, role: str) -> Optional[Dict[str, str]]:
+    """Params for scraper `name` derivable from the request text alone, or None."""
+    if name == "g2":
+        competitor = COMPETITOR_RE.search(text)
+        if competitor:
+            slug = competitor.group(1).strip(".-")
+            if len(slug) > 1 and not slug.isdigit() and slug not in NON_PRODUCT_WORDS:
+                return {"competitor_slug": slug}
+        return None
+    if name == "github":
+        org = GITHUB_ORG_RE.search(text)
+        return {"org_name": org.group(1)} if org else None
+    if name == "wellfound":
+        return {"role": role, "keyword": keyword}
+    if not keyword:
+        return None
+    if name == "angellist":
+        return {"market": keyword, "role": role}
+    if name in ("product_hunt", "hacker_news", "crunchbase", "yc_directory"):
+        return {"keyword": keyword}
+    return None
+
+
+def route_by_rules(
+    goal: str, job_titles: List[str], keyword_hint: str, max_scrapers: int
+) -> Optional[Dict[str, Any]]:
+    """
+    Deterministic routing for goals that leave nothing to decide: sources
+    named outright (with their params derivable from the inputs), or
+    "alternative to X" style competitor goals → G2. None otherwise.
+    """
+    text = f"{goal} {keyword_hint}".lower()
+    keyword = keyword_hint.strip()
+    role = job_titles[0] if job_titles else "founder"
+
+    picks: Dict[str, Dict[str, str]] = {}
+    competitor = _scraper_params("g2", text, keyword, role)
+    if competitor:
+        picks["g2"] = competitor
+
+    for name, pattern in SOURCE_PATTERNS.items():
+        if name in picks or not pattern.search(text):
+            continue
+        params = _scraper_params(name, text, keyword, role)
+        if params:
+            picks[name] = params
+
+    if not picks:
+        return None
+    selected = list(picks)[:max_scrapers]
+    return {
+        "selected_scrapers": selected,
+        "params": {name: picks[name] for name in selected},
+        "rationale": "Sources named explicitly in the goal (rules-based routing).",
+    }
+
+
+def params_for_request(
+    selected_scrapers: List[str], goal: str, job_titles: List[str], keyword_hint: str
+) -> Optional[Dict[str, Dict[str, str]]]:
+    """
+    Params for a scraper selection borrowed from a similar request, rebuilt
+    from this request's goal and keyword hint. None when any scraper's
+    required params can't be derived (G2 without a named competitor, a
+    keyword scraper without a keyword hint).
+    """
+    text = f"{goal} {keyword_hint}".lower()
+    keyword = keyword_hint.strip()
+    role = job_titles[0] if job_titles else "founder"
+
+    params = {}
+    for name in selected_scrapers:
+        derived = _scraper_params(name, text, keyword, role)
+        if derived is None:
+            return None
+        params[name] = derived
+    return params
+
+
 class ScraperRouterService:
     """
     AI-driven router that selects and configures the best scrapers
@@ -95,10 +209,12 @@ class ScraperRouterService:
               "prospects": [...],
               "scrapers_used": [...],
               "rationale": "...",
+              "routing_source": "rules" | "exact" | "similar" | "llm",
+              "source_stats": {scraper: {"outcome", "results", "ms", "hedged"}},
             }
         """
-        # Step 1: AI picks scrapers
-        routing = await self._ai_pick_scrapers(
+        # Step 1: rules, cached decision, or AI picks scrapers
+        routing = await self._pick_scrapers(
             goal=goal,
             company_description=company_description,
             job_titles=job_titles,
@@ -111,7 +227,7 @@ class ScraperRouterService:
         scraper_params    = routing.get("params", {})
         rationale         = routing.get("rationale", "")
 
-        logger.info(f"[Router] AI selected scrapers: {selected_scrapers}")
+        logger.info(f"[Router] Selected scrapers ({routing.get('routing_source', 'llm')}): {selected_scrapers}")
         logger.info(f"[Router] Rationale: {rationale}")
 
         if not selected_scrapers:
@@ -127,15 +243,68 @@ class ScraperRouterService:
             selected_scrapers, scraper_params, max_results_per_scraper
         )
 
-        # Step 3: Run scrapers in parallel
-        prospects = await self.playwright_service.run_scrapers(scraper_calls)
+        # Step 3: Run scrapers in parallel within the run budget
+        run = await self.playwright_service.run_scrapers_detailed(scraper_calls)
 
         return {
-            "prospects": prospects,
+            "prospects": run["prospects"],
             "scrapers_used": selected_scrapers,
             "rationale": rationale,
+            "routing_source": routing.get("routing_source", "llm"),
+            "source_stats": run["sources"],
         }
 
+    async def _pick_scrapers(
+        self,
+        goal: str,
+        company_description: str,
+        job_titles: List[str],
+        keyword_hint: str,
+        max_scrapers: int,
+        max_results_per_scraper: int,
+    ) -> Dict[str, Any]:
+        """Routing decision from rules, the routing cache, or the LLM — in that order."""
+        routing = route_by_rules(goal, job_titles, keyword_hint, max_scrapers)
+        if routing:
+            routing_cache.stats["rules"] += 1
+            routing["routing_source"] = "rules"
+            return routing
+
+        text = routing_text(goal, company_description, job_titles, keyword_hint, max_scrapers)
+        cached, embedding, match = await routing_cache.get(text)
+        if cached:
+            cached["selected_scrapers"] = cached["selected_scrapers"][:max_scrapers]
+            if match == "similar":
+                # Only the choice of sources carries over; params come from this request
+                params = params_for_request(cached["selected_scrapers"], goal, job_titles, keyword_hint)
+                if params is None:
+                    logger.info("[Router] Similar routing needs params this request can't supply — asking the LLM")
+                    cached = None
+                else:
+                    cached["params"] = params
+        if cached:
+            routing_cache.stats[match] += 1
+            cached["routing_source"] = match
+            return cached
+
+        routing = await self._ai_pick_scrapers(
+            goal=goal,
+            company_description=company_description,
+            job_titles=job_titles,
+            keyword_hint=keyword_hint,
+            max_scrapers=max_scrapers,
+            max_results_per_scraper=max_results_per_scraper,
+        )
+        routing_cache.stats["llm"] += 1
+        if routing.get("selected_scrapers"):
+            # Limits come from the request that reuses the decision
+            for params in routing.get("params", {}).values():
+                if isinstance(params, dict):
+                    params.pop("limit", None)
+            routing_cache.put(text, routing, embedding)
+        routing["routing_source"] = "llm"
+        return routing
+
     async def _ai_pick_scrapers(
         self,
         goal: str,
@@ -1,17 +1,65 @@
-import os
+"""
+Web Search Service
+==================
+Google (and site:-scoped LinkedIn / Reddit) search through SerpAPI.
+
+  HTTP      SerpAPI's JSON endpoint over the shared pooled http_fetcher
+            client, so concurrent queries reuse connections
+  Pacing    one token bucket per API key (SERPAPI_QPS, SERPAPI_BURST),
+            shared by every WebSearchService instance; a 429 drains it
+  Cache     results keyed on (normalized query, num) are kept for
+            SERP_CACHE_TTL in Redis when a client is given, and in a
+            process-local LRU otherwise or when Redis is unavailable
+
+Callers fan queries out with asyncio.gather; the bucket, not sleeps,
+keeps them inside the plan's rate.
+"""
+
+import hashlib
+import json
 import logging
-from typing import List, Dict, Optional, Any
-from serpapi import GoogleSearch
-import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from redis import Redis
+
+from core.rate_limiter import AsyncTokenBucket
+from services.http_fetcher import HttpFetcher, http_fetcher
 
 logger = logging.getLogger(__name__)
 
+SERPAPI_URL = "https://serpapi.com/search.json"
+SERPAPI_QPS = float(os.getenv("SERPAPI_QPS", "5"))
+SERPAPI_BURST = int(os.getenv("SERPAPI_BURST", "5"))
+SERP_CACHE_TTL = int(os.getenv("SERP_CACHE_TTL", str(24 * 3600)))
+SERP_CACHE_PREFIX = "serp"
+MEMORY_CACHE_MAX_ENTRIES = 1000
+
+# SerpAPI reports an empty result page as an "error"; that answer is cacheable
+NO_RESULTS_ERROR = "hasn't returned any results"
+
+# Shared across instances: one bucket per API key, one in-process cache
+_buckets: Dict[str, AsyncTokenBucket] = {}
+_memory_cache: "OrderedDict[str, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+
+
+def _cache_key(query: str, num: int) -> str:
+    normalized = " ".join(query.lower().split())
+    digest = hashlib.sha256(f"{normalized}|{num}".encode()).hexdigest()
+    return f"{SERP_CACHE_PREFIX}:{digest}"
+
+
 class WebSearchService:
-    def __init__(self):
+    def __init__(self, redis_client: Optional[Redis] = None, fetcher: Optional[HttpFetcher] = None):
         self.api_key = os.getenv("SERP_API_KEY")
         if not self.api_key:
             logger.warning("SERP_API_KEY not found in environment variables")
-        
+        self.redis = redis_client
+        self.fetcher = fetcher or http_fetcher
+
     async def search_google(self, query: str, num_results: int = 10) -> List[Dict[str, Any]]:
         """
         Perform a Google search using SerpAPI.
@@ -20,6 +68,12 @@ class WebSearchService:
             logger.error("Cannot perform search: SERP_API_KEY missing")
             return []
 
+        key = _cache_key(query, num_results)
+        cached = self._cache_get(key)
+        if cached is not None:
+            logger.info(f"SerpAPI cache hit for '{query}'")
+            return cached
+
         try:
             params = {
                 "engine": "google",
@@ -28,13 +82,22 @@ class WebSearchService:
                 "num": num_results
             }
 
-            # Run blocking synchronous code in a thread executor
-            loop = asyncio.get_event_loop()
-            results = await loop.run_in_executor(None, lambda: GoogleSearch(params).get_dict())
+            bucket = _buckets.setdefault(self.api_key, AsyncTokenBucket(SERPAPI_QPS, SERPAPI_BURST))
+            await bucket.acquire()
+            try:
+                results = await self.fetcher.get_json(SERPAPI_URL, params=params)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code == 429:
+                    bucket.drain()
+                    logger.warning(f"SerpAPI rate limit hit for '{query}'")
+                    return []
+                raise
 
             if "error" in results:
-                logger.error(f"SerpAPI Error: {results['error']}")
-                return []
+                if NO_RESULTS_ERROR not in results["error"]:
+                    logger.error(f"SerpAPI Error: {results['error']}")
+                    return []
+                results = {}
 
             organic_results = results.get("organic_results", [])
             processed_results = []
@@ -47,7 +110,8 @@ class WebSearchService:
                     "source": "Google"
                 })
 
-            return processed_results
+            self._cache_set(key, processed_results)
+            return [dict(r) for r in processed_results]
 
         except Exception as e:
             logger.error(f"Error executing Google search for '{query}': {str(e)}")
@@ -60,16 +124,16 @@ class WebSearchService:
         # Ensure the query targets LinkedIn profiles if not already
         if "site:linkedin.com/in/" not in query:
             query = f"site:linkedin.com/in/ {query}"
-        
+
         results = await self.search_google(query, num_results)
-        
+
         # Post-process to ensure we only get LinkedIn profile links
         linkedin_results = []
         for result in results:
             if "linkedin.com/in/" in result.get("link", ""):
                 result["source"] = "LinkedIn"
                 linkedin_results.append(result)
-        
+
         return linkedin_results
 
     async def search_reddit(self, query: str, num_results: int = 10) -> List[Dict[str, Any]]:
@@ -78,10 +142,45 @@ class WebSearchService:
         """
         if "site:reddit.com" not in query:
             query = f"site:reddit.com {query}"
-            
+
         results = await self.search_google(query, num_results)
-        
+
         for result in results:
             result["source"] = "Reddit"
-            
+
         return results
+
+    # ------------------------------------------------------------------
+    # Result cache
+    # ------------------------------------------------------------------
+
+    def _cache_get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        if self.redis is not None:
+            try:
+                value = self.redis.get(key)
+                return json.loads(value) if value is not None else None
+            except Exception as e:
+                logger.warning(f"SerpAPI cache read failed, using memory cache: {e}")
+
+        entry = _memory_cache.get(key)
+        if not entry:
+            return None
+        expires_at, results = entry
+        if expires_at < time.monotonic():
+            del _memory_cache[key]
+            return None
+        _memory_cache.move_to_end(key)
+        return [dict(r) for r in results]
+
+    def _cache_set(self, key: str, results: List[Dict[str, Any]]):
+        if self.redis is not None:
+            try:
+                self.redis.setex(key, SERP_CACHE_TTL, json.dumps(results))
+                return
+            except Exception as e:
+                logger.warning(f"SerpAPI cache write failed, using memory cache: {e}")
+
+        _memory_cache[key] = (time.monotonic() + SERP_CACHE_TTL, results)
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > MEMORY_CACHE_MAX_ENTRIES:
+            _memory_cache.popitem(last=False)
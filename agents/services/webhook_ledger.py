@@ -0,0 +1,70 @@
+"""
+Webhook Idempotency Ledger
+==========================
+MeetingBaaS may deliver the same event more than once. Every delivery is
+fingerprinted as (bot_id, event_type, sha256 of the canonical payload) and
+claimed in Redis with SET NX before any work happens:
+
+  claimed    → first delivery; caller does the work, then mark_processed()
+  in_flight  → an identical delivery is being handled right now
+  processed  → already handled; caller returns immediately
+
+If handling fails the caller calls release() so a later redelivery can
+run. In-flight locks expire on their own in case the process dies.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict
+
+from redis import Redis
+
+logger = logging.getLogger(__name__)
+
+LEDGER_KEY_PREFIX = "webhook_ledger"
+
+CLAIMED   = "claimed"
+IN_FLIGHT = "in_flight"
+PROCESSED = "processed"
+
+
+class WebhookLedger:
+    """Redis-backed (bot_id, event_type, payload hash) de-duplication."""
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        lock_ttl: int = 300,
+        processed_ttl: int = 7 * 24 * 3600,
+    ):
+        self.redis = redis_client
+        self.lock_ttl = lock_ttl
+        self.processed_ttl = processed_ttl
+
+    @staticmethod
+    def fingerprint(payload: Dict[str, Any]) -> str:
+        """Stable hash of a JSON payload, independent of key order/whitespace."""
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def key(self, bot_id: str, event_type: str, payload_hash: str) -> str:
+        return f"{LEDGER_KEY_PREFIX}:{bot_id or '-'}:{event_type or '-'}:{payload_hash}"
+
+    def claim(self, key: str) -> str:
+        """Try to take ownership of a delivery. Costs a single round trip when new."""
+        if self.redis.set(key, IN_FLIGHT, nx=True, ex=self.lock_ttl):
+            return CLAIMED
+        state = self.redis.get(key)
+        # Key expired between the two calls: treat as in flight, sender will retry
+        return state or IN_FLIGHT
+
+    def mark_processed(self, key: str):
+        self.redis.set(key, PROCESSED, ex=self.processed_ttl)
+
+    def release(self, key: str):
+        """Drop an in-flight claim after a failure so a redelivery can retry."""
+        try:
+            self.redis.delete(key)
+        except Exception as e:
+            logger.error(f"[WebhookLedger] Failed to release {key}: {e}")
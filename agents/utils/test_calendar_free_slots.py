@@ -0,0 +1,53 @@
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path to allow imports if needed
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.calendar_cache_service import CalendarCacheService
+
+
+def _service_with_events(events):
+    """CalendarCacheService whose mirror for "user" is already fresh."""
+    service = CalendarCacheService(google_service=None)
+    service._states["user"] = {
+        "events": {str(i): e for i, e in enumerate(events)},
+        "sync_token": None,
+        "window_start": datetime.now(timezone.utc) - timedelta(days=1),
+        "synced_at": time.monotonic(),
+        "stale": False,
+    }
+    return service
+
+
+def test_event_on_final_day_is_busy():
+    days = 2
+    last_day = (datetime.now(timezone.utc) + timedelta(days=days)).date()
+    start = datetime.combine(last_day, datetime.min.time(), timezone.utc).replace(hour=9)
+    event = {"start": start, "end": start.replace(hour=17), "busy": True, "event": {}}
+
+    service = _service_with_events([event])
+    slots = asyncio.run(service.find_free_slots("user", days=days, include_weekends=True, max_slots=100))
+
+    assert slots, "earlier days should still have free slots"
+    assert not [s for s in slots if s["start"].startswith(last_day.isoformat())], \
+        "final day is fully booked and must offer no slots"
+
+
+def test_final_day_free_without_events():
+    days = 2
+    last_day = (datetime.now(timezone.utc) + timedelta(days=days)).date()
+
+    service = _service_with_events([])
+    slots = asyncio.run(service.find_free_slots("user", days=days, include_weekends=True, max_slots=100))
+
+    assert [s for s in slots if s["start"].startswith(last_day.isoformat())]
+
+
+if __name__ == "__main__":
+    test_event_on_final_day_is_busy()
+    test_final_day_free_without_events()
+    print("calendar free-slot tests passed")
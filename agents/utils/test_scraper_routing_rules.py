@@ -0,0 +1,62 @@
+import os
+import sys
+
+# Add parent directory to path to allow imports if needed
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.scraper_router_service import params_for_request, route_by_rules
+
+
+def _route(goal, keyword_hint=""):
+    return route_by_rules(goal, ["VP Sales"], keyword_hint, max_scrapers=3)
+
+
+def test_competitor_slug_from_product_name():
+    decision = _route("Find teams looking for alternatives to HubSpot")
+    assert decision["params"]["g2"] == {"competitor_slug": "hubspot"}
+
+
+def test_competitor_slug_skips_determiners():
+    decision = _route("Companies unhappy with their Salesforce setup")
+    assert decision["params"]["g2"] == {"competitor_slug": "salesforce"}
+
+
+def test_non_product_phrases_fall_through_to_llm():
+    for goal in (
+        "Find alternatives to the",
+        "Sales leaders switching away from their CRM",
+        "Ops teams unhappy with spreadsheets",
+        "Founders churning from the current vendor",
+    ):
+        assert _route(goal) is None, goal
+
+
+def test_named_source_still_routes_without_competitor():
+    decision = _route("Sales teams unhappy with spreadsheets on Product Hunt", keyword_hint="sales automation")
+    assert decision["selected_scrapers"] == ["product_hunt"]
+
+
+def test_similar_selection_gets_params_from_current_request():
+    params = params_for_request(["product_hunt", "wellfound"], "Find devtool founders", ["CTO"], "observability")
+    assert params == {
+        "product_hunt": {"keyword": "observability"},
+        "wellfound": {"role": "CTO", "keyword": "observability"},
+    }
+
+
+def test_similar_selection_needing_underivable_params_is_rejected():
+    assert params_for_request(["g2"], "Find sales teams growing fast", ["VP Sales"], "crm") is None
+    assert params_for_request(["product_hunt"], "Find devtool founders", ["CTO"], "") is None
+    assert params_for_request(["g2"], "Teams unhappy with Pipedrive", ["VP Sales"], "")["g2"] == {
+        "competitor_slug": "pipedrive"
+    }
+
+
+if __name__ == "__main__":
+    test_competitor_slug_from_product_name()
+    test_competitor_slug_skips_determiners()
+    test_non_product_phrases_fall_through_to_llm()
+    test_named_source_still_routes_without_competitor()
+    test_similar_selection_gets_params_from_current_request()
+    test_similar_selection_needing_underivable_params_is_rejected()
+    print("scraper routing rule tests passed")
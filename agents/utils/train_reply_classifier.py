@@ -0,0 +1,70 @@
+"""
+Train the local reply pre-classifier from labelled past replies.
+
+Input is a JSONL file with one reply per line:
+    {"text": "...", "sentiment": "Positive", "intent": "Interested"}
+(e.g. exported from LLM-labelled replies). The fitted weights are written
+to services/reply_classifier_model.json, which ReplyPreClassifier loads on
+startup (override with REPLY_CLASSIFIER_MODEL).
+
+Usage:
+    python -m utils.train_reply_classifier replies.jsonl [output.json]
+"""
+
+import json
+import logging
+import random
+import sys
+
+from services.reply_classifier import DEFAULT_MODEL_PATH, LinearReplyModel, strip_quoted
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def load_examples(path):
+    examples = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            examples.append((row["text"], row["sentiment"], row["intent"]))
+    return examples
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+
+    output = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_MODEL_PATH
+    examples = load_examples(sys.argv[1])
+    random.Random(0).shuffle(examples)
+
+    # Hold out 20% to report accuracy at a few confidence thresholds
+    split = int(len(examples) * 0.8)
+    train, held_out = examples[:split], examples[split:]
+    logger.info(f"Training on {len(train)} replies, evaluating on {len(held_out)}")
+
+    model = LinearReplyModel.train(train)
+    for threshold in (0.6, 0.7, 0.8, 0.85, 0.9, 0.95):
+        covered = correct = 0
+        for text, sentiment, intent in held_out:
+            prediction = model.predict(strip_quoted(text))
+            if prediction.confidence >= threshold:
+                covered += 1
+                correct += (prediction.sentiment, prediction.intent) == (sentiment, intent)
+        coverage = covered / len(held_out) if held_out else 0.0
+        accuracy = correct / covered if covered else 0.0
+        print(f"threshold={threshold:.2f}  coverage={coverage:.1%}  accuracy={accuracy:.1%}")
+
+    # Refit on everything before saving
+    model = LinearReplyModel.train(examples)
+    model.save(output)
+    logger.info(f"Saved model to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -53,3 +53,31 @@ BEGIN
         ALTER TABLE prospects ADD COLUMN raw_data JSONB;
     END IF;
 END $$;
+
+-- 4. Track background post-processing of completed meetings
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name = 'meetings' AND column_name = 'processing_status') THEN
+        ALTER TABLE meetings ADD COLUMN processing_status TEXT; -- 'processing', 'analyzed', 'retrying', 'completed', 'failed'
+    END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name = 'meetings' AND column_name = 'processing_attempts') THEN
+        ALTER TABLE meetings ADD COLUMN processing_attempts INT DEFAULT 0;
+    END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name = 'meetings' AND column_name = 'processing_error') THEN
+        ALTER TABLE meetings ADD COLUMN processing_error TEXT;
+    END IF;
+
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name = 'meetings' AND column_name = 'processing_updated_at') THEN
+        ALTER TABLE meetings ADD COLUMN processing_updated_at TIMESTAMP WITH TIME ZONE;
+    END IF;
+END $$;
+
+-- 5. Incremental Gmail sync state
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name = 'google_tokens' AND column_name = 'gmail_history_id') THEN
+        ALTER TABLE google_tokens ADD COLUMN gmail_history_id TEXT;
+    END IF;
+END $$;